@@ -9,7 +9,7 @@ sys.path.insert(0, str(backend_dir))
 # Set environment
 os.environ.setdefault('FLASK_ENV', os.getenv('FLASK_ENV', 'production'))
 
-# Import from application module (not app to avoid directory conflict)
+# Import the app factory
 from application import create_app
 
 # Create Flask app for Vercel
@@ -10,8 +10,6 @@ if str(backend_dir) not in sys.path:
 
 from flask import Flask, jsonify, request
 from flask_cors import CORS
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
 from config.settings import config
 
 # CORS origins are loaded from environment variables
@@ -24,6 +22,10 @@ def create_app():
     """Create and configure the Flask application."""
     app = Flask(__name__)
     
+    # Fast JSON encoding (orjson) for all responses and request bodies
+    from utils.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+    
     # Load configuration
     app.config['SECRET_KEY'] = config.FLASK_SECRET_KEY
     app.config['DEBUG'] = config.DEBUG
@@ -40,13 +42,13 @@ def create_app():
         allow_headers=["Content-Type", "Authorization"],
     )
     
-    # Configure rate limiting
-    limiter = Limiter(
-        app=app,
-        key_func=get_remote_address,
-        default_limits=["1000 per day", "200 per hour"],
-        storage_uri="memory://"
-    )
+    # Configure rate limiting (counters shared across workers/instances)
+    from utils.rate_limit import limiter
+    limiter.init_app(app)
+    
+    # Gzip large JSON/CSV responses
+    from utils.compression import init_compression
+    init_compression(app)
     
     # Apply rate limit to Torn API routes
     @app.before_request
@@ -59,13 +61,14 @@ def create_app():
     from modules.routes.war_routes import war_bp
     from modules.routes.member_routes import member_bp
     from modules.routes.payment_routes import payment_bp
-    from modules.routes.export_routes import export_bp, archive_bp
+    from modules.routes.export_routes import export_bp, audit_bp, archive_bp
     
     app.register_blueprint(auth_bp)
     app.register_blueprint(war_bp)
     app.register_blueprint(member_bp)
     app.register_blueprint(payment_bp)
     app.register_blueprint(export_bp)
+    app.register_blueprint(audit_bp)
     app.register_blueprint(archive_bp)
     
     # Health check endpoint
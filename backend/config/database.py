@@ -4,6 +4,7 @@ from psycopg2.extras import RealDictCursor
 from contextlib import contextmanager
 from config.settings import config
 from urllib.parse import urlparse
+import uuid
 
 class Database:
     """Database connection manager."""
@@ -56,5 +57,26 @@ class Database:
                 yield cursor
             finally:
                 cursor.close()
+    
+    @staticmethod
+    def iter_batches(query, params=None, batch_size=1000):
+        """
+        Stream query results through a server-side cursor.
+        
+        Yields lists of at most batch_size rows, so only one batch is held in
+        memory at a time. The connection stays open until iteration finishes.
+        """
+        with Database.get_connection() as conn:
+            cursor = conn.cursor(name=f"stream_{uuid.uuid4().hex}", cursor_factory=RealDictCursor)
+            try:
+                cursor.itersize = batch_size
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                cursor.close()
 
 db = Database()
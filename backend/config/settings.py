@@ -24,18 +24,107 @@ class Config:
     # Torn API
     TORN_API_BASE_URL = os.getenv('TORN_API_BASE_URL', 'https://api.torn.com/v2')
     RATE_LIMIT_PER_MINUTE = int(os.getenv('RATE_LIMIT_PER_MINUTE', 80))
+    # Seconds a successful API key validation is reused at login (0 disables)
+    TORN_VALIDATION_CACHE_SECONDS = int(os.getenv('TORN_VALIDATION_CACHE_SECONDS', 120))
+    TORN_VALIDATION_CACHE_SIZE = int(os.getenv('TORN_VALIDATION_CACHE_SIZE', 1024))
+    
+    # Request rate limiting
+    # Counter storage: database:// (application Postgres) or
+    # sqlite:///<absolute path> (one host, no external service)
+    RATE_LIMIT_STORAGE_URI = os.getenv('RATE_LIMIT_STORAGE_URI', 'database://')
+    RATE_LIMIT_STRATEGY = os.getenv('RATE_LIMIT_STRATEGY', 'sliding-window-counter')
+    EXPORT_PDF_RATE_LIMIT = os.getenv('EXPORT_PDF_RATE_LIMIT', '10 per minute')
+    # Bulk ZIP exports render up to BULK_EXPORT_MAX_SESSIONS reports each; they
+    # also count against the PDF export budget
+    EXPORT_BULK_RATE_LIMIT = os.getenv('EXPORT_BULK_RATE_LIMIT', '2 per minute')
+    MEMBERS_REFRESH_RATE_LIMIT = os.getenv('MEMBERS_REFRESH_RATE_LIMIT', '6 per minute')
+    WAR_CALCULATE_RATE_LIMIT = os.getenv('WAR_CALCULATE_RATE_LIMIT', '30 per minute')
+    # Per client address; every login attempt can cost a Torn call and a password hash
+    LOGIN_RATE_LIMIT = os.getenv('LOGIN_RATE_LIMIT', '10 per minute')
+    
+    # List endpoint pages (limit= is optional; a cursor without limit uses the default)
+    PAGE_SIZE_DEFAULT = int(os.getenv('PAGE_SIZE_DEFAULT', 100))
+    PAGE_SIZE_MAX = int(os.getenv('PAGE_SIZE_MAX', 500))
+    
+    # Response compression (gzip for clients that accept it)
+    COMPRESS_RESPONSES = os.getenv('COMPRESS_RESPONSES', 'true').lower() == 'true'
+    COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', 1024))
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))
     
     # Flask
     FLASK_ENV = os.getenv('FLASK_ENV', 'development')
     DEBUG = FLASK_ENV == 'development'
+    # Serverless hosts (Vercel, AWS Lambda) freeze background threads between requests
+    SERVERLESS = bool(os.getenv('VERCEL') or os.getenv('AWS_LAMBDA_FUNCTION_NAME'))
     
     # Session Configuration
     SESSION_TIMEOUT_MINUTES = int(os.getenv('SESSION_TIMEOUT_MINUTES', 30))
     ACCESS_TOKEN_EXPIRY_HOURS = int(os.getenv('ACCESS_TOKEN_EXPIRY_HOURS', 24))
     REFRESH_TOKEN_EXPIRY_DAYS = int(os.getenv('REFRESH_TOKEN_EXPIRY_DAYS', 7))
+    # Session store: 'postgres' (shared across workers/instances) or 'memory'
+    SESSION_STORE = os.getenv('SESSION_STORE', 'postgres')
+    # Seconds a worker trusts its cached copy of a session before re-reading it.
+    # A logout on another instance is only seen after this long (0: re-read on
+    # every request, so logouts take effect everywhere at once)
+    SESSION_CACHE_SECONDS = int(os.getenv('SESSION_CACHE_SECONDS', 0))
+    # Minimum seconds between last-activity write-backs per user
+    SESSION_ACTIVITY_WRITE_SECONDS = int(os.getenv('SESSION_ACTIVITY_WRITE_SECONDS', 60))
+    # Write activity back from a background flusher (false: on the request
+    # thread; the default on serverless hosts, whose flusher would be frozen)
+    SESSION_ACTIVITY_BUFFERED = os.getenv('SESSION_ACTIVITY_BUFFERED', 'false' if SERVERLESS else 'true').lower() == 'true'
+    # Live war event streams: keepalive interval and maximum stream length
+    # (clients reconnect automatically, re-checking their session)
+    SSE_HEARTBEAT_SECONDS = int(os.getenv('SSE_HEARTBEAT_SECONDS', 15))
+    SSE_MAX_STREAM_SECONDS = int(os.getenv('SSE_MAX_STREAM_SECONDS', 300))
+    # Seconds a stream token (POST /war/<id>/events/token) can be used to connect
+    SSE_TOKEN_SECONDS = int(os.getenv('SSE_TOKEN_SECONDS', 60))
+    # Streams need a long-running server (a LISTEN thread per worker and
+    # multi-minute responses), so they are off on serverless hosts
+    SSE_ENABLED = os.getenv('SSE_ENABLED', 'false' if SERVERLESS else 'true').lower() == 'true'
+    # Verified access tokens cached per process (0 disables the cache)
+    TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', 1024))
     
     # Audit Log Retention
     AUDIT_LOG_RETENTION_DAYS = int(os.getenv('AUDIT_LOG_RETENTION_DAYS', 30))
+    # Extra months of audit_logs partitions created beyond the retention window
+    AUDIT_PARTITION_MONTHS_AHEAD = int(os.getenv('AUDIT_PARTITION_MONTHS_AHEAD', 3))
+    # Archival mode: 'partition' (whole expired months) or 'batched' (row chunks)
+    ARCHIVE_MODE = os.getenv('ARCHIVE_MODE', 'partition')
+    # Batched archival of expired rows (rows per chunk, pause between chunks)
+    ARCHIVE_BATCH_SIZE = int(os.getenv('ARCHIVE_BATCH_SIZE', 5000))
+    ARCHIVE_BATCH_SLEEP_SECONDS = float(os.getenv('ARCHIVE_BATCH_SLEEP_SECONDS', 0.1))
+    # Archived months older than this move to compressed segment files
+    COLD_STORAGE_AFTER_MONTHS = int(os.getenv('COLD_STORAGE_AFTER_MONTHS', 6))
+    # Where segments go: 'database', or 'directory' with COLD_STORAGE_DIR on
+    # durable storage shared by every instance. Unset leaves archived logs in
+    # Postgres (tiering is refused).
+    COLD_STORAGE_BACKEND = os.getenv('COLD_STORAGE_BACKEND', '').lower()
+    COLD_STORAGE_DIR = os.getenv('COLD_STORAGE_DIR', '')
+    COLD_STORAGE_COMPRESSION = os.getenv('COLD_STORAGE_COMPRESSION', 'gzip')
+    # Buffered audit writes (false: insert on the request thread; the default on
+    # serverless hosts, whose flusher would be frozen and never flush at exit)
+    AUDIT_LOG_BUFFERED = os.getenv('AUDIT_LOG_BUFFERED', 'false' if SERVERLESS else 'true').lower() == 'true'
+    AUDIT_FLUSH_SIZE = int(os.getenv('AUDIT_FLUSH_SIZE', 100))
+    AUDIT_FLUSH_INTERVAL_SECONDS = float(os.getenv('AUDIT_FLUSH_INTERVAL_SECONDS', 2))
+    AUDIT_BUFFER_MAX = int(os.getenv('AUDIT_BUFFER_MAX', 10000))
+    
+    # PDF report cache (total size cap, least recently used reports evicted first)
+    PDF_CACHE_MAX_BYTES = int(os.getenv('PDF_CACHE_MAX_BYTES', 100 * 1024 * 1024))
+    # Cache hits only refresh last_accessed_at when it is older than this
+    PDF_CACHE_TOUCH_SECONDS = int(os.getenv('PDF_CACHE_TOUCH_SECONDS', 3600))
+    # Rendered reports larger than this are spooled to a temporary file
+    PDF_SPOOL_MAX_BYTES = int(os.getenv('PDF_SPOOL_MAX_BYTES', 8 * 1024 * 1024))
+    # Larger reports are streamed from the spool file and never cached
+    PDF_CACHE_MAX_REPORT_BYTES = int(os.getenv('PDF_CACHE_MAX_REPORT_BYTES', 8 * 1024 * 1024))
+    
+    # Background export jobs
+    EXPORT_WORKER_PROCESSES = int(os.getenv('EXPORT_WORKER_PROCESSES', 2))
+    EXPORT_JOB_TIMEOUT_MINUTES = int(os.getenv('EXPORT_JOB_TIMEOUT_MINUTES', 15))
+    # Finished job files are kept on the job row for this long
+    EXPORT_JOB_OUTPUT_HOURS = int(os.getenv('EXPORT_JOB_OUTPUT_HOURS', 24))
+    BULK_EXPORT_MAX_SESSIONS = int(os.getenv('BULK_EXPORT_MAX_SESSIONS', 200))
+    # Rows fetched and decrypted per batch by the streamed data exports
+    DATA_EXPORT_BATCH_SIZE = int(os.getenv('DATA_EXPORT_BATCH_SIZE', 1000))
     
     # CORS
     cors_env = os.getenv('CORS_ORIGINS', '')
@@ -0,0 +1,6 @@
+-- Migration: Track the inputs behind the saved payout calculation
+
+-- SHA-256 of members, bonuses, other payments, earnings and price used for
+-- the stored member_payouts/totals. NULL means the snapshot must be rebuilt.
+ALTER TABLE war_sessions
+    ADD COLUMN IF NOT EXISTS payout_fingerprint VARCHAR(64);
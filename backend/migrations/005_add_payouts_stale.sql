@@ -0,0 +1,7 @@
+-- Migration: Track whether the saved payout snapshot is current
+
+-- Set when member data changes outside the incremental bonus/payment path
+-- (Torn refresh, status changes); cleared by a full calculation. Existing
+-- sessions start stale so their first export rebuilds the snapshot.
+ALTER TABLE war_sessions
+    ADD COLUMN IF NOT EXISTS payouts_stale BOOLEAN NOT NULL DEFAULT TRUE;
@@ -0,0 +1,13 @@
+-- Migration: Cache rendered PDF reports by content fingerprint
+
+CREATE TABLE IF NOT EXISTS pdf_report_cache (
+    report_key VARCHAR(64) PRIMARY KEY,
+    war_session_id UUID REFERENCES war_sessions(session_id) ON DELETE CASCADE,
+    pdf_data BYTEA NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    last_accessed_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_pdf_report_cache_session ON pdf_report_cache(war_session_id);
+CREATE INDEX IF NOT EXISTS idx_pdf_report_cache_accessed ON pdf_report_cache(last_accessed_at);
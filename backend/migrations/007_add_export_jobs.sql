@@ -0,0 +1,21 @@
+-- Migration: Background report export jobs
+
+CREATE TABLE IF NOT EXISTS export_jobs (
+    job_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    war_session_id UUID REFERENCES war_sessions(session_id) ON DELETE CASCADE,
+    kind VARCHAR(20) NOT NULL DEFAULT 'pdf',
+    status VARCHAR(20) NOT NULL CHECK (status IN ('queued', 'running', 'completed', 'failed')),
+    progress INTEGER NOT NULL DEFAULT 0,
+    report_key VARCHAR(64),
+    error TEXT,
+    requested_by_torn_id INTEGER,
+    generated_by_name VARCHAR(255),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    completed_at TIMESTAMP WITH TIME ZONE
+);
+
+-- At most one pending job per session and kind (duplicate requests share it)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_export_jobs_pending
+    ON export_jobs(war_session_id, kind)
+    WHERE status IN ('queued', 'running');
@@ -0,0 +1,122 @@
+-- Migration: Monthly partitions for audit_logs and audit_logs_archived
+--
+-- Both tables are range partitioned on retention_date, one partition per
+-- calendar month (audit_logs_yYYYYmMM / audit_logs_archived_yYYYYmMM).
+-- Archival detaches an expired month from audit_logs and attaches it to
+-- audit_logs_archived, so no rows are copied or deleted.
+
+BEGIN;
+
+-- Creates the audit_logs partition for the month containing month_date.
+-- Rows that landed in the default partition for that month are moved first.
+CREATE OR REPLACE FUNCTION create_audit_log_partition(month_date DATE)
+RETURNS BOOLEAN AS $$
+DECLARE
+    month_start DATE := date_trunc('month', month_date)::date;
+    month_end DATE := (date_trunc('month', month_date) + INTERVAL '1 month')::date;
+    part_name TEXT := 'audit_logs_' || to_char(month_date, '"y"YYYY"m"MM');
+BEGIN
+    IF to_regclass(part_name) IS NOT NULL THEN
+        RETURN FALSE;
+    END IF;
+
+    EXECUTE format('CREATE TABLE %I (LIKE audit_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', part_name);
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM audit_logs_default WHERE retention_date >= %L AND retention_date < %L RETURNING *)
+         INSERT INTO %I SELECT * FROM moved',
+        month_start, month_end, part_name
+    );
+    EXECUTE format('ALTER TABLE audit_logs ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                   part_name, month_start, month_end);
+    RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Hot table
+ALTER TABLE audit_logs RENAME TO audit_logs_legacy;
+ALTER INDEX IF EXISTS idx_audit_logs_timestamp RENAME TO idx_audit_logs_legacy_timestamp;
+ALTER INDEX IF EXISTS idx_audit_logs_retention RENAME TO idx_audit_logs_legacy_retention;
+ALTER INDEX IF EXISTS idx_audit_logs_user RENAME TO idx_audit_logs_legacy_user;
+
+CREATE TABLE audit_logs (
+    log_id INTEGER NOT NULL DEFAULT nextval('audit_logs_log_id_seq'),
+    action_type VARCHAR(100) NOT NULL,
+    encrypted_old_value TEXT,
+    encrypted_new_value TEXT,
+    encrypted_details TEXT,
+    user_torn_id INTEGER,
+    war_session_id UUID REFERENCES war_sessions(session_id) ON DELETE SET NULL,
+    timestamp TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    retention_date DATE NOT NULL,
+    PRIMARY KEY (log_id, retention_date)
+) PARTITION BY RANGE (retention_date);
+
+-- Keep the id sequence when the legacy table is dropped
+ALTER SEQUENCE audit_logs_log_id_seq OWNED BY audit_logs.log_id;
+
+CREATE INDEX idx_audit_logs_timestamp ON audit_logs(timestamp);
+CREATE INDEX idx_audit_logs_user ON audit_logs(user_torn_id);
+
+-- Catches rows for months whose partition has not been created yet
+CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT;
+
+-- Partitions for existing rows plus the next three months (the archival
+-- job creates later months and moves any default-partition rows into them)
+SELECT create_audit_log_partition(month_date::date)
+FROM generate_series(
+    date_trunc('month', LEAST(COALESCE((SELECT MIN(retention_date) FROM audit_logs_legacy), CURRENT_DATE), CURRENT_DATE)),
+    date_trunc('month', CURRENT_DATE + INTERVAL '3 months'),
+    INTERVAL '1 month'
+) AS month_date;
+
+INSERT INTO audit_logs
+    (log_id, action_type, encrypted_old_value, encrypted_new_value, encrypted_details,
+     user_torn_id, war_session_id, timestamp, retention_date)
+SELECT log_id, action_type, encrypted_old_value, encrypted_new_value, encrypted_details,
+       user_torn_id, war_session_id, COALESCE(timestamp, CURRENT_TIMESTAMP), retention_date
+FROM audit_logs_legacy;
+
+DROP TABLE audit_logs_legacy;
+
+-- Archive table
+ALTER TABLE audit_logs_archived RENAME TO audit_logs_archived_legacy;
+ALTER INDEX IF EXISTS idx_audit_logs_archived_timestamp RENAME TO idx_audit_logs_archived_legacy_timestamp;
+
+CREATE TABLE audit_logs_archived (
+    log_id INTEGER NOT NULL,
+    action_type VARCHAR(100) NOT NULL,
+    encrypted_old_value TEXT,
+    encrypted_new_value TEXT,
+    encrypted_details TEXT,
+    user_torn_id INTEGER,
+    war_session_id UUID,
+    timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+    retention_date DATE NOT NULL,
+    archived_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (log_id, retention_date)
+) PARTITION BY RANGE (retention_date);
+
+CREATE INDEX idx_audit_logs_archived_timestamp ON audit_logs_archived(timestamp);
+
+DO $$
+DECLARE
+    month_start DATE;
+BEGIN
+    FOR month_start IN
+        SELECT DISTINCT date_trunc('month', retention_date)::date FROM audit_logs_archived_legacy
+    LOOP
+        EXECUTE format('CREATE TABLE %I PARTITION OF audit_logs_archived FOR VALUES FROM (%L) TO (%L)',
+                       'audit_logs_archived_' || to_char(month_start, '"y"YYYY"m"MM'),
+                       month_start, (month_start + INTERVAL '1 month')::date);
+    END LOOP;
+END $$;
+
+INSERT INTO audit_logs_archived SELECT * FROM audit_logs_archived_legacy;
+
+DROP TABLE audit_logs_archived_legacy;
+
+-- Grant read-only access to audit_logs_archived
+REVOKE ALL ON audit_logs_archived FROM PUBLIC;
+GRANT SELECT ON audit_logs_archived TO PUBLIC;
+
+COMMIT;
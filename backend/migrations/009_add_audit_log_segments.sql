@@ -0,0 +1,18 @@
+-- Migration: Cold-storage segments for old archived audit logs
+
+-- One row per compressed JSONL segment file written by the tiering job.
+-- The time range and action types let queries skip segments entirely.
+CREATE TABLE IF NOT EXISTS audit_log_segments (
+    segment_id SERIAL PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    source_partition VARCHAR(64),
+    row_count INTEGER NOT NULL,
+    size_bytes BIGINT NOT NULL,
+    min_timestamp TIMESTAMP WITH TIME ZONE,
+    max_timestamp TIMESTAMP WITH TIME ZONE,
+    action_types TEXT[] NOT NULL DEFAULT '{}',
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_audit_log_segments_range
+    ON audit_log_segments(min_timestamp, max_timestamp);
@@ -0,0 +1,23 @@
+-- Migration: Composite indexes for audit log search
+--
+-- Every audit query filters on one of war session, action type or user and
+-- orders by timestamp, so each index leads with the filter column and ends
+-- with timestamp. Indexes on the partitioned parents cascade to every
+-- current and future partition.
+
+CREATE INDEX IF NOT EXISTS idx_audit_logs_session_timestamp
+    ON audit_logs(war_session_id, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_action_timestamp
+    ON audit_logs(action_type, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_user_timestamp
+    ON audit_logs(user_torn_id, timestamp DESC);
+
+-- Superseded by idx_audit_logs_user_timestamp
+DROP INDEX IF EXISTS idx_audit_logs_user;
+
+CREATE INDEX IF NOT EXISTS idx_audit_logs_archived_session_timestamp
+    ON audit_logs_archived(war_session_id, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_archived_action_timestamp
+    ON audit_logs_archived(action_type, timestamp DESC);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_archived_user_timestamp
+    ON audit_logs_archived(user_torn_id, timestamp DESC);
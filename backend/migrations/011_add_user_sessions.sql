@@ -0,0 +1,14 @@
+-- Migration: Shared login sessions
+--
+-- Replaces the per-process session dict so every worker/instance sees the
+-- same sessions. UNLOGGED: sessions are disposable (a crash only forces a
+-- re-login) and skipping WAL keeps the frequent activity writes cheap.
+CREATE UNLOGGED TABLE IF NOT EXISTS user_sessions (
+    torn_id INTEGER PRIMARY KEY,
+    faction_id INTEGER NOT NULL,
+    encrypted_api_key TEXT,
+    last_activity TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_user_sessions_last_activity ON user_sessions(last_activity);
@@ -0,0 +1,16 @@
+-- Migration: Shared rate limit counters
+--
+-- Fixed and sliding window counters for the request rate limiter, shared
+-- by every worker/instance. window_id is the window number
+-- (epoch seconds / window length), or -1 for fixed window counters.
+-- UNLOGGED: counters are short-lived and losing them in a crash only
+-- resets the limits.
+CREATE UNLOGGED TABLE IF NOT EXISTS rate_limit_windows (
+    key TEXT NOT NULL,
+    window_id BIGINT NOT NULL,
+    count INTEGER NOT NULL,
+    expires_at DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (key, window_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_rate_limit_windows_expires ON rate_limit_windows(expires_at);
@@ -0,0 +1,65 @@
+-- Migration: Per-session version counter for conditional GETs
+--
+-- war_sessions.version increases on every write to a session's members,
+-- other payments or member payouts, and on every update of the session row
+-- itself (calculations, completion). Read routes use it as their ETag, so
+-- an unchanged session is answered with 304 after a primary key lookup.
+
+ALTER TABLE war_sessions
+    ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 1;
+
+-- Bump once per statement for every session touched by the statement
+CREATE OR REPLACE FUNCTION bump_war_session_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE war_sessions SET version = version + 1
+        WHERE session_id IN (SELECT war_session_id FROM new_rows);
+    ELSIF TG_OP = 'UPDATE' THEN
+        UPDATE war_sessions SET version = version + 1
+        WHERE session_id IN (SELECT war_session_id FROM new_rows
+                             UNION SELECT war_session_id FROM old_rows);
+    ELSE
+        UPDATE war_sessions SET version = version + 1
+        WHERE session_id IN (SELECT war_session_id FROM old_rows);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Direct updates of a session row bump it too (unless already bumped above)
+CREATE OR REPLACE FUNCTION increment_war_session_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.version = OLD.version THEN
+        NEW.version = OLD.version + 1;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS increment_war_sessions_version ON war_sessions;
+CREATE TRIGGER increment_war_sessions_version BEFORE UPDATE ON war_sessions
+    FOR EACH ROW EXECUTE FUNCTION increment_war_session_version();
+
+-- Transition tables need one trigger per event
+DO $$
+DECLARE
+    table_name TEXT;
+BEGIN
+    FOREACH table_name IN ARRAY ARRAY['members', 'other_payments', 'member_payouts'] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', table_name || '_version_insert', table_name);
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', table_name || '_version_update', table_name);
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', table_name || '_version_delete', table_name);
+
+        EXECUTE format('CREATE TRIGGER %I AFTER INSERT ON %I REFERENCING NEW TABLE AS new_rows
+                        FOR EACH STATEMENT EXECUTE FUNCTION bump_war_session_version()',
+                       table_name || '_version_insert', table_name);
+        EXECUTE format('CREATE TRIGGER %I AFTER UPDATE ON %I REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+                        FOR EACH STATEMENT EXECUTE FUNCTION bump_war_session_version()',
+                       table_name || '_version_update', table_name);
+        EXECUTE format('CREATE TRIGGER %I AFTER DELETE ON %I REFERENCING OLD TABLE AS old_rows
+                        FOR EACH STATEMENT EXECUTE FUNCTION bump_war_session_version()',
+                       table_name || '_version_delete', table_name);
+    END LOOP;
+END $$;
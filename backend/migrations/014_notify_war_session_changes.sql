@@ -0,0 +1,19 @@
+-- Migration: Notify listeners when a war session changes
+--
+-- Every write to a session's members, payments or payouts bumps
+-- war_sessions.version (migration 013), so one trigger here covers them
+-- all. Listeners (the /war/<id>/events streams) receive the session ID and
+-- new version; notifications are delivered on commit.
+CREATE OR REPLACE FUNCTION notify_war_session_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('war_session_events',
+                      json_build_object('session_id', NEW.session_id, 'version', NEW.version)::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS notify_war_sessions_change ON war_sessions;
+CREATE TRIGGER notify_war_sessions_change AFTER UPDATE ON war_sessions
+    FOR EACH ROW WHEN (NEW.version IS DISTINCT FROM OLD.version)
+    EXECUTE FUNCTION notify_war_session_change();
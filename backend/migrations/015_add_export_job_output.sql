@@ -0,0 +1,17 @@
+-- Migration: Keep export job output on the job row
+--
+-- Job files used to live only in the evictable pdf_report_cache, so a
+-- status or download request served by another instance could find a
+-- completed job without its file. The output now stays on the job until
+-- EXPORT_JOB_OUTPUT_HOURS after completion.
+ALTER TABLE export_jobs
+    ADD COLUMN IF NOT EXISTS output_data BYTEA,
+    ADD COLUMN IF NOT EXISTS output_size INTEGER;
+
+-- PDFs are already compressed; storing them uncompressed out of line lets
+-- downloads read them in chunks with substring()
+ALTER TABLE export_jobs ALTER COLUMN output_data SET STORAGE EXTERNAL;
+
+CREATE INDEX IF NOT EXISTS idx_export_jobs_completed_output
+    ON export_jobs(completed_at)
+    WHERE output_data IS NOT NULL;
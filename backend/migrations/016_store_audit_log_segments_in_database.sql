@@ -0,0 +1,12 @@
+-- Migration: Keep cold-storage segments in the database
+--
+-- Segment files on a server's local disk are lost on hosts with ephemeral
+-- storage (Vercel) and unreadable from every other instance. With
+-- COLD_STORAGE_BACKEND=database the compressed segment is stored here;
+-- path then only names the segment. Directory-backed segments keep
+-- data NULL.
+ALTER TABLE audit_log_segments
+    ADD COLUMN IF NOT EXISTS data BYTEA;
+
+-- Segments are already compressed
+ALTER TABLE audit_log_segments ALTER COLUMN data SET STORAGE EXTERNAL;
@@ -0,0 +1,16 @@
+-- Migration: Key rendered reports and pending export jobs by requester
+--
+-- Report footers name the user who generated them, so a render is only
+-- reused for the same name. Renders of older session versions are still
+-- dropped when a newer one is stored, which needs the version on the row.
+ALTER TABLE pdf_report_cache
+    ADD COLUMN IF NOT EXISTS session_version BIGINT;
+
+-- Renders keyed without a requester are never looked up again
+DELETE FROM pdf_report_cache WHERE session_version IS NULL;
+
+-- Duplicate requests only share a pending job when it prints the same name
+DROP INDEX IF EXISTS idx_export_jobs_pending;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_export_jobs_pending
+    ON export_jobs(war_session_id, kind, generated_by_name)
+    WHERE status IN ('queued', 'running');
@@ -0,0 +1,25 @@
+-- Migration: Keep list sort keys NOT NULL
+--
+-- List endpoints page with a row comparison on (sort key, id). A NULL sort
+-- key on a page's last row makes that comparison unknown for every row, so
+-- the listing would end early. Backfill the NULLs and forbid new ones.
+UPDATE war_sessions
+SET created_timestamp = COALESCE(war_start_timestamp, completed_timestamp, CURRENT_TIMESTAMP)
+WHERE created_timestamp IS NULL;
+
+ALTER TABLE war_sessions ALTER COLUMN created_timestamp SET NOT NULL;
+
+-- History is sorted by completion time
+UPDATE war_sessions
+SET completed_timestamp = COALESCE(war_end_timestamp, created_timestamp)
+WHERE status = 'completed' AND completed_timestamp IS NULL;
+
+ALTER TABLE war_sessions DROP CONSTRAINT IF EXISTS completed_sessions_have_timestamp;
+ALTER TABLE war_sessions ADD CONSTRAINT completed_sessions_have_timestamp
+    CHECK (status <> 'completed' OR completed_timestamp IS NOT NULL);
+
+UPDATE other_payments
+SET created_at = COALESCE(updated_at, CURRENT_TIMESTAMP)
+WHERE created_at IS NULL;
+
+ALTER TABLE other_payments ALTER COLUMN created_at SET NOT NULL;
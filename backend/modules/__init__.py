@@ -1,3 +1,3 @@
-"""Initialize the app package."""
-# Note: create_app is defined in the root app.py file, not in this package
+"""Application package: models, routes, services and utils."""
+# Note: create_app is defined in backend/application.py, not in this package
 
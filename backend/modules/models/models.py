@@ -1,10 +1,225 @@
 """Database models for the application."""
+import psycopg2
+from psycopg2 import sql
+from psycopg2.extras import execute_values
 from config.database import db
 from utils.encryption import encryption_service
-from datetime import datetime, timedelta, date
+from utils.batch_writer import BatchWriter
+from utils.cold_storage import write_segment, read_segment
+from datetime import datetime, timedelta, date, timezone
 from config.settings import config
+from decimal import Decimal, ROUND_HALF_UP
+import heapq
+import os
+import shutil
+import tempfile
+import time
+from uuid import UUID
 from typing import Dict, List, Any, Optional, cast
 
+
+def _decrypt_amount(encrypted_value):
+    """Decrypt a stored money amount, treating missing/invalid values as zero."""
+    if not encrypted_value:
+        return Decimal('0')
+    try:
+        return Decimal(encryption_service.decrypt(encrypted_value))
+    except Exception:
+        return Decimal('0')
+
+
+def _apply_payout_delta(cursor, war_session_id, delta):
+    """
+    Shift the calculated session totals by a single payment/bonus change.
+    
+    Runs inside the caller's transaction so the source row and the totals move
+    together. Sessions that have never been calculated are left untouched.
+    """
+    if not war_session_id or not delta:
+        return None
+    
+    cursor.execute("""
+        SELECT encrypted_total_paid, encrypted_remaining_balance
+        FROM war_sessions WHERE session_id = %s
+        FOR UPDATE
+    """, (war_session_id,))
+    session = cast(Optional[Dict[str, Any]], cursor.fetchone())
+    
+    if not session or not session.get('encrypted_total_paid'):
+        return None
+    
+    cents = Decimal('0.01')
+    total_paid = (_decrypt_amount(session['encrypted_total_paid']) + delta).quantize(cents, rounding=ROUND_HALF_UP)
+    remaining = (_decrypt_amount(session.get('encrypted_remaining_balance')) - delta).quantize(cents, rounding=ROUND_HALF_UP)
+    
+    cursor.execute("""
+        UPDATE war_sessions
+        SET encrypted_total_paid = %s,
+            encrypted_remaining_balance = %s
+        WHERE session_id = %s
+    """, (encryption_service.encrypt(str(float(total_paid))),
+          encryption_service.encrypt(str(float(remaining))),
+          war_session_id))
+    return total_paid, remaining
+
+
+def _faction_session_filter(faction_id, war_session_id=None, start_date=None, end_date=None):
+    """Build the WHERE clause limiting an export to a faction's war sessions."""
+    clause = " WHERE au.faction_id = %s"
+    params: List[Any] = [faction_id]
+    
+    if war_session_id:
+        clause += " AND ws.session_id = %s"
+        params.append(war_session_id)
+    
+    if start_date:
+        clause += " AND ws.created_timestamp >= %s"
+        params.append(start_date)
+    
+    if end_date:
+        clause += " AND ws.created_timestamp <= %s"
+        params.append(end_date)
+    
+    return clause, params
+
+
+def _timestamp_bound(value):
+    """Parse a date/time filter the way Postgres compares it to timestamptz (UTC if naive)."""
+    if value is None or value == '':
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    elif not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _audit_log_filters(start_date=None, end_date=None, action_type=None, user_torn_id=None, war_session_id=None):
+    """Build the WHERE clause shared by the live and archived log queries."""
+    clause = " WHERE 1=1"
+    params: List[Any] = []
+    
+    if start_date:
+        clause += " AND timestamp >= %s"
+        params.append(start_date)
+    
+    if end_date:
+        clause += " AND timestamp <= %s"
+        params.append(end_date)
+    
+    if action_type:
+        clause += " AND action_type = %s"
+        params.append(action_type)
+    
+    if user_torn_id is not None:
+        clause += " AND user_torn_id = %s"
+        params.append(user_torn_id)
+    
+    if war_session_id:
+        clause += " AND war_session_id = %s"
+        params.append(war_session_id)
+    
+    return clause, params
+
+
+def _segment_rows(segment, start_date=None, end_date=None, action_type=None, user_torn_id=None, war_session_id=None):
+    """
+    Read a cold-storage segment, keeping rows that match the archive filters.
+    
+    A segment file missing on this host is skipped with a warning instead of
+    failing the whole query.
+    """
+    start = _timestamp_bound(start_date)
+    end = _timestamp_bound(end_date)
+    
+    if segment['stored_in_database']:
+        rows = read_segment(segment['path'], AuditLogSegment.get_data(segment['segment_id']))
+    elif os.path.exists(segment['path']):
+        rows = read_segment(segment['path'])
+    else:
+        print(f"[AUDIT_LOG] ⚠ Cold-storage segment {segment['path']} is missing on this host, skipping it")
+        return
+    
+    for row in rows:
+        if start and row['timestamp'] < start:
+            continue
+        if end and row['timestamp'] > end:
+            continue
+        if action_type and row['action_type'] != action_type:
+            continue
+        if user_torn_id is not None and row.get('user_torn_id') != int(user_torn_id):
+            continue
+        if war_session_id and str(row.get('war_session_id')) != str(war_session_id):
+            continue
+        yield row
+
+
+def _decrypt_members(members):
+    """Decrypt member stats in place (hit_count, score, bonus_amount as strings)."""
+    for member in members:
+        if member.get('encrypted_hit_count'):
+            member['hit_count'] = encryption_service.decrypt(member['encrypted_hit_count'])
+        if member.get('encrypted_score'):
+            member['score'] = encryption_service.decrypt(member['encrypted_score'])
+        if member.get('encrypted_bonus_amount'):
+            member['bonus_amount'] = encryption_service.decrypt(member['encrypted_bonus_amount'])
+    return members
+
+
+def _decrypt_payments(payments):
+    """Decrypt other payment amounts in place (as strings)."""
+    for payment in payments:
+        if payment.get('encrypted_amount'):
+            payment['amount'] = encryption_service.decrypt(payment['encrypted_amount'])
+    return payments
+
+
+def _mark_payouts_stale(cursor, war_session_id):
+    """Flag the saved payout snapshot as out of date (member data changed)."""
+    cursor.execute("""
+        UPDATE war_sessions
+        SET payouts_stale = TRUE
+        WHERE session_id = %s AND NOT payouts_stale
+    """, (war_session_id,))
+
+
+def _paged_select(columns, fields, order, after=None, limit=None, descending=False):
+    """
+    Build the parts of a list query with a sparse column set and keyset paging.
+
+    Args:
+        columns: API field -> select list items it needs
+        fields: API fields requested, or None for all
+        order: Select items of the sort key (unique together), always selected
+        after: Sort key values of the last row already returned, or None
+        limit: Page size, or None for the whole list (one extra row is
+            fetched so the caller can tell whether another page exists)
+        descending: Sort newest/highest first
+
+    Returns:
+        tuple: (select list, SQL to append after the WHERE conditions, its params)
+    """
+    selected = list(order)
+    for name in fields or columns:
+        for item in columns[name]:
+            if item not in selected:
+                selected.append(item)
+
+    tail = ""
+    params: List[Any] = []
+    if after is not None:
+        tail += f" AND ({', '.join(order)}) {'<' if descending else '>'} ({', '.join(['%s'] * len(order))})"
+        params.extend(after)
+
+    direction = " DESC" if descending else ""
+    tail += " ORDER BY " + ", ".join(item + direction for item in order)
+    if limit is not None:
+        tail += " LIMIT %s"
+        params.append(limit + 1)
+
+    return ", ".join(selected), tail, params
+
+
 class FactionConfig:
     """Model for faction configuration."""
     
@@ -54,6 +269,20 @@ class FactionConfig:
 class AdminUser:
     """Model for admin users (Torn username + password hash)."""
 
+    # API field -> columns, for the user list (never the password hashes)
+    FIELDS = {
+        'admin_id': ('admin_id',),
+        'torn_id': ('torn_id',),
+        'username': ('username',),
+        'email': ('email',),
+        'faction_id': ('faction_id',),
+        'password_changed': ('password_changed',),
+        'created_at': ('created_at',),
+        'updated_at': ('updated_at',)
+    }
+    ORDER = ('username',)
+    ORDER_TYPES = (str,)
+
     @staticmethod
     def get_by_username(username: str) -> Optional[Dict[str, Any]]:
         """Get admin user by username."""
@@ -64,14 +293,18 @@ class AdminUser:
             return cast(Optional[Dict[str, Any]], cursor.fetchone())
 
     @staticmethod
-    def get_all() -> list:
-        """Get all admin users (without sensitive data)."""
+    def get_all(fields=None, after=None, limit=None) -> list:
+        """
+        Get admin users (without sensitive data), ordered by username.
+        
+        Args:
+            fields: FIELDS to select, or None for all
+            after: ORDER values of the last user already returned
+            limit: Page size (one extra row is returned if more exist)
+        """
+        columns, tail, params = _paged_select(AdminUser.FIELDS, fields, AdminUser.ORDER, after, limit)
         with db.get_cursor() as cursor:
-            cursor.execute("""
-                SELECT admin_id, torn_id, username, email, faction_id, password_changed, created_at, updated_at
-                FROM admin_users
-                ORDER BY username
-            """)
+            cursor.execute(f"SELECT {columns} FROM admin_users WHERE TRUE" + tail, params)
             return cursor.fetchall()
 
     @staticmethod
@@ -98,9 +331,126 @@ class AdminUser:
             return cursor.fetchone()
 
 
+class UserSession:
+    """Model for shared login sessions (API keys encrypted at rest)."""
+    
+    @staticmethod
+    def get(torn_id):
+        """Get a session with its API key decrypted, or None."""
+        with db.get_cursor() as cursor:
+            cursor.execute("""
+                SELECT torn_id, faction_id, encrypted_api_key, last_activity
+                FROM user_sessions WHERE torn_id = %s
+            """, (torn_id,))
+            result = cursor.fetchone()
+        
+        if not result:
+            return None
+        
+        encrypted_api_key = result.pop('encrypted_api_key')
+        result['api_key'] = encryption_service.decrypt(encrypted_api_key) if encrypted_api_key else None
+        return result
+    
+    @staticmethod
+    def upsert(torn_id, faction_id, api_key, last_activity):
+        """Create or replace a user's session."""
+        encrypted_api_key = encryption_service.encrypt(api_key) if api_key else None
+        
+        with db.get_cursor() as cursor:
+            cursor.execute("""
+                INSERT INTO user_sessions (torn_id, faction_id, encrypted_api_key, last_activity)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (torn_id)
+                DO UPDATE SET
+                    faction_id = EXCLUDED.faction_id,
+                    encrypted_api_key = EXCLUDED.encrypted_api_key,
+                    last_activity = EXCLUDED.last_activity,
+                    created_at = CURRENT_TIMESTAMP
+            """, (torn_id, faction_id, encrypted_api_key, last_activity))
+    
+    @staticmethod
+    def touch_many(activity):
+        """
+        Write back last-activity times in one statement.
+        
+        Args:
+            activity: List of (torn_id, last_activity) pairs; the latest time
+                      per user wins and times never move backwards
+        """
+        latest = {}
+        for torn_id, last_activity in activity:
+            if torn_id not in latest or last_activity > latest[torn_id]:
+                latest[torn_id] = last_activity
+        
+        if not latest:
+            return 0
+        
+        with db.get_cursor() as cursor:
+            execute_values(cursor, """
+                UPDATE user_sessions s
+                SET last_activity = GREATEST(s.last_activity, v.last_activity)
+                FROM (VALUES %s) AS v(torn_id, last_activity)
+                WHERE s.torn_id = v.torn_id
+            """, list(latest.items()), template="(%s::integer, %s::timestamptz)")
+            return cursor.rowcount
+    
+    @staticmethod
+    def delete(torn_id):
+        """Delete a user's session."""
+        with db.get_cursor() as cursor:
+            cursor.execute("DELETE FROM user_sessions WHERE torn_id = %s", (torn_id,))
+    
+    @staticmethod
+    def delete_if_inactive(torn_id, cutoff):
+        """
+        Delete a user's session unless activity at or after cutoff was recorded.
+        
+        Returns:
+            bool: True if the session was deleted
+        """
+        with db.get_cursor() as cursor:
+            cursor.execute("""
+                DELETE FROM user_sessions WHERE torn_id = %s AND last_activity < %s
+            """, (torn_id, cutoff))
+            return cursor.rowcount > 0
+    
+    @staticmethod
+    def delete_inactive(cutoff):
+        """Delete sessions with no activity since cutoff."""
+        with db.get_cursor() as cursor:
+            cursor.execute("DELETE FROM user_sessions WHERE last_activity < %s", (cutoff,))
+            return cursor.rowcount
+
+
 class WarSession:
     """Model for war sessions."""
     
+    # API field -> select list items, for the /war/list and /war/history lists
+    LIST_FIELDS = {
+        'session_id': ('ws.session_id',),
+        'war_name': ('ws.war_name',),
+        'status': ('ws.completed_timestamp',),
+        'ranked_war_id': ('ws.ranked_war_id',),
+        'opposing_faction_name': ('ws.opposing_faction_name',),
+        'war_start_timestamp': ('ws.war_start_timestamp',),
+        'war_end_timestamp': ('ws.war_end_timestamp',),
+        'total_earnings': ('ws.total_earnings',),
+        'price_per_hit': ('ws.price_per_hit',),
+        'created_timestamp': ('ws.created_timestamp',),
+        'completed_timestamp': ('ws.completed_timestamp',),
+        'member_count': ('(SELECT COUNT(*) FROM members m WHERE m.war_session_id = ws.session_id) AS member_count',)
+    }
+    LIST_ORDER = ('ws.created_timestamp', 'ws.session_id')
+    LIST_ORDER_TYPES = (datetime, UUID)
+    
+    HISTORY_FIELDS = {
+        **{name: items for name, items in LIST_FIELDS.items() if name != 'status'},
+        # Hit counts are encrypted, so the total is summed after decryption
+        'total_hits': ()
+    }
+    HISTORY_ORDER = ('ws.completed_timestamp', 'ws.session_id')
+    HISTORY_ORDER_TYPES = (datetime, UUID)
+    
     @staticmethod
     def create(war_name, created_by_torn_id, ranked_war_id=None, opposing_faction_name=None, war_start_timestamp=None, war_end_timestamp=None):
         """Create a new war session."""
@@ -142,8 +492,8 @@ class WarSession:
             return result
     
     @staticmethod
-    def update_calculations(session_id, total_earnings, price_per_hit, total_paid, remaining_balance):
-        """Update war session calculations."""
+    def update_calculations(session_id, total_earnings, price_per_hit, total_paid, remaining_balance, payout_fingerprint=None):
+        """Update war session calculations and the fingerprint of the inputs they came from."""
         encrypted_total_paid = encryption_service.encrypt(str(total_paid))
         encrypted_remaining = encryption_service.encrypt(str(remaining_balance))
         
@@ -153,10 +503,25 @@ class WarSession:
                 SET total_earnings = %s,
                     price_per_hit = %s,
                     encrypted_total_paid = %s,
-                    encrypted_remaining_balance = %s
+                    encrypted_remaining_balance = %s,
+                    payout_fingerprint = %s,
+                    payouts_stale = %s
                 WHERE session_id = %s
                 RETURNING session_id
-            """, (total_earnings, price_per_hit, encrypted_total_paid, encrypted_remaining, session_id))
+            """, (total_earnings, price_per_hit, encrypted_total_paid, encrypted_remaining,
+                  payout_fingerprint, payout_fingerprint is None, session_id))
+            return cursor.fetchone()
+    
+    @staticmethod
+    def mark_payouts_fresh(session_id):
+        """Mark the saved payout snapshot as matching the current inputs."""
+        with db.get_cursor() as cursor:
+            cursor.execute("""
+                UPDATE war_sessions
+                SET payouts_stale = FALSE
+                WHERE session_id = %s
+                RETURNING session_id
+            """, (session_id,))
             return cursor.fetchone()
     
     @staticmethod
@@ -173,37 +538,87 @@ class WarSession:
             return cursor.fetchone()
     
     @staticmethod
-    def get_all_completed():
-        """Get all completed war sessions."""
+    def get_all_completed(fields=None, after=None, limit=None):
+        """
+        Get completed war sessions, most recently completed first.
+        
+        Args:
+            fields: HISTORY_FIELDS to select, or None for all
+            after: HISTORY_ORDER values of the last session already returned
+            limit: Page size (one extra row is returned if more exist)
+        """
+        columns, tail, params = _paged_select(
+            WarSession.HISTORY_FIELDS, fields, WarSession.HISTORY_ORDER, after, limit, descending=True
+        )
         with db.get_cursor() as cursor:
-            cursor.execute("""
-                SELECT session_id, war_name, created_timestamp, completed_timestamp,
-                       total_earnings, price_per_hit
-                FROM war_sessions 
-                WHERE status = 'completed'
-                ORDER BY completed_timestamp DESC
-            """)
+            cursor.execute(f"""
+                SELECT {columns}
+                FROM war_sessions ws
+                WHERE ws.status = 'completed'
+            """ + tail, params)
             return cursor.fetchall()
 
     @staticmethod
-    def get_by_faction(faction_id: int):
-        """Get all war sessions for a faction."""
+    def get_by_faction(faction_id: int, status=None, fields=None, after=None, limit=None):
+        """
+        Get a faction's war sessions, newest first.
+        
+        Args:
+            faction_id: Faction ID
+            status: Only sessions with this status ('active'/'completed'), or None for all
+            fields: LIST_FIELDS to select, or None for all
+            after: LIST_ORDER values of the last session already returned
+            limit: Page size (one extra row is returned if more exist)
+        """
+        columns, tail, params = _paged_select(
+            WarSession.LIST_FIELDS, fields, WarSession.LIST_ORDER, after, limit, descending=True
+        )
+        query = f"""
+            SELECT {columns}
+            FROM war_sessions ws
+            LEFT JOIN admin_users au ON ws.created_by_torn_id = au.torn_id
+            WHERE au.faction_id = %s
+        """
+        filters: List[Any] = [faction_id]
+        
+        if status:
+            query += " AND ws.status = %s"
+            filters.append(status)
+        
         with db.get_cursor() as cursor:
-            cursor.execute("""
-                SELECT ws.session_id, ws.war_name, ws.created_timestamp, ws.completed_timestamp,
-                       ws.status, ws.total_earnings, ws.price_per_hit,
-                       ws.ranked_war_id, ws.opposing_faction_name,
-                       ws.war_start_timestamp, ws.war_end_timestamp,
-                       COUNT(DISTINCT m.member_id) as member_count
-                FROM war_sessions ws
-                LEFT JOIN admin_users au ON ws.created_by_torn_id = au.torn_id
-                LEFT JOIN members m ON ws.session_id = m.war_session_id
-                WHERE au.faction_id = %s
-                GROUP BY ws.session_id
-                ORDER BY ws.created_timestamp DESC
-            """, (faction_id,))
+            cursor.execute(query + tail, filters + params)
             return cursor.fetchall()
 
+    @staticmethod
+    def get_for_export(faction_id, session_ids=None, start_date=None, end_date=None, limit=200):
+        """Get a faction's war sessions by ID list and/or creation date range."""
+        query = """
+            SELECT ws.session_id, ws.war_name, ws.created_timestamp
+            FROM war_sessions ws
+            JOIN admin_users au ON ws.created_by_torn_id = au.torn_id
+            WHERE au.faction_id = %s
+        """
+        params: List[Any] = [faction_id]
+        
+        if session_ids:
+            query += " AND ws.session_id::text = ANY(%s)"
+            params.append([str(s) for s in session_ids])
+        
+        if start_date:
+            query += " AND ws.created_timestamp >= %s"
+            params.append(start_date)
+        
+        if end_date:
+            query += " AND ws.created_timestamp <= %s"
+            params.append(end_date)
+        
+        query += " ORDER BY ws.created_timestamp LIMIT %s"
+        params.append(limit)
+        
+        with db.get_cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+    
     @staticmethod
     def get_by_id(session_id):
         """Get a war session by ID."""
@@ -212,11 +627,109 @@ class WarSession:
                 SELECT * FROM war_sessions WHERE session_id = %s
             """, (session_id,))
             return cursor.fetchone()
+    
+    @staticmethod
+    def get_workspace(session_id):
+        """
+        Read a war session with its members, other payments and saved payouts.
+        
+        All reads share one read-only REPEATABLE READ transaction, so the
+        parts are consistent with each other and with the session version.
+        Members and payments are decrypted once.
+        
+        Returns:
+            dict: war, members, other_payments and member_payouts, or None if
+                  the session does not exist
+        """
+        with db.get_cursor() as cursor:
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+            cursor.execute("SELECT * FROM war_sessions WHERE session_id = %s", (session_id,))
+            war = cursor.fetchone()
+            if not war:
+                return None
+            
+            cursor.execute("""
+                SELECT * FROM members WHERE war_session_id = %s
+                ORDER BY name
+            """, (session_id,))
+            members = _decrypt_members(cast(List[Dict[str, Any]], cursor.fetchall()))
+            
+            cursor.execute("""
+                SELECT * FROM other_payments WHERE war_session_id = %s
+                ORDER BY created_at
+            """, (session_id,))
+            other_payments = _decrypt_payments(cast(List[Dict[str, Any]], cursor.fetchall()))
+            
+            cursor.execute("""
+                SELECT payout_id, war_session_id, member_id, torn_id, name, hit_count,
+                       base_payout, bonus_amount, total_payout, bonus_reason, member_status
+                FROM member_payouts
+                WHERE war_session_id = %s
+                ORDER BY name
+            """, (session_id,))
+            member_payouts = cursor.fetchall()
+            
+            return {
+                'war': war,
+                'members': members,
+                'other_payments': other_payments,
+                'member_payouts': member_payouts
+            }
+    
+    @staticmethod
+    def get_version(session_id):
+        """
+        Get a war session's version counter (bumped by every write to it).
+        
+        Returns:
+            int: Version, or None if the session does not exist
+        """
+        with db.get_cursor() as cursor:
+            cursor.execute("""
+                SELECT version FROM war_sessions WHERE session_id = %s
+            """, (session_id,))
+            result = cursor.fetchone()
+            return result['version'] if result else None  # type: ignore
+    
+    @staticmethod
+    def get_faction_version(faction_id):
+        """
+        Get a digest of the versions of all a faction's war sessions.
+        
+        Changes whenever any of the sessions is written to, created or removed.
+        """
+        with db.get_cursor() as cursor:
+            cursor.execute("""
+                SELECT md5(COALESCE(string_agg(ws.session_id::text || ':' || ws.version, ','
+                                               ORDER BY ws.session_id), '')) AS digest
+                FROM war_sessions ws
+                JOIN admin_users au ON ws.created_by_torn_id = au.torn_id
+                WHERE au.faction_id = %s
+            """, (faction_id,))
+            return cursor.fetchone()['digest']  # type: ignore
 
 
 class Member:
     """Model for faction members."""
     
+    # API field -> columns, for the member list (encrypted columns are only
+    # fetched and decrypted when their field is requested)
+    FIELDS = {
+        'member_id': ('member_id',),
+        'war_session_id': ('war_session_id',),
+        'torn_id': ('torn_id',),
+        'name': ('name',),
+        'hit_count': ('encrypted_hit_count',),
+        'score': ('encrypted_score',),
+        'bonus_amount': ('encrypted_bonus_amount',),
+        'bonus_reason': ('bonus_reason',),
+        'member_status': ('member_status',),
+        'created_at': ('created_at',),
+        'updated_at': ('updated_at',)
+    }
+    ORDER = ('name', 'member_id')
+    ORDER_TYPES = (str, int)
+    
     @staticmethod
     def upsert(war_session_id, torn_id, name, hit_count, score=None, member_status='active'):
         """Create or update member in war session."""
@@ -236,7 +749,9 @@ class Member:
                     updated_at = CURRENT_TIMESTAMP
                 RETURNING member_id
             """, (war_session_id, torn_id, name, encrypted_hits, encrypted_score, member_status))
-            return cursor.fetchone()
+            result = cursor.fetchone()
+            _mark_payouts_stale(cursor, war_session_id)
+            return result
     
     @staticmethod
     def get_by_session(war_session_id):
@@ -249,45 +764,222 @@ class Member:
             results: List[Dict[str, Any]] = cast(List[Dict[str, Any]], cursor.fetchall())
             
             # Decrypt sensitive fields
-            for result in results:
-                if result.get('encrypted_hit_count'):
-                    result['hit_count'] = encryption_service.decrypt(result['encrypted_hit_count'])
-                if result.get('encrypted_score'):
-                    result['score'] = encryption_service.decrypt(result['encrypted_score'])
-                if result.get('encrypted_bonus_amount'):
-                    result['bonus_amount'] = encryption_service.decrypt(result['encrypted_bonus_amount'])
-            
-            return results
+            return _decrypt_members(results)
+    
+    @staticmethod
+    def get_page(war_session_id, fields=None, after=None, limit=None):
+        """
+        Get a war session's members by name, selecting only the requested fields.
+        
+        Args:
+            war_session_id: War session UUID
+            fields: FIELDS to select, or None for all
+            after: ORDER values of the last member already returned
+            limit: Page size (one extra row is returned if more exist)
+        """
+        columns, tail, params = _paged_select(Member.FIELDS, fields, Member.ORDER, after, limit)
+        with db.get_cursor() as cursor:
+            cursor.execute(f"SELECT {columns} FROM members WHERE war_session_id = %s" + tail,
+                           [war_session_id] + params)
+            return _decrypt_members(cast(List[Dict[str, Any]], cursor.fetchall()))
+    
+    @staticmethod
+    def get_hit_totals(war_session_ids):
+        """
+        Sum the (encrypted) hit counts of several war sessions.
+        
+        Returns:
+            dict: session_id (str) -> total hits
+        """
+        totals = {str(session_id): 0 for session_id in war_session_ids}
+        if not totals:
+            return totals
+        
+        with db.get_cursor() as cursor:
+            cursor.execute("""
+                SELECT war_session_id, encrypted_hit_count FROM members
+                WHERE war_session_id = ANY(%s::uuid[])
+            """, (list(totals),))
+            for row in cursor.fetchall():
+                if row['encrypted_hit_count']:
+                    totals[str(row['war_session_id'])] += int(encryption_service.decrypt(row['encrypted_hit_count']) or 0)
+        return totals
+    
+    @staticmethod
+    def iter_for_export(faction_id, war_session_id=None, start_date=None, end_date=None, batch_size=1000):
+        """
+        Stream a faction's members with decrypted stats, one batch at a time.
+        
+        Yields:
+            list: Up to batch_size member dicts
+        """
+        where, params = _faction_session_filter(faction_id, war_session_id, start_date, end_date)
+        query = """
+            SELECT m.war_session_id, ws.war_name, m.member_id, m.torn_id, m.name,
+                   m.encrypted_hit_count, m.encrypted_score, m.encrypted_bonus_amount,
+                   m.bonus_reason, m.member_status, m.updated_at
+            FROM members m
+            JOIN war_sessions ws ON m.war_session_id = ws.session_id
+            JOIN admin_users au ON ws.created_by_torn_id = au.torn_id
+        """ + where + " ORDER BY ws.created_timestamp, m.war_session_id, m.name"
+        
+        for rows in db.iter_batches(query, params, batch_size):
+            batch = []
+            for row in rows:
+                encrypted_hits = row.pop('encrypted_hit_count')
+                encrypted_score = row.pop('encrypted_score')
+                encrypted_bonus = row.pop('encrypted_bonus_amount')
+                row['hit_count'] = int(encryption_service.decrypt(encrypted_hits)) if encrypted_hits else 0
+                row['score'] = Decimal(encryption_service.decrypt(encrypted_score)) if encrypted_score else None
+                row['bonus_amount'] = _decrypt_amount(encrypted_bonus)
+                batch.append(row)
+            yield batch
     
     @staticmethod
     def update_bonus(member_id, bonus_amount, bonus_reason):
-        """Update member bonus."""
+        """Update member bonus and apply the change to any calculated payout."""
         encrypted_bonus = encryption_service.encrypt(str(bonus_amount)) if bonus_amount else None
         
         with db.get_cursor() as cursor:
             cursor.execute("""
-                UPDATE members 
+                UPDATE members m
                 SET encrypted_bonus_amount = %s,
                     bonus_reason = %s,
                     updated_at = CURRENT_TIMESTAMP
-                WHERE member_id = %s
-                RETURNING member_id
+                FROM (
+                    SELECT member_id, encrypted_bonus_amount
+                    FROM members WHERE member_id = %s
+                    FOR UPDATE
+                ) old
+                WHERE m.member_id = old.member_id
+                RETURNING m.member_id, m.war_session_id, old.encrypted_bonus_amount AS old_encrypted_bonus_amount
             """, (encrypted_bonus, bonus_reason, member_id))
-            return cursor.fetchone()
+            result = cast(Optional[Dict[str, Any]], cursor.fetchone())
+            
+            if result:
+                Member._apply_bonus_change(cursor, result, Decimal(str(bonus_amount or 0)), bonus_reason)
+            
+            return result
     
     @staticmethod
     def delete_bonus(member_id):
-        """Remove member bonus."""
+        """Remove member bonus and apply the change to any calculated payout."""
         with db.get_cursor() as cursor:
             cursor.execute("""
-                UPDATE members 
+                UPDATE members m
                 SET encrypted_bonus_amount = NULL,
                     bonus_reason = NULL,
                     updated_at = CURRENT_TIMESTAMP
-                WHERE member_id = %s
-                RETURNING member_id
+                FROM (
+                    SELECT member_id, encrypted_bonus_amount
+                    FROM members WHERE member_id = %s
+                    FOR UPDATE
+                ) old
+                WHERE m.member_id = old.member_id
+                RETURNING m.member_id, m.war_session_id, old.encrypted_bonus_amount AS old_encrypted_bonus_amount
             """, (member_id,))
-            return cursor.fetchone()
+            result = cast(Optional[Dict[str, Any]], cursor.fetchone())
+            
+            if result:
+                Member._apply_bonus_change(cursor, result, Decimal('0'), None)
+            
+            return result
+    
+    @staticmethod
+    def update_bonuses(changes):
+        """
+        Set bonuses for several members in one transaction.
+        
+        Members are locked, updated with a single multi-row UPDATE, and their
+        payout rows and session totals adjusted once per session. Nothing is
+        written unless every member exists.
+        
+        Args:
+            changes: List of (member_id, bonus_amount, bonus_reason); a zero
+                     amount clears the bonus
+            
+        Returns:
+            list: Dicts with member_id, war_session_id, old_bonus and new_bonus
+            
+        Raises:
+            ValueError: If any member does not exist
+        """
+        if not changes:
+            return []
+        
+        cents = Decimal('0.01')
+        member_ids = [member_id for member_id, _, _ in changes]
+        
+        with db.get_cursor() as cursor:
+            cursor.execute("""
+                SELECT member_id, war_session_id, encrypted_bonus_amount
+                FROM members WHERE member_id = ANY(%s)
+                ORDER BY member_id
+                FOR UPDATE
+            """, (member_ids,))
+            existing = {row['member_id']: row for row in cursor.fetchall()}  # type: ignore
+            
+            missing = [member_id for member_id in member_ids if member_id not in existing]
+            if missing:
+                raise ValueError(f"Members not found: {', '.join(str(m) for m in missing)}")
+            
+            rows = []
+            results = []
+            for member_id, bonus_amount, bonus_reason in changes:
+                new_bonus = Decimal(str(bonus_amount or 0)).quantize(cents, rounding=ROUND_HALF_UP)
+                encrypted_bonus = encryption_service.encrypt(str(bonus_amount)) if bonus_amount else None
+                rows.append((member_id, encrypted_bonus, bonus_reason, new_bonus))
+                results.append({
+                    'member_id': member_id,
+                    'war_session_id': existing[member_id]['war_session_id'],
+                    'old_bonus': _decrypt_amount(existing[member_id]['encrypted_bonus_amount']),
+                    'new_bonus': new_bonus
+                })
+            
+            execute_values(cursor, """
+                UPDATE members m
+                SET encrypted_bonus_amount = v.encrypted_bonus_amount,
+                    bonus_reason = v.bonus_reason,
+                    updated_at = CURRENT_TIMESTAMP
+                FROM (VALUES %s) AS v(member_id, encrypted_bonus_amount, bonus_reason, bonus_amount)
+                WHERE m.member_id = v.member_id
+            """, rows, template="(%s::integer, %s::text, %s::text, %s::numeric)", page_size=len(rows))
+            
+            execute_values(cursor, """
+                UPDATE member_payouts mp
+                SET bonus_amount = v.bonus_amount,
+                    total_payout = mp.base_payout + v.bonus_amount,
+                    bonus_reason = v.bonus_reason,
+                    updated_at = CURRENT_TIMESTAMP
+                FROM (VALUES %s) AS v(member_id, encrypted_bonus_amount, bonus_reason, bonus_amount)
+                WHERE mp.member_id = v.member_id
+            """, rows, template="(%s::integer, %s::text, %s::text, %s::numeric)", page_size=len(rows))
+            
+            deltas: Dict[Any, Decimal] = {}
+            for result in results:
+                session_id = result['war_session_id']
+                deltas[session_id] = deltas.get(session_id, Decimal('0')) + result['new_bonus'] - result['old_bonus']
+            for session_id, delta in deltas.items():
+                _apply_payout_delta(cursor, session_id, delta)
+            
+            return results
+    
+    @staticmethod
+    def _apply_bonus_change(cursor, updated_row, new_bonus, bonus_reason):
+        """Rewrite the member's payout row and the session totals for a bonus change."""
+        old_bonus = _decrypt_amount(updated_row.get('old_encrypted_bonus_amount'))
+        new_bonus = new_bonus.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+        
+        cursor.execute("""
+            UPDATE member_payouts
+            SET bonus_amount = %s,
+                total_payout = base_payout + %s,
+                bonus_reason = %s,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE war_session_id = %s AND member_id = %s
+        """, (new_bonus, new_bonus, bonus_reason, updated_row['war_session_id'], updated_row['member_id']))
+        
+        _apply_payout_delta(cursor, updated_row['war_session_id'], new_bonus - old_bonus)
     
     @staticmethod
     def update_status(war_session_id, torn_id, status):
@@ -300,15 +992,31 @@ class Member:
                 WHERE war_session_id = %s AND torn_id = %s
                 RETURNING member_id
             """, (status, war_session_id, torn_id))
-            return cursor.fetchone()
+            result = cursor.fetchone()
+            if result:
+                _mark_payouts_stale(cursor, war_session_id)
+            return result
 
 
 class OtherPayment:
     """Model for other payments."""
     
+    # API field -> columns, for the payment list
+    FIELDS = {
+        'payment_id': ('payment_id',),
+        'war_session_id': ('war_session_id',),
+        'amount': ('encrypted_amount',),
+        'description': ('description',),
+        'created_at': ('created_at',),
+        'updated_at': ('updated_at',),
+        'created_by_torn_id': ('created_by_torn_id',)
+    }
+    ORDER = ('created_at', 'payment_id')
+    ORDER_TYPES = (datetime, int)
+    
     @staticmethod
     def create(war_session_id, amount, description, created_by_torn_id):
-        """Create a new other payment."""
+        """Create a new other payment and add it to any calculated totals."""
         encrypted_amount = encryption_service.encrypt(str(amount))
         
         with db.get_cursor() as cursor:
@@ -317,7 +1025,11 @@ class OtherPayment:
                 VALUES (%s, %s, %s, %s)
                 RETURNING payment_id, created_at
             """, (war_session_id, encrypted_amount, description, created_by_torn_id))
-            return cursor.fetchone()
+            result = cursor.fetchone()
+            
+            _apply_payout_delta(cursor, war_session_id, Decimal(str(amount)))
+            
+            return result
     
     @staticmethod
     def get_by_session(war_session_id):
@@ -330,37 +1042,66 @@ class OtherPayment:
             results: List[Dict[str, Any]] = cast(List[Dict[str, Any]], cursor.fetchall())
             
             # Decrypt amounts
-            for result in results:
-                if result.get('encrypted_amount'):
-                    result['amount'] = encryption_service.decrypt(result['encrypted_amount'])
-            
-            return results
+            return _decrypt_payments(results)
+    
+    @staticmethod
+    def get_page(war_session_id, fields=None, after=None, limit=None):
+        """
+        Get a war session's other payments by creation time, selecting only the requested fields.
+        
+        Args:
+            war_session_id: War session UUID
+            fields: FIELDS to select, or None for all
+            after: ORDER values of the last payment already returned
+            limit: Page size (one extra row is returned if more exist)
+        """
+        columns, tail, params = _paged_select(OtherPayment.FIELDS, fields, OtherPayment.ORDER, after, limit)
+        with db.get_cursor() as cursor:
+            cursor.execute(f"SELECT {columns} FROM other_payments WHERE war_session_id = %s" + tail,
+                           [war_session_id] + params)
+            return _decrypt_payments(cast(List[Dict[str, Any]], cursor.fetchall()))
     
     @staticmethod
     def update(payment_id, amount, description):
-        """Update an other payment."""
+        """Update an other payment and apply the difference to any calculated totals."""
         encrypted_amount = encryption_service.encrypt(str(amount))
         
         with db.get_cursor() as cursor:
             cursor.execute("""
-                UPDATE other_payments 
+                UPDATE other_payments p
                 SET encrypted_amount = %s,
                     description = %s,
                     updated_at = CURRENT_TIMESTAMP
-                WHERE payment_id = %s
-                RETURNING payment_id
+                FROM (
+                    SELECT payment_id, encrypted_amount
+                    FROM other_payments WHERE payment_id = %s
+                    FOR UPDATE
+                ) old
+                WHERE p.payment_id = old.payment_id
+                RETURNING p.payment_id, p.war_session_id, old.encrypted_amount AS old_encrypted_amount
             """, (encrypted_amount, description, payment_id))
-            return cursor.fetchone()
+            result = cast(Optional[Dict[str, Any]], cursor.fetchone())
+            
+            if result:
+                delta = Decimal(str(amount)) - _decrypt_amount(result.get('old_encrypted_amount'))
+                _apply_payout_delta(cursor, result['war_session_id'], delta)
+            
+            return result
     
     @staticmethod
     def delete(payment_id):
-        """Delete an other payment."""
+        """Delete an other payment and remove it from any calculated totals."""
         with db.get_cursor() as cursor:
             cursor.execute("""
                 DELETE FROM other_payments WHERE payment_id = %s
-                RETURNING payment_id
+                RETURNING payment_id, war_session_id, encrypted_amount
             """, (payment_id,))
-            return cursor.fetchone()
+            result = cast(Optional[Dict[str, Any]], cursor.fetchone())
+            
+            if result:
+                _apply_payout_delta(cursor, result['war_session_id'], -_decrypt_amount(result.get('encrypted_amount')))
+            
+            return result
 
 
 class MemberPayout:
@@ -414,6 +1155,26 @@ class MemberPayout:
             print(f"[PAYOUT_MODEL] ✗ Error getting payouts: {e}")
             raise
     
+    @staticmethod
+    def iter_for_export(faction_id, war_session_id=None, start_date=None, end_date=None, batch_size=1000):
+        """
+        Stream a faction's saved member payouts, one batch at a time.
+        
+        Yields:
+            list: Up to batch_size payout dicts
+        """
+        where, params = _faction_session_filter(faction_id, war_session_id, start_date, end_date)
+        query = """
+            SELECT mp.war_session_id, ws.war_name, mp.member_id, mp.torn_id, mp.name,
+                   mp.hit_count, mp.base_payout, mp.bonus_amount, mp.total_payout,
+                   mp.bonus_reason, mp.member_status
+            FROM member_payouts mp
+            JOIN war_sessions ws ON mp.war_session_id = ws.session_id
+            JOIN admin_users au ON ws.created_by_torn_id = au.torn_id
+        """ + where + " ORDER BY ws.created_timestamp, mp.war_session_id, mp.name"
+        
+        yield from db.iter_batches(query, params, batch_size)
+    
     @staticmethod
     def delete_by_session(war_session_id):
         """Delete all member payouts for a war session (for recalculation)."""
@@ -466,28 +1227,259 @@ class MemberPayout:
             raise
 
 
+class ReportCache:
+    """Model for rendered PDF reports keyed by a fingerprint of their inputs."""
+    
+    @staticmethod
+    def get(report_key):
+        """
+        Get a cached report by key.
+        
+        A hit is a plain read: last_accessed_at (used for eviction) is only
+        refreshed once it is PDF_CACHE_TOUCH_SECONDS old, and a failed
+        refresh (e.g. on a read replica) does not fail the read.
+        """
+        with db.get_cursor() as cursor:
+            cursor.execute("""
+                SELECT report_key, war_session_id, pdf_data,
+                       last_accessed_at < CURRENT_TIMESTAMP - make_interval(secs => %s) AS touch_due
+                FROM pdf_report_cache
+                WHERE report_key = %s
+            """, (config.PDF_CACHE_TOUCH_SECONDS, report_key))
+            cached = cursor.fetchone()
+        
+        if cached and cached.pop('touch_due'):
+            try:
+                with db.get_cursor() as cursor:
+                    cursor.execute("""
+                        UPDATE pdf_report_cache
+                        SET last_accessed_at = CURRENT_TIMESTAMP
+                        WHERE report_key = %s
+                    """, (report_key,))
+            except Exception as e:
+                print(f"[PDF_CACHE] ⚠ Could not record access to report {report_key[:12]}: {e}")
+        
+        return cached
+    
+    @staticmethod
+    def store(report_key, war_session_id, session_version, pdf_bytes):
+        """Cache a rendered report, replacing renders of older session versions."""
+        with db.get_cursor() as cursor:
+            cursor.execute("""
+                DELETE FROM pdf_report_cache
+                WHERE war_session_id = %s AND session_version < %s
+            """, (war_session_id, session_version))
+            cursor.execute("""
+                INSERT INTO pdf_report_cache (report_key, war_session_id, session_version, pdf_data, size_bytes)
+                VALUES (%s, %s, %s, %s, %s)
+                ON CONFLICT (report_key)
+                DO UPDATE SET last_accessed_at = CURRENT_TIMESTAMP
+                RETURNING report_key
+            """, (report_key, war_session_id, session_version, psycopg2.Binary(pdf_bytes), len(pdf_bytes)))
+            result = cursor.fetchone()
+            ReportCache._evict(cursor)
+            return result
+    
+    @staticmethod
+    def _evict(cursor):
+        """Drop least recently used reports once the cache exceeds its size cap."""
+        cursor.execute("""
+            DELETE FROM pdf_report_cache
+            WHERE report_key IN (
+                SELECT report_key FROM (
+                    SELECT report_key,
+                           SUM(size_bytes) OVER (ORDER BY last_accessed_at DESC) AS running_size
+                    FROM pdf_report_cache
+                ) ranked
+                WHERE running_size > %s
+            )
+        """, (config.PDF_CACHE_MAX_BYTES,))
+
+
+class ExportJob:
+    """Model for background report export jobs."""
+    
+    # Everything but the output file itself
+    COLUMNS = """
+        job_id, war_session_id, kind, status, progress, report_key, error,
+        requested_by_torn_id, generated_by_name, created_at, updated_at, completed_at,
+        output_size, output_data IS NOT NULL AS has_output
+    """
+    
+    @staticmethod
+    def create_or_get(war_session_id, kind, requested_by_torn_id, generated_by_name):
+        """Queue a job, or return the one already pending for this session, kind and name."""
+        with db.get_cursor() as cursor:
+            # Jobs from a crashed worker would otherwise block new requests forever
+            cursor.execute("""
+                UPDATE export_jobs
+                SET status = 'failed',
+                    error = 'Timed out',
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE war_session_id = %s AND kind = %s
+                  AND status IN ('queued', 'running')
+                  AND updated_at < CURRENT_TIMESTAMP - make_interval(mins => %s)
+            """, (war_session_id, kind, config.EXPORT_JOB_TIMEOUT_MINUTES))
+            
+            # Drop the files of old jobs (their downloads answer 410)
+            cursor.execute("""
+                UPDATE export_jobs
+                SET output_data = NULL
+                WHERE output_data IS NOT NULL
+                  AND completed_at < CURRENT_TIMESTAMP - make_interval(hours => %s)
+            """, (config.EXPORT_JOB_OUTPUT_HOURS,))
+            
+            cursor.execute("""
+                INSERT INTO export_jobs (war_session_id, kind, status, progress, requested_by_torn_id, generated_by_name)
+                VALUES (%s, %s, 'queued', 0, %s, %s)
+                ON CONFLICT (war_session_id, kind, generated_by_name) WHERE status IN ('queued', 'running')
+                DO NOTHING
+                RETURNING """ + ExportJob.COLUMNS, (war_session_id, kind, requested_by_torn_id, generated_by_name))
+            created = cursor.fetchone()
+            
+            if created:
+                return created, True
+            
+            cursor.execute("""
+                SELECT """ + ExportJob.COLUMNS + """ FROM export_jobs
+                WHERE war_session_id = %s AND kind = %s AND generated_by_name = %s
+                  AND status IN ('queued', 'running')
+            """, (war_session_id, kind, generated_by_name))
+            return cursor.fetchone(), False
+    
+    @staticmethod
+    def get(job_id):
+        """Get an export job by ID (without its output file)."""
+        with db.get_cursor() as cursor:
+            cursor.execute("""
+                SELECT """ + ExportJob.COLUMNS + """ FROM export_jobs WHERE job_id = %s
+            """, (job_id,))
+            return cursor.fetchone()
+    
+    @staticmethod
+    def update(job_id, status, progress, report_key=None, error=None):
+        """Record job progress."""
+        with db.get_cursor() as cursor:
+            cursor.execute("""
+                UPDATE export_jobs
+                SET status = %s,
+                    progress = %s,
+                    report_key = COALESCE(%s, report_key),
+                    error = %s,
+                    updated_at = CURRENT_TIMESTAMP,
+                    completed_at = CASE WHEN %s IN ('completed', 'failed') THEN CURRENT_TIMESTAMP END
+                WHERE job_id = %s
+                RETURNING job_id, status, progress
+            """, (status, progress, report_key, error, status, job_id))
+            return cursor.fetchone()
+    
+    @staticmethod
+    def complete(job_id, report_key, output):
+        """Mark a job completed and store its output file on the row."""
+        with db.get_cursor() as cursor:
+            cursor.execute("""
+                UPDATE export_jobs
+                SET status = 'completed',
+                    progress = 100,
+                    report_key = %s,
+                    error = NULL,
+                    output_data = %s,
+                    output_size = %s,
+                    updated_at = CURRENT_TIMESTAMP,
+                    completed_at = CURRENT_TIMESTAMP
+                WHERE job_id = %s
+                RETURNING job_id, status, progress
+            """, (report_key, psycopg2.Binary(output), len(output), job_id))
+            return cursor.fetchone()
+    
+    @staticmethod
+    def iter_output(job_id, chunk_size=1024 * 1024):
+        """
+        Stream a job's output file in chunks.
+        
+        The column is stored uncompressed, so each substring() reads only its
+        own chunk. The connection stays open until iteration finishes.
+        
+        Yields:
+            bytes: Up to chunk_size bytes of the file
+        """
+        offset = 1
+        with db.get_cursor() as cursor:
+            while True:
+                cursor.execute("""
+                    SELECT substring(output_data FROM %s FOR %s) AS chunk
+                    FROM export_jobs WHERE job_id = %s
+                """, (offset, chunk_size, job_id))
+                row = cursor.fetchone()
+                if not row or not row['chunk']:  # type: ignore
+                    return
+                chunk = bytes(row['chunk'])  # type: ignore
+                yield chunk
+                offset += len(chunk)
+
+
 class AuditLog:
     """Model for audit logs."""
     
     @staticmethod
-    def create(action_type, user_torn_id, war_session_id=None, old_value=None, new_value=None, details=None):
-        """Create a new audit log entry."""
-        encrypted_old = encryption_service.encrypt(str(old_value)) if old_value else None
-        encrypted_new = encryption_service.encrypt(str(new_value)) if new_value else None
-        encrypted_details = encryption_service.encrypt(str(details)) if details else None
+    def create(action_type, user_torn_id, war_session_id=None, old_value=None, new_value=None, details=None, durable=False):
+        """
+        Record an audit log entry.
+        
+        Entries are buffered and written in batches by a background flusher.
+        Pass durable=True (or set AUDIT_LOG_BUFFERED=false) to insert before
+        returning.
+        
+        Returns:
+            dict: log_id and timestamp for synchronous writes, None when buffered
+        """
+        entry = {
+            'action_type': action_type,
+            'user_torn_id': user_torn_id,
+            'war_session_id': war_session_id,
+            'old_value': old_value,
+            'new_value': new_value,
+            'details': details,
+            'timestamp': datetime.now(timezone.utc)
+        }
+        
+        if durable or not config.AUDIT_LOG_BUFFERED:
+            return AuditLog.create_many([entry])[0]
         
+        audit_log_writer.put(entry)
+        return None
+    
+    @staticmethod
+    def create_many(entries):
+        """Encrypt and insert a batch of audit log entries in one statement."""
         retention_date = date.today() + timedelta(days=config.AUDIT_LOG_RETENTION_DAYS)
+        rows = [
+            (
+                e['action_type'],
+                e['user_torn_id'],
+                e.get('war_session_id'),
+                encryption_service.encrypt(str(e['old_value'])) if e.get('old_value') else None,
+                encryption_service.encrypt(str(e['new_value'])) if e.get('new_value') else None,
+                encryption_service.encrypt(str(e['details'])) if e.get('details') else None,
+                e['timestamp'],
+                retention_date
+            )
+            for e in entries
+        ]
         
         with db.get_cursor() as cursor:
-            cursor.execute("""
+            return execute_values(cursor, """
                 INSERT INTO audit_logs 
                 (action_type, user_torn_id, war_session_id, encrypted_old_value, 
-                 encrypted_new_value, encrypted_details, retention_date)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                 encrypted_new_value, encrypted_details, timestamp, retention_date)
+                VALUES %s
                 RETURNING log_id, timestamp
-            """, (action_type, user_torn_id, war_session_id, encrypted_old, encrypted_new, 
-                  encrypted_details, retention_date))
-            return cursor.fetchone()
+            """, rows, page_size=len(rows), fetch=True)
+    
+    @staticmethod
+    def flush():
+        """Write any buffered entries now. Returns the number written."""
+        return audit_log_writer.flush()
     
     @staticmethod
     def get_by_session(war_session_id, limit=100):
@@ -502,47 +1494,453 @@ class AuditLog:
             return cursor.fetchall()
     
     @staticmethod
-    def archive_old_logs():
-        """Archive logs past retention date."""
+    def search(start_date=None, end_date=None, action_type=None, limit=100, user_torn_id=None, war_session_id=None):
+        """
+        Query live (not yet archived) logs, newest first.
+        
+        Each filter is served by one of the (column, timestamp DESC) indexes
+        from migration 010.
+        """
+        where, params = _audit_log_filters(start_date, end_date, action_type, user_torn_id, war_session_id)
+        query = "SELECT * FROM audit_logs" + where + " ORDER BY timestamp DESC LIMIT %s"
+        params.append(limit)
+        
+        with db.get_cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+    
+    @staticmethod
+    def ensure_partitions():
+        """
+        Create monthly audit_logs partitions covering the retention window plus a margin.
+        
+        Past months that still have rows in audit_logs_default get a
+        partition too (create_audit_log_partition moves those rows into it),
+        so partition archival reaches them.
+        """
+        months_ahead = config.AUDIT_LOG_RETENTION_DAYS // 28 + config.AUDIT_PARTITION_MONTHS_AHEAD
+        
         with db.get_cursor() as cursor:
-            # Move to archive
             cursor.execute("""
-                INSERT INTO audit_logs_archived 
-                SELECT * FROM audit_logs 
-                WHERE retention_date < CURRENT_DATE
+                SELECT COUNT(*) FILTER (WHERE created) AS created
+                FROM (
+                    SELECT create_audit_log_partition(month_start) AS created
+                    FROM (
+                        SELECT DISTINCT date_trunc('month', retention_date)::date AS month_start
+                        FROM audit_logs_default
+                        WHERE retention_date < date_trunc('month', CURRENT_DATE)
+                        UNION
+                        SELECT (date_trunc('month', CURRENT_DATE) + make_interval(months => n))::date
+                        FROM generate_series(0, %s) AS n
+                    ) months
+                    ORDER BY month_start
+                ) partitions
+            """, (months_ahead,))
+            return cursor.fetchone()['created']  # type: ignore
+    
+    @staticmethod
+    def archive_old_logs(mode=None, batch_size=None, sleep_seconds=None, max_batches=None):
+        """
+        Archive logs past retention date.
+        
+        'partition' mode (default) moves each month whose retention dates
+        have all passed as a whole partition, so logs stay in audit_logs until
+        the end of their retention month. 'batched' mode moves individual
+        expired rows in chunks via archive_in_batches.
+        
+        Returns:
+            int: Number of entries archived
+        """
+        mode = mode or config.ARCHIVE_MODE
+        if mode == 'batched':
+            return AuditLog.archive_in_batches(batch_size, sleep_seconds, max_batches)
+        if mode != 'partition':
+            raise ValueError(f"Unknown archival mode: {mode}")
+        
+        AuditLog.ensure_partitions()
+        
+        with db.get_cursor() as cursor:
+            cursor.execute("""
+                SELECT c.relname
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = 'audit_logs'::regclass
+                  AND c.relname ~ '^audit_logs_y[0-9]{4}m[0-9]{2}$'
+                ORDER BY c.relname
             """)
+            partitions = [row['relname'] for row in cursor.fetchall()]  # type: ignore
+        
+        archived_count = 0
+        for partition in partitions:
+            month_start = datetime.strptime(partition[len('audit_logs_'):], 'y%Ym%m').date()
+            month_end = (month_start + timedelta(days=32)).replace(day=1)
+            if month_end > date.today():
+                break
+            archived_count += AuditLog._archive_partition(partition, month_start, month_end)
+        
+        return archived_count
+    
+    @staticmethod
+    def archive_in_batches(batch_size=None, sleep_seconds=None, max_batches=None):
+        """
+        Move expired rows to the archive in small committed chunks.
+        
+        Works with both the partitioned and the original unpartitioned
+        tables, and archives rows on their exact retention date. Each chunk
+        locks up to batch_size expired rows with SKIP LOCKED and deletes them
+        into the archive in one statement and one transaction, so a crash
+        loses no finished chunk and concurrent runners take disjoint rows.
+        A row that is already in the archive aborts its chunk rather than
+        being deleted without a copy.
+        
+        Args:
+            batch_size: Rows per chunk (default ARCHIVE_BATCH_SIZE)
+            sleep_seconds: Pause between chunks (default ARCHIVE_BATCH_SLEEP_SECONDS)
+            max_batches: Stop after this many chunks (default: until done)
             
-            archived_count = cursor.rowcount
+        Returns:
+            int: Number of entries archived
+        """
+        batch_size = batch_size or config.ARCHIVE_BATCH_SIZE
+        sleep_seconds = config.ARCHIVE_BATCH_SLEEP_SECONDS if sleep_seconds is None else sleep_seconds
+        
+        with db.get_cursor() as cursor:
+            cursor.execute("SELECT relkind FROM pg_class WHERE oid = 'audit_logs_archived'::regclass")
+            archive_partitioned = cursor.fetchone()['relkind'] == 'p'  # type: ignore
             
-            # Delete from main table
+            # A partitioned archive needs a partition for every month being moved
+            months = []
+            if archive_partitioned:
+                cursor.execute("""
+                    SELECT DISTINCT date_trunc('month', retention_date)::date AS month_start
+                    FROM audit_logs
+                    WHERE retention_date < CURRENT_DATE
+                """)
+                months = [row['month_start'] for row in cursor.fetchall()]  # type: ignore
+            for month_start in months:
+                cursor.execute(sql.SQL("""
+                    CREATE TABLE IF NOT EXISTS {} PARTITION OF audit_logs_archived
+                    FOR VALUES FROM (%s) TO (%s)
+                """).format(sql.Identifier('audit_logs_archived_' + month_start.strftime('y%Ym%m'))),
+                    (month_start, (month_start + timedelta(days=32)).replace(day=1)))
+        
+        archived_count = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            with db.get_cursor() as cursor:
+                cursor.execute("""
+                    WITH expired AS (
+                        SELECT log_id, retention_date
+                        FROM audit_logs
+                        WHERE retention_date < CURRENT_DATE
+                        ORDER BY retention_date, log_id
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    ), moved AS (
+                        DELETE FROM audit_logs a
+                        USING expired e
+                        WHERE a.log_id = e.log_id AND a.retention_date = e.retention_date
+                        RETURNING a.log_id, a.action_type, a.encrypted_old_value, a.encrypted_new_value,
+                                  a.encrypted_details, a.user_torn_id, a.war_session_id, a.timestamp,
+                                  a.retention_date
+                    )
+                    INSERT INTO audit_logs_archived
+                    (log_id, action_type, encrypted_old_value, encrypted_new_value, encrypted_details,
+                     user_torn_id, war_session_id, timestamp, retention_date)
+                    SELECT * FROM moved
+                """, (batch_size,))
+                moved = cursor.rowcount
+            
+            if moved <= 0:
+                break
+            
+            batches += 1
+            archived_count += moved
+            print(f"[AUDIT_LOG] ✓ Archival batch {batches}: {moved} entries ({archived_count} total)")
+            
+            if moved < batch_size:
+                break
+            if sleep_seconds:
+                time.sleep(sleep_seconds)
+        
+        return archived_count
+    
+    @staticmethod
+    def _archive_partition(partition, month_start, month_end):
+        """Move one expired audit_logs partition under audit_logs_archived."""
+        archive_partition = 'audit_logs_archived_' + partition[len('audit_logs_'):]
+        table = sql.Identifier(partition)
+        
+        with db.get_cursor() as cursor:
+            # Another runner may have moved this partition already
+            cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (partition,))
             cursor.execute("""
-                DELETE FROM audit_logs 
-                WHERE retention_date < CURRENT_DATE
+                SELECT 1 FROM pg_inherits
+                WHERE inhrelid = to_regclass(%s) AND inhparent = 'audit_logs'::regclass
+            """, (partition,))
+            if not cursor.fetchone():
+                return 0
+            
+            cursor.execute(sql.SQL("SELECT COUNT(*) AS count FROM {}").format(table))
+            count = cursor.fetchone()['count']  # type: ignore
+            
+            cursor.execute(sql.SQL("ALTER TABLE audit_logs DETACH PARTITION {}").format(table))
+            
+            cursor.execute("SELECT to_regclass(%s) AS existing", (archive_partition,))
+            if cursor.fetchone()['existing']:  # type: ignore
+                # Month was partly archived row by row before partitioning
+                cursor.execute(sql.SQL("""
+                    INSERT INTO audit_logs_archived
+                    (log_id, action_type, encrypted_old_value, encrypted_new_value, encrypted_details,
+                     user_torn_id, war_session_id, timestamp, retention_date)
+                    SELECT log_id, action_type, encrypted_old_value, encrypted_new_value, encrypted_details,
+                           user_torn_id, war_session_id, timestamp, retention_date
+                    FROM {}
+                """).format(table))
+                cursor.execute(sql.SQL("DROP TABLE {}").format(table))
+            else:
+                cursor.execute("""
+                    SELECT conname FROM pg_constraint
+                    WHERE conrelid = %s::regclass AND contype = 'f'
+                """, (partition,))
+                for row in cursor.fetchall():
+                    cursor.execute(sql.SQL("ALTER TABLE {} DROP CONSTRAINT {}").format(
+                        table, sql.Identifier(row['conname'])))  # type: ignore
+                cursor.execute(sql.SQL("""
+                    ALTER TABLE {} ADD COLUMN archived_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+                """).format(table))
+                cursor.execute(sql.SQL("ALTER TABLE {} RENAME TO {}").format(table, sql.Identifier(archive_partition)))
+                cursor.execute(sql.SQL("""
+                    ALTER TABLE audit_logs_archived ATTACH PARTITION {} FOR VALUES FROM (%s) TO (%s)
+                """).format(sql.Identifier(archive_partition)), (month_start, month_end))
+        
+        print(f"[AUDIT_LOG] ✓ Archived partition {partition} ({count} entries)")
+        return count
+    
+    @staticmethod
+    def get_archived(start_date=None, end_date=None, action_type=None, limit=100, user_torn_id=None, war_session_id=None):
+        """
+        Query archived logs, newest first.
+        
+        Rows still in audit_logs_archived and rows moved to cold-storage
+        segments are merged transparently. Segments outside the requested
+        range or without the action type are skipped using their index, and
+        segments older than the oldest row already collected are not read.
+        """
+        where, params = _audit_log_filters(start_date, end_date, action_type, user_torn_id, war_session_id)
+        query = "SELECT * FROM audit_logs_archived" + where + " ORDER BY timestamp DESC LIMIT %s"
+        params.append(limit)
+        
+        with db.get_cursor() as cursor:
+            cursor.execute(query, params)
+            results = cursor.fetchall()
+        
+        segments = AuditLogSegment.find(start_date, end_date, action_type)
+        if not segments:
+            return results
+        
+        results = list(results)
+        for segment in segments:
+            if len(results) >= limit and segment['max_timestamp'] < results[-1]['timestamp']:  # type: ignore
+                break
+            results.extend(_segment_rows(segment, start_date, end_date, action_type, user_torn_id, war_session_id))
+            results = heapq.nlargest(limit, results, key=lambda row: row['timestamp'])
+        
+        return results
+    
+    @staticmethod
+    def iter_archived(start_date=None, end_date=None, action_type=None, batch_size=1000, user_torn_id=None, war_session_id=None):
+        """
+        Stream archived logs with decrypted values, one batch at a time.
+        
+        Cold-storage segments come first (they hold the oldest months),
+        followed by rows still in audit_logs_archived.
+        
+        Yields:
+            list: Up to batch_size log dicts, oldest first
+        """
+        where, params = _audit_log_filters(start_date, end_date, action_type, user_torn_id, war_session_id)
+        query = """
+            SELECT log_id, timestamp, action_type, user_torn_id, war_session_id,
+                   encrypted_old_value, encrypted_new_value, encrypted_details,
+                   retention_date, archived_at
+            FROM audit_logs_archived
+        """ + where + " ORDER BY timestamp, log_id"
+        
+        def decrypt_rows(rows):
+            for row in rows:
+                for field in ('old_value', 'new_value', 'details'):
+                    encrypted = row.pop(f'encrypted_{field}')
+                    row[field] = encryption_service.decrypt(encrypted) if encrypted else None
+            return rows
+        
+        for segment in reversed(AuditLogSegment.find(start_date, end_date, action_type)):
+            batch = []
+            for row in _segment_rows(segment, start_date, end_date, action_type, user_torn_id, war_session_id):
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    yield decrypt_rows(batch)
+                    batch = []
+            if batch:
+                yield decrypt_rows(batch)
+        
+        for rows in db.iter_batches(query, params, batch_size):
+            yield decrypt_rows(rows)
+    
+    @staticmethod
+    def tier_archived_logs(months=None):
+        """
+        Move archived months older than COLD_STORAGE_AFTER_MONTHS to segments.
+        
+        Each audit_logs_archived partition is streamed into a compressed,
+        append-only JSONL segment (encrypted values stay encrypted). The
+        segment is stored in audit_log_segments (COLD_STORAGE_BACKEND=database)
+        or written to COLD_STORAGE_DIR (=directory, which must be durable and
+        shared by every instance). It is indexed and the partition dropped in
+        one transaction, so a crash leaves at worst an unindexed file that is
+        never read. Nothing is tiered while no backend is configured.
+        
+        Returns:
+            int: Number of entries moved to cold storage
+            
+        Raises:
+            ValueError: If the backend is unknown or 'directory' has no COLD_STORAGE_DIR
+        """
+        backend = config.COLD_STORAGE_BACKEND
+        if not backend:
+            print("[AUDIT_LOG] ⚠ COLD_STORAGE_BACKEND is not set, archived logs stay in Postgres")
+            return 0
+        if backend not in ('database', 'directory'):
+            raise ValueError(f"Unknown cold storage backend: {backend}")
+        if backend == 'directory' and not config.COLD_STORAGE_DIR:
+            raise ValueError("COLD_STORAGE_DIR must be set to a durable, shared directory")
+        
+        in_database = backend == 'database'
+        # Database segments are only staged on local disk while being written
+        directory = tempfile.mkdtemp(prefix='cold_storage_') if in_database else config.COLD_STORAGE_DIR
+        try:
+            return AuditLog._tier_partitions(months, directory, in_database)
+        finally:
+            if in_database:
+                shutil.rmtree(directory, ignore_errors=True)
+    
+    @staticmethod
+    def _tier_partitions(months, directory, in_database):
+        """Move each archived partition older than the cutoff to a segment."""
+        months = config.COLD_STORAGE_AFTER_MONTHS if months is None else months
+        this_month = date.today().replace(day=1)
+        cutoff_year, cutoff_month = divmod(this_month.year * 12 + this_month.month - 1 - months, 12)
+        cutoff = date(cutoff_year, cutoff_month + 1, 1)
+        
+        with db.get_cursor() as cursor:
+            cursor.execute("""
+                SELECT c.relname
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = 'audit_logs_archived'::regclass
+                  AND c.relname ~ '^audit_logs_archived_y[0-9]{4}m[0-9]{2}$'
+                ORDER BY c.relname
             """)
+            partitions = [row['relname'] for row in cursor.fetchall()]  # type: ignore
+        
+        tiered_count = 0
+        for partition in partitions:
+            month_start = datetime.strptime(partition[len('audit_logs_archived_'):], 'y%Ym%m').date()
+            if month_start >= cutoff:
+                break
+            
+            table = sql.Identifier(partition)
+            segment = write_segment(
+                directory,
+                partition,
+                db.iter_batches(sql.SQL("SELECT * FROM {} ORDER BY timestamp, log_id").format(table)),
+                config.COLD_STORAGE_COMPRESSION
+            )
+            
+            data = None
+            if segment and in_database:
+                with open(segment['path'], 'rb') as handle:
+                    data = handle.read()
+                os.remove(segment['path'])
+                segment['path'] = os.path.basename(segment['path'])
+            
+            with db.get_cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (partition,))
+                cursor.execute("""
+                    SELECT 1 FROM pg_inherits
+                    WHERE inhrelid = to_regclass(%s) AND inhparent = 'audit_logs_archived'::regclass
+                """, (partition,))
+                if not cursor.fetchone():
+                    # Another runner tiered this month first
+                    if segment and not in_database:
+                        os.remove(segment['path'])
+                    continue
+                
+                if segment:
+                    cursor.execute("""
+                        INSERT INTO audit_log_segments
+                        (path, source_partition, row_count, size_bytes, min_timestamp, max_timestamp, action_types, data)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                    """, (segment['path'], partition, segment['row_count'], segment['size_bytes'],
+                          segment['min_timestamp'], segment['max_timestamp'], segment['action_types'],
+                          psycopg2.Binary(data) if data is not None else None))
+                
+                cursor.execute(sql.SQL("ALTER TABLE audit_logs_archived DETACH PARTITION {}").format(table))
+                cursor.execute(sql.SQL("DROP TABLE {}").format(table))
             
-            return archived_count
+            count = segment['row_count'] if segment else 0
+            tiered_count += count
+            print(f"[AUDIT_LOG] ✓ Moved {partition} to cold storage ({count} entries)")
+        
+        return tiered_count
+
+
+class AuditLogSegment:
+    """Model for the cold-storage segment index."""
     
     @staticmethod
-    def get_archived(start_date=None, end_date=None, action_type=None, limit=100):
-        """Query archived logs."""
-        query = "SELECT * FROM audit_logs_archived WHERE 1=1"
+    def find(start_date=None, end_date=None, action_type=None):
+        """Get segments that may hold matching rows, newest first (without their data)."""
+        query = """
+            SELECT segment_id, path, source_partition, row_count, size_bytes, min_timestamp,
+                   max_timestamp, action_types, data IS NOT NULL AS stored_in_database
+            FROM audit_log_segments WHERE 1=1
+        """
         params = []
         
         if start_date:
-            query += " AND timestamp >= %s"
+            query += " AND max_timestamp >= %s"
             params.append(start_date)
         
         if end_date:
-            query += " AND timestamp <= %s"
+            query += " AND min_timestamp <= %s"
             params.append(end_date)
         
         if action_type:
-            query += " AND action_type = %s"
+            query += " AND %s = ANY(action_types)"
             params.append(action_type)
         
-        query += " ORDER BY timestamp DESC LIMIT %s"
-        params.append(limit)
+        query += " ORDER BY max_timestamp DESC"
         
         with db.get_cursor() as cursor:
             cursor.execute(query, params)
             return cursor.fetchall()
+    
+    @staticmethod
+    def get_data(segment_id):
+        """Get the contents of a segment stored in the database, or None."""
+        with db.get_cursor() as cursor:
+            cursor.execute("""
+                SELECT data FROM audit_log_segments WHERE segment_id = %s
+            """, (segment_id,))
+            result = cursor.fetchone()
+            return bytes(result['data']) if result and result['data'] is not None else None  # type: ignore
+
+
+audit_log_writer = BatchWriter(
+    AuditLog.create_many,
+    'AUDIT',
+    flush_size=config.AUDIT_FLUSH_SIZE,
+    flush_interval=config.AUDIT_FLUSH_INTERVAL_SECONDS,
+    max_pending=config.AUDIT_BUFFER_MAX
+)
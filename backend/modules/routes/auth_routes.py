@@ -1,13 +1,17 @@
 """Authentication routes."""
 from flask import Blueprint, request, jsonify, make_response
-from modules.services.auth import auth_service, token_required
+from modules.services.auth import auth_service, token_required, generate_temporary_password
+from modules.models.models import AdminUser, AuditLog
 from datetime import datetime, timedelta
 from config.settings import config
+from utils.pagination import page_args, fields_arg, paginate
+from utils.rate_limit import limiter
 from typing import Dict, Any, cast
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 
 @auth_bp.route('/login', methods=['POST'])
+@limiter.limit(config.LOGIN_RATE_LIMIT)
 def login():
     """Login with Torn username, password, and API key."""
     try:
@@ -121,7 +125,7 @@ def logout():
 
         if token:
             payload, _ = auth_service.verify_token(token)
-            if payload and payload.get('torn_id'):
+            if payload and payload.get('type') == 'access' and payload.get('torn_id'):
                 auth_service.logout(payload.get('torn_id'))
         
         # Create response
@@ -153,12 +157,20 @@ def verify():
 @auth_bp.route('/users', methods=['GET'])
 @token_required
 def list_users():
-    """List all admin users (requires authentication)."""
+    """List admin users (requires authentication; supports fields=, limit= and cursor=)."""
     try:
-        from models.models import AdminUser
-        users = AdminUser.get_all()
+        allowed = list(AdminUser.FIELDS)
+        try:
+            fields = fields_arg(allowed)
+            limit, after = page_args(AdminUser.ORDER_TYPES)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        users = AdminUser.get_all(fields, after, limit)
+        users, next_cursor = paginate(users, limit, AdminUser.ORDER, fields, allowed)
         return jsonify({
-            'users': users
+            'users': users,
+            'next_cursor': next_cursor
         }), 200
     except Exception as e:
         print(f"[ERROR] Failed to list users: {str(e)}")
@@ -169,8 +181,6 @@ def list_users():
 def create_user():
     """Create a new admin user with temporary password."""
     try:
-        from models.models import AdminUser
-        from services.auth import generate_temporary_password
         from werkzeug.security import generate_password_hash
         
         data = request.get_json()
@@ -206,11 +216,11 @@ def create_user():
         )
         
         # Log the creation
-        from models.models import AuditLog
         AuditLog.create(
             action_type='USER_CREATED',
             user_torn_id=request.current_user['torn_id'],  # type: ignore
-            details=f"Created user {username} (torn_id: {torn_id})"
+            details=f"Created user {username} (torn_id: {torn_id})",
+            durable=True
         )
         
         return jsonify({
@@ -231,7 +241,6 @@ def create_user():
 def change_password():
     """Change password for current user."""
     try:
-        from models.models import AdminUser
         from werkzeug.security import generate_password_hash, check_password_hash
         
         data = request.get_json()
@@ -269,11 +278,11 @@ def change_password():
         result = AdminUser.update_password(user.get('username'), new_password_hash, mark_changed=True)  # type: ignore
         
         # Log the password change
-        from models.models import AuditLog
         AuditLog.create(
             action_type='PASSWORD_CHANGED',
             user_torn_id=torn_id,
-            details=f"User {user.get('username')} changed password"  # type: ignore
+            details=f"User {user.get('username')} changed password",  # type: ignore
+            durable=True
         )
         
         return jsonify({
@@ -1,21 +1,40 @@
 """Export and archive routes."""
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify, send_file, make_response, Response, stream_with_context
 from modules.services.auth import token_required
 from modules.services.pdf_report import pdf_report_service
-from modules.models.models import AuditLog
+from modules.services.export_jobs import export_job_service
+from modules.services.data_export import data_export_service, DATASETS, FORMATS
+from modules.models.models import AuditLog, WarSession
+from utils.zip_stream import stream_zip
+from utils.rate_limit import limiter
+from config.settings import config
+from datetime import datetime, date
+from uuid import UUID
+import re
 
 export_bp = Blueprint('export', __name__, url_prefix='/export')
 
+# PDF renders and render jobs share one budget
+pdf_rate_limit = limiter.shared_limit(config.EXPORT_PDF_RATE_LIMIT, scope='export-pdf')
+
 @export_bp.route('/<session_id>/pdf', methods=['GET'])
+@pdf_rate_limit
 @token_required
 def export_pdf(session_id):
-    """Export war session as PDF."""
+    """Export war session as PDF (supports ETag / If-None-Match)."""
     try:
         # Get user name for footer
         user_name = request.args.get('user_name', 'Administrator')
         
-        # Generate PDF
-        pdf_buffer = pdf_report_service.generate_war_report(session_id, user_name)
+        # Generate PDF (or reuse the cached render for unchanged data)
+        report_key, pdf_buffer = pdf_report_service.get_war_report(session_id, user_name, request.if_none_match)
+        
+        # Client already has this exact report
+        if pdf_buffer is None:
+            response = make_response('', 304)
+            response.set_etag(report_key)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
         
         # Log export
         torn_id = request.current_user['torn_id']  # type: ignore
@@ -26,12 +45,17 @@ def export_pdf(session_id):
             details=f"Exported PDF war report"
         )
         
-        return send_file(
+        # Streamed in blocks, large renders straight from their spool file
+        response = send_file(
             pdf_buffer,
             mimetype='application/pdf',
             as_attachment=True,
-            download_name=f'war_report_{session_id}.pdf'
+            download_name=f'war_report_{session_id}.pdf',
+            etag=report_key,
+            conditional=False
         )
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
         
     except ValueError as e:
         return jsonify({'error': str(e)}), 404
@@ -39,6 +63,245 @@ def export_pdf(session_id):
         return jsonify({'error': str(e)}), 500
 
 
+@export_bp.route('/<session_id>/pdf/jobs', methods=['POST'])
+@pdf_rate_limit
+@token_required
+def queue_pdf_export(session_id):
+    """Queue a PDF export to be rendered in the background."""
+    try:
+        data = request.get_json(silent=True) or {}
+        user_name = data.get('user_name') or request.args.get('user_name', 'Administrator')
+        torn_id = request.current_user['torn_id']  # type: ignore
+        
+        job = export_job_service.queue_pdf_report(session_id, torn_id, user_name)
+        
+        return jsonify(job), 202
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@export_bp.route('/jobs/<job_id>', methods=['GET'])
+@token_required
+def get_export_job(job_id):
+    """Get the status of an export job."""
+    try:
+        job = export_job_service.get_job(job_id)
+        
+        if not job:
+            return jsonify({'error': 'Export job not found'}), 404
+        
+        return jsonify(job), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@export_bp.route('/jobs/<job_id>/file', methods=['GET'])
+@token_required
+def download_export_job(job_id):
+    """Download the file produced by a finished export job."""
+    try:
+        job = export_job_service.get_job(job_id)
+        
+        if not job:
+            return jsonify({'error': 'Export job not found'}), 404
+        
+        if job['status'] != 'completed':
+            return jsonify({'error': f"Export job is {job['status']}", 'job': job}), 409
+        
+        if job['report_key'] in request.if_none_match:
+            response = make_response('', 304)
+            response.set_etag(job['report_key'])
+            return response
+        
+        if not job['file_available']:
+            return jsonify({'error': 'Export file has expired. Please queue a new export'}), 410
+        
+        # Log export
+        torn_id = request.current_user['torn_id']  # type: ignore
+        AuditLog.create(
+            action_type='PDF_EXPORTED',
+            user_torn_id=torn_id,
+            war_session_id=job['war_session_id'],
+            details=f"Downloaded PDF war report from export job {job_id}"
+        )
+        
+        # Streamed from the job row, so any instance can serve it
+        response = Response(
+            stream_with_context(export_job_service.iter_output(job_id)),
+            mimetype='application/pdf',
+            headers={
+                'Content-Disposition': f"attachment; filename=war_report_{job['war_session_id']}.pdf",
+                'Content-Length': str(job['size_bytes'])
+            }
+        )
+        response.set_etag(job['report_key'])
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@export_bp.route('/bulk', methods=['POST'])
+@limiter.limit(config.EXPORT_BULK_RATE_LIMIT)
+@pdf_rate_limit
+@token_required
+def export_bulk():
+    """Export PDF reports for several war sessions as one streamed ZIP."""
+    try:
+        data = request.get_json(silent=True) or {}
+        session_ids = data.get('session_ids')
+        start_date = data.get('start_date')
+        end_date = data.get('end_date')
+        user_name = data.get('user_name', 'Administrator')
+        
+        if not session_ids and not start_date and not end_date:
+            return jsonify({'error': 'session_ids or a start_date/end_date range is required'}), 400
+        
+        if session_ids is not None and not isinstance(session_ids, list):
+            return jsonify({'error': 'session_ids must be a list'}), 400
+        
+        try:
+            start_date = date.fromisoformat(start_date) if start_date else None
+            end_date = date.fromisoformat(end_date) if end_date else None
+        except (TypeError, ValueError):
+            return jsonify({'error': 'start_date and end_date must be YYYY-MM-DD dates'}), 400
+        
+        faction_id = request.current_user['faction_id']  # type: ignore
+        sessions = WarSession.get_for_export(faction_id, session_ids, start_date, end_date,
+                                             limit=config.BULK_EXPORT_MAX_SESSIONS + 1)
+        
+        if not sessions:
+            return jsonify({'error': 'No war sessions matched'}), 404
+        
+        if len(sessions) > config.BULK_EXPORT_MAX_SESSIONS:
+            return jsonify({'error': f'At most {config.BULK_EXPORT_MAX_SESSIONS} wars can be exported at once'}), 400
+        
+        names = {str(s['session_id']): s['war_name'] for s in sessions}  # type: ignore
+        
+        # Log export
+        torn_id = request.current_user['torn_id']  # type: ignore
+        AuditLog.create(
+            action_type='BULK_PDF_EXPORTED',
+            user_torn_id=torn_id,
+            details=f"Exported {len(names)} PDF war reports as ZIP"
+        )
+        
+        def entries():
+            errors = []
+            for session_id, pdf_bytes, error in export_job_service.render_pdf_reports(list(names), user_name):
+                if error:
+                    errors.append(f"{session_id} ({names[session_id]}): {error}")
+                    continue
+                safe_name = re.sub(r'[^A-Za-z0-9._-]+', '_', names[session_id]).strip('_') or 'war'
+                yield f"war_report_{safe_name}_{session_id[:8]}.pdf", pdf_bytes
+            if errors:
+                yield 'errors.txt', '\n'.join(errors).encode()
+        
+        filename = f"war_reports_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.zip"
+        return Response(
+            stream_with_context(stream_zip(entries())),
+            mimetype='application/zip',
+            headers={'Content-Disposition': f'attachment; filename={filename}'}
+        )
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@export_bp.route('/data/<dataset>', methods=['GET'])
+@token_required
+def export_data(dataset):
+    """
+    Stream payouts, members or archived audit logs as CSV, NDJSON or Parquet.
+    
+    Query params: format (csv/ndjson/parquet), session_id, start_date,
+    end_date, plus action_type and user_torn_id (audit_logs only).
+    """
+    try:
+        fmt = request.args.get('format', 'csv').lower()
+        session_id = request.args.get('session_id')
+        start_date = request.args.get('start_date')
+        end_date = request.args.get('end_date')
+        action_type = request.args.get('action_type')
+        user_torn_id = request.args.get('user_torn_id', type=int)
+        
+        if dataset not in DATASETS:
+            return jsonify({'error': f"Unknown dataset. Choose one of: {', '.join(DATASETS)}"}), 404
+        
+        if fmt not in FORMATS:
+            return jsonify({'error': f"Unknown format. Choose one of: {', '.join(FORMATS)}"}), 400
+        
+        if fmt == 'parquet' and not data_export_service.parquet_available():
+            return jsonify({'error': 'Parquet export requires pyarrow to be installed on the server'}), 501
+        
+        # The rows are only read once the response has started, so bad filters
+        # must be rejected here rather than truncating the download
+        try:
+            session_id = str(UUID(session_id)) if session_id else None
+        except ValueError:
+            return jsonify({'error': 'session_id must be a UUID'}), 400
+        
+        try:
+            start_date = date.fromisoformat(start_date) if start_date else None
+            end_date = date.fromisoformat(end_date) if end_date else None
+        except ValueError:
+            return jsonify({'error': 'start_date and end_date must be YYYY-MM-DD dates'}), 400
+        
+        # Archived logs can still name deleted wars; the audit row below may
+        # only reference a war that exists
+        session_exists = session_id is None or WarSession.get_version(session_id) is not None
+        if not session_exists and dataset != 'audit_logs':
+            return jsonify({'error': 'War session not found'}), 404
+        
+        faction_id = request.current_user['faction_id']  # type: ignore
+        batches = data_export_service.iter_batches(dataset, faction_id, session_id, start_date, end_date,
+                                                   action_type, user_torn_id)
+        
+        # Log export
+        torn_id = request.current_user['torn_id']  # type: ignore
+        AuditLog.create(
+            action_type='DATA_EXPORTED',
+            user_torn_id=torn_id,
+            war_session_id=session_id if session_exists else None,
+            details=f"Exported {dataset} as {fmt}" + (f" for war {session_id}" if session_id else "")
+        )
+        
+        mimetype, extension = FORMATS[fmt]
+        filename = f"{dataset}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{extension}"
+        return Response(
+            stream_with_context(data_export_service.stream(dataset, fmt, batches)),
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename={filename}'}
+        )
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+audit_bp = Blueprint('audit', __name__, url_prefix='/audit')
+
+@audit_bp.route('/', methods=['GET'])
+@token_required
+def get_audit_logs():
+    """Query live (not yet archived) audit logs."""
+    try:
+        # Get query parameters
+        start_date = request.args.get('start_date')
+        end_date = request.args.get('end_date')
+        action_type = request.args.get('action_type')
+        war_session_id = request.args.get('war_session_id')
+        user_torn_id = request.args.get('user_torn_id', type=int)
+        limit = int(request.args.get('limit', 100))
+        
+        logs = AuditLog.search(start_date, end_date, action_type, limit, user_torn_id, war_session_id)
+        
+        return jsonify({'logs': logs, 'count': len(logs)}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 archive_bp = Blueprint('archive', __name__, url_prefix='/archive')
 
 @archive_bp.route('/', methods=['GET'])
@@ -50,10 +313,12 @@ def get_archived_logs():
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
         action_type = request.args.get('action_type')
+        war_session_id = request.args.get('war_session_id')
+        user_torn_id = request.args.get('user_torn_id', type=int)
         limit = int(request.args.get('limit', 100))
         
         # Query archived logs
-        logs = AuditLog.get_archived(start_date, end_date, action_type, limit)
+        logs = AuditLog.get_archived(start_date, end_date, action_type, limit, user_torn_id, war_session_id)
         
         return jsonify({'logs': logs, 'count': len(logs)}), 200
         
@@ -63,17 +328,41 @@ def get_archived_logs():
 @archive_bp.route('/run-archival', methods=['POST'])
 @token_required
 def run_archival():
-    """Manually run the archival process (admin only)."""
+    """
+    Manually run the archival process (admin only).
+    
+    Optional JSON body: mode ('partition' or 'batched'), plus batch_size,
+    sleep_seconds and max_batches for batched mode. A batched run stopped by
+    max_batches can simply be repeated to continue.
+    """
     try:
+        data = request.get_json(silent=True) or {}
+        mode = data.get('mode')
+        
+        if mode not in (None, 'partition', 'batched'):
+            return jsonify({'error': "mode must be 'partition' or 'batched'"}), 400
+        
+        try:
+            batch_size = int(data['batch_size']) if data.get('batch_size') is not None else None
+            sleep_seconds = float(data['sleep_seconds']) if data.get('sleep_seconds') is not None else None
+            max_batches = int(data['max_batches']) if data.get('max_batches') is not None else None
+        except (TypeError, ValueError):
+            return jsonify({'error': 'batch_size, sleep_seconds and max_batches must be numbers'}), 400
+        
+        if (batch_size is not None and batch_size <= 0) or (max_batches is not None and max_batches <= 0) \
+                or (sleep_seconds is not None and sleep_seconds < 0):
+            return jsonify({'error': 'batch_size and max_batches must be positive and sleep_seconds non-negative'}), 400
+        
         # This would typically be run via a cron job
-        count = AuditLog.archive_old_logs()
+        count = AuditLog.archive_old_logs(mode, batch_size, sleep_seconds, max_batches)
         
         # Log the archival
         torn_id = request.current_user['torn_id']  # type: ignore
         AuditLog.create(
             action_type='LOGS_ARCHIVED',
             user_torn_id=torn_id,
-            details=f"Archived {count} audit log entries"
+            details=f"Archived {count} audit log entries",
+            durable=True
         )
         
         return jsonify({
@@ -2,11 +2,19 @@
 from flask import Blueprint, request, jsonify
 from modules.services.auth import token_required
 from modules.services.war_session import war_session_service
-from modules.models.models import Member, FactionConfig, AuditLog
+from modules.models.models import Member, FactionConfig, AuditLog, WarSession
+from utils.rate_limit import limiter
+from utils.http_cache import not_modified, with_etag
+from utils.pagination import page_args, fields_arg, paginate
+from config.settings import config
 
 member_bp = Blueprint('members', __name__, url_prefix='/members')
 
+# Upper bound on bonus changes applied in one batch request
+MAX_BONUS_BATCH = 500
+
 @member_bp.route('/refresh', methods=['POST'])
+@limiter.limit(config.MEMBERS_REFRESH_RATE_LIMIT)
 @token_required
 def refresh_members():
     """Refresh members from Torn API."""
@@ -48,9 +56,6 @@ def add_bonus(member_id):
         if bonus_amount < 0:
             return jsonify({'error': 'Bonus amount must be positive'}), 400
         
-        # Get old value for audit
-        old_member = Member.get_by_session(None)  # We'll need to adjust this
-        
         result = Member.update_bonus(member_id, bonus_amount, bonus_reason)
         
         if not result:
@@ -71,6 +76,62 @@ def add_bonus(member_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@member_bp.route('/bonuses', methods=['POST'])
+@token_required
+def set_bonuses():
+    """Add, update or clear bonuses for several members at once (all or nothing)."""
+    try:
+        data = request.get_json()
+        
+        if not data or not isinstance(data.get('bonuses'), list) or not data['bonuses']:
+            return jsonify({'error': 'bonuses must be a non-empty list'}), 400
+        
+        if len(data['bonuses']) > MAX_BONUS_BATCH:
+            return jsonify({'error': f'At most {MAX_BONUS_BATCH} bonuses can be set per request'}), 400
+        
+        changes = []
+        seen = set()
+        for entry in data['bonuses']:
+            if not isinstance(entry, dict) or 'member_id' not in entry or 'bonus_amount' not in entry:
+                return jsonify({'error': 'Each bonus needs member_id and bonus_amount'}), 400
+            try:
+                member_id = int(entry['member_id'])
+                bonus_amount = float(entry['bonus_amount'])
+            except (TypeError, ValueError):
+                return jsonify({'error': 'member_id and bonus_amount must be numbers'}), 400
+            if bonus_amount < 0:
+                return jsonify({'error': 'Bonus amount must be positive'}), 400
+            if member_id in seen:
+                return jsonify({'error': f'Member {member_id} appears more than once'}), 400
+            seen.add(member_id)
+            changes.append((member_id, bonus_amount, entry.get('bonus_reason', '')))
+        
+        try:
+            results = Member.update_bonuses(changes)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 404
+        
+        # One audit entry for the whole batch
+        session_ids = {str(r['war_session_id']) for r in results}
+        reasons = {member_id: reason for member_id, _, reason in changes}
+        torn_id = request.current_user['torn_id']  # type: ignore
+        AuditLog.create(
+            action_type='BONUSES_UPDATED',
+            user_torn_id=torn_id,
+            war_session_id=session_ids.pop() if len(session_ids) == 1 else None,
+            old_value='; '.join(f"{r['member_id']}: ${r['old_bonus']:,.2f}" for r in results),
+            new_value='; '.join(f"{r['member_id']}: ${r['new_bonus']:,.2f}: {reasons[r['member_id']]}" for r in results),
+            details=f"Updated bonuses for {len(results)} members"
+        )
+        
+        return jsonify({
+            'message': 'Bonuses updated successfully',
+            'member_ids': [r['member_id'] for r in results]
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @member_bp.route('/<int:member_id>/bonus', methods=['PUT'])
 @token_required
 def update_bonus(member_id):
@@ -103,11 +164,25 @@ def delete_bonus(member_id):
 @member_bp.route('/session/<session_id>', methods=['GET'])
 @token_required
 def get_session_members(session_id):
-    """Get all members for a war session."""
+    """Get the members of a war session (supports fields=, limit=, cursor= and ETag / If-None-Match)."""
     try:
-        members = Member.get_by_session(session_id)
-        
-        return jsonify({'members': members}), 200
+        allowed = list(Member.FIELDS)
+        try:
+            fields = fields_arg(allowed)
+            limit, after = page_args(Member.ORDER_TYPES)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        version = WarSession.get_version(session_id)
+        etag = f"members-{session_id}-{version}" if version is not None else None
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        
+        members = Member.get_page(session_id, fields, after, limit)
+        members, next_cursor = paginate(members, limit, Member.ORDER, fields, allowed)
+        
+        return with_etag(jsonify({'members': members, 'next_cursor': next_cursor}), etag), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1,7 +1,9 @@
 """Other payments routes."""
 from flask import Blueprint, request, jsonify
 from modules.services.auth import token_required
-from modules.models.models import OtherPayment, AuditLog
+from modules.models.models import OtherPayment, AuditLog, WarSession
+from utils.http_cache import not_modified, with_etag
+from utils.pagination import page_args, fields_arg, paginate
 from typing import Dict, Any, cast
 
 payment_bp = Blueprint('payments', __name__, url_prefix='/payments')
@@ -49,9 +51,23 @@ def create_payment(session_id):
 @payment_bp.route('/<session_id>', methods=['GET'])
 @token_required
 def get_payments(session_id):
-    """Get all other payments for a war session."""
+    """Get the other payments of a war session (supports fields=, limit=, cursor= and ETag / If-None-Match)."""
     try:
-        payments = OtherPayment.get_by_session(session_id)
+        allowed = list(OtherPayment.FIELDS)
+        try:
+            fields = fields_arg(allowed)
+            limit, after = page_args(OtherPayment.ORDER_TYPES)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        version = WarSession.get_version(session_id)
+        etag = f"payments-{session_id}-{version}" if version is not None else None
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        
+        payments = OtherPayment.get_page(session_id, fields, after, limit)
+        payments, next_cursor = paginate(payments, limit, OtherPayment.ORDER, fields, allowed)
         
         # Convert amounts to float for proper JSON serialization
         for payment in payments:
@@ -61,7 +77,7 @@ def get_payments(session_id):
                 except (ValueError, TypeError):
                     payment['amount'] = 0.0
         
-        return jsonify({'payments': payments}), 200
+        return with_etag(jsonify({'payments': payments, 'next_cursor': next_cursor}), etag), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1,9 +1,14 @@
 """War session routes."""
-from flask import Blueprint, request, jsonify
-from modules.services.auth import token_required
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from modules.services.auth import auth_service, token_required
 from modules.services.war_session import war_session_service
-from modules.services.calculator import calculator_service
+from modules.services.calculator import calculator_service, MAX_SCENARIOS
+from modules.services.war_events import stream_events
 from modules.models.models import WarSession, Member, OtherPayment, MemberPayout, AuditLog
+from utils.rate_limit import limiter
+from utils.http_cache import not_modified, with_etag
+from utils.pagination import page_args, fields_arg, paginate
+from config.settings import config
 
 war_bp = Blueprint('war', __name__, url_prefix='/war')
 
@@ -29,14 +34,104 @@ def create_war_session():
 @war_bp.route('/<session_id>', methods=['GET'])
 @token_required
 def get_war_details(session_id):
-    """Get detailed information for a specific war session."""
+    """Get detailed information for a specific war session (supports ETag / If-None-Match)."""
     try:
+        version = WarSession.get_version(session_id)
+        
+        if version is None:
+            return jsonify({'error': 'War session not found'}), 404
+        
+        etag = f"war-{session_id}-{version}"
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        
         result = war_session_service.get_war_details(session_id)
         
         if not result:
             return jsonify({'error': 'War session not found'}), 404
         
-        return jsonify(result), 200
+        return with_etag(jsonify(result), etag), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@war_bp.route('/<session_id>/workspace', methods=['GET'])
+@token_required
+def get_war_workspace(session_id):
+    """Get war details, members, other payments, saved payouts and summary in one response (supports ETag / If-None-Match)."""
+    try:
+        version = WarSession.get_version(session_id)
+        
+        if version is None:
+            return jsonify({'error': 'War session not found'}), 404
+        
+        cached = not_modified(f"workspace-{session_id}-{version}")
+        if cached:
+            return cached
+        
+        result = war_session_service.get_workspace(session_id)
+        
+        if not result:
+            return jsonify({'error': 'War session not found'}), 404
+        
+        # Tag with the version the snapshot was actually read at
+        return with_etag(jsonify(result), f"workspace-{session_id}-{result['version']}"), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@war_bp.route('/<session_id>/events/token', methods=['POST'])
+@token_required
+def war_events_token(session_id):
+    """Issue a short-lived token for opening the session's event stream."""
+    try:
+        if not config.SSE_ENABLED:
+            return jsonify({'error': 'Live updates are not available on this deployment'}), 404
+        
+        if WarSession.get_version(session_id) is None:
+            return jsonify({'error': 'War session not found'}), 404
+        
+        token = auth_service.generate_stream_token(
+            request.current_user['torn_id'],  # type: ignore
+            request.current_user['faction_id'],  # type: ignore
+            session_id
+        )
+        return jsonify({'token': token, 'expires_in': config.SSE_TOKEN_SECONDS}), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@war_bp.route('/<session_id>/events', methods=['GET'])
+def war_events(session_id):
+    """
+    Stream live member, bonus, payment and total changes as Server-Sent Events.
+    
+    Authenticated by a token from POST /war/<session_id>/events/token in the
+    token query parameter. Needs a long-running server: the per-worker LISTEN
+    thread and streams of up to SSE_MAX_STREAM_SECONDS do not survive on
+    serverless functions.
+    """
+    try:
+        if not config.SSE_ENABLED:
+            return jsonify({'error': 'Live updates are not available on this deployment'}), 404
+        
+        payload, error = auth_service.verify_stream_token(request.args.get('token'), session_id)
+        if error:
+            return jsonify({'error': error}), 401
+        
+        # Logouts and inactivity end the stream at the next reconnect
+        if not auth_service.check_session_activity(payload['torn_id']):  # type: ignore
+            return jsonify({'error': 'Session expired due to inactivity'}), 401
+        
+        if WarSession.get_version(session_id) is None:
+            return jsonify({'error': 'War session not found'}), 404
+        
+        response = Response(stream_with_context(stream_events(session_id)), mimetype='text/event-stream')
+        response.headers['Cache-Control'] = 'no-cache'
+        # Stop reverse proxies from buffering the stream
+        response.headers['X-Accel-Buffering'] = 'no'
+        return response
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -72,6 +167,7 @@ def complete_session(session_id):
         return jsonify({'error': str(e)}), 500
 
 @war_bp.route('/<session_id>/calculate', methods=['POST'])
+@limiter.limit(config.WAR_CALCULATE_RATE_LIMIT)
 @token_required
 def calculate_payouts(session_id):
     """Calculate payouts for a war session."""
@@ -108,6 +204,48 @@ def calculate_payouts(session_id):
         traceback.print_exc()
         return jsonify({'error': str(e)}), 500
 
+@war_bp.route('/<session_id>/scenarios', methods=['POST'])
+@token_required
+def evaluate_scenarios(session_id):
+    """Evaluate what-if payouts for many prices/earnings without saving anything."""
+    try:
+        war_session = WarSession.get_by_id(session_id)
+        
+        if not war_session:
+            return jsonify({'error': 'War session not found'}), 404
+        
+        data = request.get_json(silent=True) or {}
+        
+        # Each field accepts a single value or a list; default to the saved session values
+        prices = data.get('price_per_hit', war_session['price_per_hit'])  # type: ignore
+        earnings = data.get('total_earnings', war_session['total_earnings'])  # type: ignore
+        if not isinstance(prices, list):
+            prices = [prices]
+        if not isinstance(earnings, list):
+            earnings = [earnings]
+        
+        try:
+            prices = [float(p) for p in prices]
+            earnings = [float(e) for e in earnings]
+        except (TypeError, ValueError):
+            return jsonify({'error': 'price_per_hit and total_earnings must be numbers'}), 400
+        
+        if not prices or not earnings:
+            return jsonify({'error': 'price_per_hit and total_earnings cannot be empty'}), 400
+        
+        if any(p < 0 for p in prices) or any(e < 0 for e in earnings):
+            return jsonify({'error': 'Values must be positive'}), 400
+        
+        if len(prices) * len(earnings) > MAX_SCENARIOS:
+            return jsonify({'error': f'At most {MAX_SCENARIOS} scenarios can be evaluated per request'}), 400
+        
+        result = calculator_service.evaluate_scenarios(session_id, prices, earnings)
+        
+        return jsonify(result), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @war_bp.route('/<session_id>/payouts', methods=['GET'])
 @token_required
 def get_payouts(session_id):
@@ -145,11 +283,19 @@ def get_member_payouts(session_id):
 @war_bp.route('/history', methods=['GET'])
 @token_required
 def get_history():
-    """Get all completed war sessions."""
+    """Get completed war sessions (supports fields=, limit= and cursor=)."""
     try:
-        sessions = war_session_service.get_completed_sessions()
+        allowed = list(WarSession.HISTORY_FIELDS)
+        try:
+            fields = fields_arg(allowed)
+            limit, after = page_args(WarSession.HISTORY_ORDER_TYPES)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        return jsonify({'sessions': sessions}), 200
+        sessions = war_session_service.get_completed_sessions(fields, after, limit)
+        sessions, next_cursor = paginate(sessions, limit, ('completed_timestamp', 'session_id'), fields, allowed)
+        
+        return jsonify({'sessions': sessions, 'next_cursor': next_cursor}), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -157,20 +303,29 @@ def get_history():
 @war_bp.route('/list', methods=['GET'])
 @token_required
 def list_wars():
-    """Get all active war sessions for the faction (excludes completed)."""
+    """Get the faction's active war sessions (supports fields=, limit=, cursor= and ETag / If-None-Match)."""
     try:
         faction_id = request.current_user['faction_id']  # type: ignore
-        all_sessions = war_session_service.get_faction_wars(faction_id)
         
-        # Filter to only active wars (exclude completed)
-        active_sessions = [s for s in all_sessions if s.get('status') == 'active']
+        allowed = list(WarSession.LIST_FIELDS)
+        try:
+            fields = fields_arg(allowed)
+            limit, after = page_args(WarSession.LIST_ORDER_TYPES)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Always revalidated: the ETag changes with any write to the faction's wars
+        # (clients only send it back for the same URL, so it need not vary by page)
+        etag = f"wars-{faction_id}-{WarSession.get_faction_version(faction_id)}"
+        cached = not_modified(etag)
+        if cached:
+            return cached
+        
+        # Only active wars (completed ones are listed by /war/history)
+        wars = war_session_service.get_faction_wars(faction_id, 'active', fields, after, limit)
+        wars, next_cursor = paginate(wars, limit, ('created_timestamp', 'session_id'), fields, allowed)
         
-        response = jsonify({'wars': active_sessions})
-        # Disable caching for this endpoint
-        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-        response.headers['Pragma'] = 'no-cache'
-        response.headers['Expires'] = '0'
-        return response, 200
+        return with_etag(jsonify({'wars': wars, 'next_cursor': next_cursor}), etag), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1,19 +1,78 @@
 """Authentication service with JWT tokens."""
-import jwt
-from datetime import datetime, timedelta
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from functools import wraps
+from threading import Lock
 from flask import request, jsonify, Request
 from config.settings import config
 from modules.services.torn_api import torn_api_service
 from modules.models.models import FactionConfig, AuditLog, AdminUser
+from modules.services.session_store import session_store
 from werkzeug.security import generate_password_hash, check_password_hash
 from typing import Any
 
 # Extend Flask Request to include current_user attribute
 setattr(Request, 'current_user', None)
 
-# In-memory session tracking for activity
-active_sessions = {}
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU cache of verified access tokens.
+    
+    Keys are SHA-256 digests of the token, values the decoded payload. An
+    entry is only served until the token's own exp, so a cached token never
+    outlives its signature check.
+    """
+    
+    def __init__(self, max_size):
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = Lock()
+    
+    def get(self, token):
+        """Get the cached payload for a token, or None."""
+        if self._max_size <= 0:
+            return None
+        
+        key = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            payload, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return payload
+    
+    def put(self, token, payload):
+        """Cache a verified payload until its exp."""
+        if self._max_size <= 0 or 'exp' not in payload:
+            return
+        
+        key = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            self._entries[key] = (payload, float(payload['exp']))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+verified_tokens = VerifiedTokenCache(config.TOKEN_CACHE_SIZE)
+
+# Runs the Torn API key validation while login checks the password
+login_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='login-validate')
+
+# Torn API keys are 16 alphanumeric characters
+TORN_API_KEY_PATTERN = re.compile(r'[A-Za-z0-9]{16}')
 
 class AuthService:
     """Service for authentication and authorization."""
@@ -31,9 +90,23 @@ class AuthService:
         Returns:
             dict: Authentication result with tokens and user info
         """
-        # Validate API key and get user info
-        user_data = torn_api_service.validate_api_key(torn_api_key)
+        # Malformed keys are rejected before any Torn call or hash work
+        if not isinstance(torn_api_key, str) or not TORN_API_KEY_PATTERN.fullmatch(torn_api_key):
+            return None, "Invalid API key or unable to fetch user data"
+        
+        # Validate the API key with Torn while an existing user's password is
+        # checked; both can take a noticeable fraction of a second. A new
+        # user's password is only hashed once the key has validated.
+        validation = login_executor.submit(torn_api_service.validate_api_key, torn_api_key)
+        
+        existing_admin = AdminUser.get_by_username(username)
+        if existing_admin:
+            password_valid = check_password_hash(existing_admin['password_hash'], password)
+        
+        user_data = validation.result()
         
+        # Errors are reported in the same order as before, so the password
+        # result is only revealed for a valid key and matching username
         if not user_data:
             return None, "Invalid API key or unable to fetch user data"
         
@@ -56,19 +129,17 @@ class AuthService:
         }
 
         # Create or verify admin user
-        existing_admin = AdminUser.get_by_username(username)
         password_needs_change = False
         
         if existing_admin:
-            if not check_password_hash(existing_admin['password_hash'], password):
+            if not password_valid:
                 return None, "Invalid username or password"
             password_needs_change = not existing_admin.get('password_changed', True)
         else:
-            password_hash = generate_password_hash(password)
             AdminUser.create(
                 torn_id=torn_id,
                 username=username,
-                password_hash=password_hash,
+                password_hash=generate_password_hash(password),
                 faction_id=faction_info['faction_id'],
                 email=None,  # type: ignore
                 password_changed=True  # Initial login doesn't require change
@@ -84,12 +155,8 @@ class AuthService:
         access_token = AuthService.generate_access_token(torn_id, faction_info['faction_id'])
         refresh_token = AuthService.generate_refresh_token(torn_id, faction_info['faction_id'])
         
-        # Initialize session tracking (cache API key for session only)
-        active_sessions[torn_id] = {
-            'last_activity': datetime.utcnow(),
-            'faction_id': faction_info['faction_id'],
-            'api_key': torn_api_key
-        }
+        # Initialize session tracking (API key kept encrypted for the session only)
+        session_store.create(torn_id, faction_info['faction_id'], torn_api_key)
         
         # Log authentication
         AuditLog.create(
@@ -114,6 +181,8 @@ class AuthService:
     @staticmethod
     def generate_access_token(torn_id, faction_id):
         """Generate JWT access token."""
+        import jwt
+        
         if not config.JWT_SECRET:
             raise ValueError("JWT_SECRET not configured")
         
@@ -130,6 +199,8 @@ class AuthService:
     @staticmethod
     def generate_refresh_token(torn_id, faction_id):
         """Generate JWT refresh token."""
+        import jwt
+        
         if not config.JWT_SECRET:
             raise ValueError("JWT_SECRET not configured")
         
@@ -143,9 +214,56 @@ class AuthService:
         
         return jwt.encode(payload, config.JWT_SECRET, algorithm='HS256')
     
+    @staticmethod
+    def generate_stream_token(torn_id, faction_id, war_session_id):
+        """
+        Generate a short-lived JWT for one war session's event stream.
+        
+        EventSource cannot send an Authorization header, and the access_token
+        cookie is not sent when the frontend is served from another site, so
+        the stream is opened with this token in its query string instead.
+        """
+        import jwt
+        
+        if not config.JWT_SECRET:
+            raise ValueError("JWT_SECRET not configured")
+        
+        payload = {
+            'torn_id': torn_id,
+            'faction_id': faction_id,
+            'war_session_id': str(war_session_id),
+            'type': 'stream',
+            'exp': datetime.utcnow() + timedelta(seconds=config.SSE_TOKEN_SECONDS),
+            'iat': datetime.utcnow()
+        }
+        
+        return jwt.encode(payload, config.JWT_SECRET, algorithm='HS256')
+    
+    @staticmethod
+    def verify_stream_token(token, war_session_id):
+        """
+        Verify a stream token for a war session's event stream.
+        
+        Returns:
+            tuple: (payload, error)
+        """
+        if not token:
+            return None, "Stream token is missing"
+        
+        payload, error = AuthService.verify_token(token)
+        if error:
+            return None, error
+        
+        if not payload or payload.get('type') != 'stream' or payload.get('war_session_id') != str(war_session_id):
+            return None, "Invalid token"
+        
+        return payload, None
+    
     @staticmethod
     def verify_token(token):
         """Verify and decode JWT token."""
+        import jwt
+        
         try:
             if not config.JWT_SECRET:
                 return None, "JWT_SECRET not configured"
@@ -160,30 +278,34 @@ class AuthService:
     @staticmethod
     def check_session_activity(torn_id):
         """Check if user session is still active based on inactivity timeout."""
-        if torn_id not in active_sessions:
+        session = session_store.get(torn_id)
+        if not session:
             return False
         
-        session = active_sessions[torn_id]
-        last_activity = session['last_activity']
         timeout = timedelta(minutes=config.SESSION_TIMEOUT_MINUTES)
         
-        if datetime.utcnow() - last_activity > timeout:
-            # Session expired due to inactivity
-            del active_sessions[torn_id]
-            return False
+        if datetime.now(timezone.utc) - session['last_activity'] > timeout:
+            # Another worker may have seen more recent activity
+            session = session_store.get(torn_id, refresh=True)
+            if not session:
+                return False
+            now = datetime.now(timezone.utc)
+            if now - session['last_activity'] > timeout:
+                # Session expired due to inactivity, unless another instance
+                # recorded activity since the re-read
+                return not session_store.expire(torn_id, now - timeout)
         
         return True
     
     @staticmethod
     def update_activity(torn_id):
         """Update last activity timestamp for user."""
-        if torn_id in active_sessions:
-            active_sessions[torn_id]['last_activity'] = datetime.utcnow()
+        session_store.touch(torn_id)
 
     @staticmethod
     def get_session_api_key(torn_id):
-        """Get cached Torn API key for current session (not stored in DB)."""
-        session = active_sessions.get(torn_id)
+        """Get the Torn API key cached for the current session."""
+        session = session_store.get(torn_id)
         if not session:
             return None
         return session.get('api_key')
@@ -191,8 +313,7 @@ class AuthService:
     @staticmethod
     def logout(torn_id):
         """Logout user and clear session."""
-        if torn_id in active_sessions:
-            del active_sessions[torn_id]
+        session_store.delete(torn_id)
         
         AuditLog.create(
             action_type='USER_LOGOUT',
@@ -218,8 +339,7 @@ class AuthService:
         new_access_token = AuthService.generate_access_token(torn_id, faction_id)
         
         # Update session activity
-        if torn_id in active_sessions:
-            active_sessions[torn_id]['last_activity'] = datetime.utcnow()
+        session_store.touch(torn_id)
         
         return new_access_token, None
 
@@ -245,14 +365,24 @@ def token_required(f):
         if not token:
             return jsonify({'error': 'Authentication token is missing'}), 401
         
-        # Verify token
-        payload, error = AuthService.verify_token(token)
-        
-        if error:
-            return jsonify({'error': error}), 401
+        # Verify token (repeat requests reuse the verified payload)
+        payload = verified_tokens.get(token)
+        if payload is None:
+            payload, error = AuthService.verify_token(token)
+            
+            if error:
+                return jsonify({'error': error}), 401
+            
+            if not payload:
+                return jsonify({'error': 'Invalid token'}), 401
+            
+            if payload.get('type') == 'access':
+                verified_tokens.put(token, payload)
         
-        if not payload:
-            return jsonify({'error': 'Invalid token'}), 401
+        # Refresh tokens and stream tokens (which travel in URLs and end up in
+        # access logs) must never work as bearer tokens
+        if payload.get('type') != 'access':
+            return jsonify({'error': 'Invalid token type'}), 401
         
         # Check session activity
         torn_id = payload.get('torn_id')
@@ -1,8 +1,15 @@
 """Calculator service for war payouts.""" 
 from modules.models.models import Member, OtherPayment, WarSession, MemberPayout, AuditLog
+from utils.encryption import encryption_service
 from decimal import Decimal, ROUND_HALF_UP
+from itertools import product
+import hashlib
+import json
 from typing import Dict, List, Any
 
+# Upper bound on price x earnings combinations evaluated in one scenario request
+MAX_SCENARIOS = 10000
+
 class CalculatorService:
     """Service for calculating war payouts."""
     
@@ -19,12 +26,16 @@ class CalculatorService:
         Returns:
             dict: Complete payout breakdown
         """
+        war_session = WarSession.get_by_id(war_session_id)
+        
         # Get all members
         members = Member.get_by_session(war_session_id)
         
         # Get all other payments
         other_payments = OtherPayment.get_by_session(war_session_id)
         
+        fingerprint = CalculatorService.payout_fingerprint(members, other_payments, total_earnings, price_per_hit)
+        
         # Calculate member payouts
         member_payouts: List[Dict[str, Any]] = []
         total_member_payout = Decimal('0')
@@ -78,39 +89,51 @@ class CalculatorService:
         total_earnings_decimal = Decimal(str(total_earnings))
         remaining_balance = total_earnings_decimal - total_paid
         
-        # Update war session with calculations
-        WarSession.update_calculations(
-            session_id=war_session_id,
-            total_earnings=float(total_earnings_decimal),
-            price_per_hit=float(Decimal(str(price_per_hit))),
-            total_paid=float(total_paid.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)),
-            remaining_balance=float(remaining_balance.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
-        )
-        
-        # Delete existing payouts and save new ones (using batch insert for speed)
-        try:
-            MemberPayout.delete_by_session(war_session_id)
-            # Prepare batch data
-            batch_data = [{
-                'war_session_id': war_session_id,
-                'member_id': mp['member_id'],
-                'torn_id': mp['torn_id'],
-                'name': mp['name'],
-                'hit_count': mp['hit_count'],
-                'base_payout': mp['base_payout'],
-                'bonus_amount': mp['bonus_amount'],
-                'total_payout': mp['total_payout'],
-                'bonus_reason': mp.get('bonus_reason'),
-                'member_status': mp.get('member_status', 'active')
-            } for mp in member_payouts]
+        # Inputs unchanged since the last saved calculation - the stored snapshot
+        # already holds exactly these payouts, so skip the rewrite
+        if war_session and war_session.get('payout_fingerprint') == fingerprint:
+            print(f"[CALCULATOR] ✓ Inputs unchanged for war {war_session_id}, reusing saved payouts")
+            # Members were re-synced with identical values since the snapshot was taken
+            if war_session.get('payouts_stale'):
+                WarSession.mark_payouts_fresh(war_session_id)
+        else:
+            saved_fingerprint = None
+            
+            # Delete existing payouts and save new ones (using batch insert for speed)
+            try:
+                MemberPayout.delete_by_session(war_session_id)
+                # Prepare batch data
+                batch_data = [{
+                    'war_session_id': war_session_id,
+                    'member_id': mp['member_id'],
+                    'torn_id': mp['torn_id'],
+                    'name': mp['name'],
+                    'hit_count': mp['hit_count'],
+                    'base_payout': mp['base_payout'],
+                    'bonus_amount': mp['bonus_amount'],
+                    'total_payout': mp['total_payout'],
+                    'bonus_reason': mp.get('bonus_reason'),
+                    'member_status': mp.get('member_status', 'active')
+                } for mp in member_payouts]
+                
+                MemberPayout.batch_create(batch_data)
+                saved_fingerprint = fingerprint
+                print(f"[CALCULATOR] ✓ Saved {len(member_payouts)} member payouts to database (batch)")
+            except Exception as e:
+                print(f"[CALCULATOR] ⚠ Could not save member payouts to database: {e}")
+                import traceback
+                traceback.print_exc()
+                # Continue anyway - calculations are still valid, just not persisted
             
-            MemberPayout.batch_create(batch_data)
-            print(f"[CALCULATOR] ✓ Saved {len(member_payouts)} member payouts to database (batch)")
-        except Exception as e:
-            print(f"[CALCULATOR] ⚠ Could not save member payouts to database: {e}")
-            import traceback
-            traceback.print_exc()
-            # Continue anyway - calculations are still valid, just not persisted
+            # Update war session with calculations (fingerprint only once payouts are saved)
+            WarSession.update_calculations(
+                session_id=war_session_id,
+                total_earnings=float(total_earnings_decimal),
+                price_per_hit=float(Decimal(str(price_per_hit))),
+                total_paid=float(total_paid.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)),
+                remaining_balance=float(remaining_balance.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)),
+                payout_fingerprint=saved_fingerprint
+            )
         
         return {
             'war_session_id': str(war_session_id),
@@ -124,6 +147,188 @@ class CalculatorService:
             'remaining_balance': float(remaining_balance.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
         }
     
+    @staticmethod
+    def get_saved_payouts(war_session, payouts=None, other_payments=None):
+        """
+        Build the calculate_payouts breakdown from the persisted snapshot.
+        
+        Reads member_payouts and the stored session totals; nothing is written
+        and member hit counts are not decrypted.
+        
+        Args:
+            war_session: War session row (WarSession.get_by_id)
+            payouts: Already loaded member_payouts rows (read if None)
+            other_payments: Already loaded, decrypted other payments (read if None)
+            
+        Returns:
+            dict: Payout breakdown in the same shape as calculate_payouts, or None
+                  if the session has no usable snapshot
+        """
+        if war_session.get('payouts_stale') or not war_session.get('encrypted_total_paid'):
+            return None
+        
+        war_session_id = war_session['session_id']
+        if payouts is None:
+            payouts = MemberPayout.get_by_session(war_session_id)
+        if other_payments is None:
+            other_payments = OtherPayment.get_by_session(war_session_id)
+        
+        member_payouts: List[Dict[str, Any]] = []
+        total_member_payout = Decimal('0')
+        for payout in payouts:
+            total_member_payout += Decimal(str(payout['total_payout']))
+            member_payouts.append({
+                'member_id': payout['member_id'],
+                'torn_id': payout['torn_id'],
+                'name': payout['name'],
+                'hit_count': int(payout['hit_count']),
+                'base_payout': float(payout['base_payout']),
+                'bonus_amount': float(payout['bonus_amount']),
+                'bonus_reason': payout.get('bonus_reason') or '',
+                'total_payout': float(payout['total_payout']),
+                'member_status': payout.get('member_status', 'active')
+            })
+        
+        total_other_payments = Decimal('0')
+        other_payment_list: List[Dict[str, Any]] = []
+        for payment in other_payments:
+            try:
+                amount = Decimal(str(payment['amount']))
+            except:
+                amount = Decimal('0')
+            total_other_payments += amount
+            other_payment_list.append({
+                'payment_id': payment['payment_id'],
+                'amount': float(amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)),
+                'description': payment['description']
+            })
+        
+        total_paid = Decimal(encryption_service.decrypt(war_session['encrypted_total_paid']))
+        remaining_balance = Decimal(encryption_service.decrypt(war_session['encrypted_remaining_balance']))
+        
+        return {
+            'war_session_id': str(war_session_id),
+            'total_earnings': float(Decimal(str(war_session['total_earnings'])).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)),
+            'price_per_hit': float(Decimal(str(war_session['price_per_hit'])).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)),
+            'member_payouts': member_payouts,
+            'total_member_payout': float(total_member_payout.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)),
+            'other_payments': other_payment_list,
+            'total_other_payments': float(total_other_payments.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)),
+            'total_paid': float(total_paid.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)),
+            'remaining_balance': float(remaining_balance.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
+        }
+    
+    @staticmethod
+    def payout_fingerprint(members, other_payments, total_earnings, price_per_hit):
+        """
+        Hash every input that affects calculate_payouts.
+        
+        Args:
+            members: Decrypted members (Member.get_by_session)
+            other_payments: Decrypted other payments (OtherPayment.get_by_session)
+            total_earnings: Total money earned from war
+            price_per_hit: Price per hit
+            
+        Returns:
+            str: SHA-256 hex digest
+        """
+        # Canonical form so 1000, 1000.0 and '1000.00' hash the same
+        def money(value):
+            try:
+                return str(Decimal(str(value or 0)).normalize())
+            except:
+                return '0'
+        
+        payload = {
+            'total_earnings': money(total_earnings),
+            'price_per_hit': money(price_per_hit),
+            'members': sorted([
+                [m['member_id'], m['torn_id'], m['name'], int(m.get('hit_count', 0) or 0),
+                 money(m.get('bonus_amount')), m.get('bonus_reason') or '', m.get('member_status', 'active')]
+                for m in members
+            ]),
+            'other_payments': sorted([
+                [p['payment_id'], money(p.get('amount')), p.get('description') or '']
+                for p in other_payments
+            ])
+        }
+        encoded = json.dumps(payload, separators=(',', ':'), default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()
+    
+    @staticmethod
+    def evaluate_scenarios(war_session_id, prices, earnings):
+        """
+        Evaluate payout totals for a grid of prices and earnings without writing anything.
+        
+        Total paid is linear in price_per_hit (price * total hits + bonuses + other
+        payments), so members and payments are decrypted and aggregated once and every
+        scenario is then answered from those three sums.
+        
+        Args:
+            war_session_id: War session UUID
+            prices: List of price_per_hit values
+            earnings: List of total_earnings values
+            
+        Returns:
+            dict: Aggregates, one entry per (earnings, price) pair and the
+                  break-even price for each earnings value
+        """
+        members = Member.get_by_session(war_session_id)
+        other_payments = OtherPayment.get_by_session(war_session_id)
+        
+        total_hits = 0
+        total_bonus = Decimal('0')
+        for member in members:
+            total_hits += int(member.get('hit_count', 0) or 0)
+            if member.get('bonus_amount'):
+                try:
+                    total_bonus += Decimal(str(member['bonus_amount']))
+                except:
+                    pass
+        
+        total_other_payments = Decimal('0')
+        for payment in other_payments:
+            try:
+                total_other_payments += Decimal(str(payment['amount']))
+            except:
+                pass
+        
+        fixed_costs = total_bonus + total_other_payments
+        hits_decimal = Decimal(total_hits)
+        cents = Decimal('0.01')
+        
+        scenarios: List[Dict[str, Any]] = []
+        for earning, price in product(earnings, prices):
+            earning_decimal = Decimal(str(earning))
+            total_paid = Decimal(str(price)) * hits_decimal + fixed_costs
+            scenarios.append({
+                'total_earnings': float(earning_decimal.quantize(cents, rounding=ROUND_HALF_UP)),
+                'price_per_hit': float(Decimal(str(price)).quantize(cents, rounding=ROUND_HALF_UP)),
+                'total_paid': float(total_paid.quantize(cents, rounding=ROUND_HALF_UP)),
+                'remaining_balance': float((earning_decimal - total_paid).quantize(cents, rounding=ROUND_HALF_UP))
+            })
+        
+        # Solve earnings - (price * hits + fixed_costs) = 0 for price
+        break_even: List[Dict[str, Any]] = []
+        for earning in earnings:
+            earning_decimal = Decimal(str(earning))
+            price = None
+            if total_hits > 0:
+                price = float(((earning_decimal - fixed_costs) / hits_decimal).quantize(cents, rounding=ROUND_HALF_UP))
+            break_even.append({
+                'total_earnings': float(earning_decimal.quantize(cents, rounding=ROUND_HALF_UP)),
+                'price_per_hit': price
+            })
+        
+        return {
+            'war_session_id': str(war_session_id),
+            'total_hits': total_hits,
+            'total_bonus': float(total_bonus.quantize(cents, rounding=ROUND_HALF_UP)),
+            'total_other_payments': float(total_other_payments.quantize(cents, rounding=ROUND_HALF_UP)),
+            'scenarios': scenarios,
+            'break_even': break_even
+        }
+    
     @staticmethod
     def get_payout_summary(war_session_id):
         """Get payout summary for a war session."""
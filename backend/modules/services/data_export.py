@@ -0,0 +1,210 @@
+"""Streamed machine-readable exports (CSV, NDJSON, Parquet)."""
+import csv
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from io import StringIO
+from uuid import UUID
+from config.settings import config
+from modules.models.models import Member, MemberPayout, AuditLog
+from utils.zip_stream import ChunkBuffer
+
+# Column order and Parquet type for each dataset
+DATASETS = {
+    'payouts': [
+        ('war_session_id', 'string'),
+        ('war_name', 'string'),
+        ('member_id', 'int64'),
+        ('torn_id', 'int64'),
+        ('name', 'string'),
+        ('hit_count', 'int64'),
+        ('base_payout', 'float64'),
+        ('bonus_amount', 'float64'),
+        ('total_payout', 'float64'),
+        ('bonus_reason', 'string'),
+        ('member_status', 'string')
+    ],
+    'members': [
+        ('war_session_id', 'string'),
+        ('war_name', 'string'),
+        ('member_id', 'int64'),
+        ('torn_id', 'int64'),
+        ('name', 'string'),
+        ('hit_count', 'int64'),
+        ('score', 'float64'),
+        ('bonus_amount', 'float64'),
+        ('bonus_reason', 'string'),
+        ('member_status', 'string'),
+        ('updated_at', 'timestamp')
+    ],
+    'audit_logs': [
+        ('log_id', 'int64'),
+        ('timestamp', 'timestamp'),
+        ('action_type', 'string'),
+        ('user_torn_id', 'int64'),
+        ('war_session_id', 'string'),
+        ('old_value', 'string'),
+        ('new_value', 'string'),
+        ('details', 'string'),
+        ('retention_date', 'date'),
+        ('archived_at', 'timestamp')
+    ]
+}
+
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet')
+}
+
+
+def _text_value(value):
+    """Convert a database value for CSV/JSON output."""
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _json_default(value):
+    """JSON encoder fallback for Decimal values."""
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class DataExportService:
+    """Service for streaming table exports batch by batch."""
+
+    @staticmethod
+    def iter_batches(dataset, faction_id, war_session_id=None, start_date=None, end_date=None, action_type=None,
+                     user_torn_id=None):
+        """
+        Get the batch generator for a dataset.
+
+        Args:
+            dataset: 'payouts', 'members' or 'audit_logs'
+            faction_id: Faction whose wars are exported (payouts/members)
+            war_session_id: Optional single war session
+            start_date: Optional lower bound (war creation / log timestamp)
+            end_date: Optional upper bound
+            action_type: Optional audit action filter (audit_logs)
+            user_torn_id: Optional acting user filter (audit_logs)
+
+        Returns:
+            generator: Lists of row dicts
+        """
+        batch_size = config.DATA_EXPORT_BATCH_SIZE
+
+        if dataset == 'payouts':
+            return MemberPayout.iter_for_export(faction_id, war_session_id, start_date, end_date, batch_size)
+        if dataset == 'members':
+            return Member.iter_for_export(faction_id, war_session_id, start_date, end_date, batch_size)
+        if dataset == 'audit_logs':
+            return AuditLog.iter_archived(start_date, end_date, action_type, batch_size, user_torn_id, war_session_id)
+        raise ValueError(f"Unknown dataset: {dataset}")
+
+    @staticmethod
+    def stream(dataset, fmt, batches):
+        """
+        Encode batches in the requested format.
+
+        Args:
+            dataset: Dataset name (selects the columns)
+            fmt: 'csv', 'ndjson' or 'parquet'
+            batches: Iterable of row dict lists
+
+        Returns:
+            generator: Encoded byte chunks, roughly one per batch
+        """
+        columns = DATASETS[dataset]
+
+        if fmt == 'csv':
+            return DataExportService._stream_csv(columns, batches)
+        if fmt == 'ndjson':
+            return DataExportService._stream_ndjson(columns, batches)
+        if fmt == 'parquet':
+            return DataExportService._stream_parquet(columns, batches)
+        raise ValueError(f"Unknown format: {fmt}")
+
+    @staticmethod
+    def parquet_available():
+        """Check whether the optional pyarrow dependency is installed."""
+        try:
+            import pyarrow  # noqa: F401
+            return True
+        except ImportError:
+            return False
+
+    @staticmethod
+    def _stream_csv(columns, batches):
+        """Yield a header line followed by one CSV chunk per batch."""
+        names = [name for name, _ in columns]
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(names)
+
+        for batch in batches:
+            for row in batch:
+                writer.writerow([_text_value(row.get(name)) for name in names])
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue().encode('utf-8')
+
+    @staticmethod
+    def _stream_ndjson(columns, batches):
+        """Yield one JSON object per line, one chunk per batch."""
+        names = [name for name, _ in columns]
+
+        for batch in batches:
+            lines = [
+                json.dumps({name: _text_value(row.get(name)) for name in names}, default=_json_default)
+                for row in batch
+            ]
+            if lines:
+                yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+    @staticmethod
+    def _stream_parquet(columns, batches):
+        """Yield a Parquet file written as one row group per batch."""
+        # Optional dependency, only needed for Parquet exports
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        types = {
+            'string': pa.string(),
+            'int64': pa.int64(),
+            'float64': pa.float64(),
+            'timestamp': pa.timestamp('us', tz='UTC'),
+            'date': pa.date32()
+        }
+        schema = pa.schema([(name, types[kind]) for name, kind in columns])
+
+        buffer = ChunkBuffer()
+        writer = pq.ParquetWriter(pa.PythonFile(buffer, mode='w'), schema, compression='snappy')
+        try:
+            for batch in batches:
+                data = {}
+                for name, kind in columns:
+                    values = [row.get(name) for row in batch]
+                    if kind == 'string':
+                        values = [str(v) if v is not None else None for v in values]
+                    elif kind == 'float64':
+                        values = [float(v) if v is not None else None for v in values]
+                    data[name] = values
+                writer.write_table(pa.Table.from_pydict(data, schema=schema))
+                chunk = buffer.drain()
+                if chunk:
+                    yield chunk
+        finally:
+            writer.close()
+
+        chunk = buffer.drain()
+        if chunk:
+            yield chunk
+
+data_export_service = DataExportService()
@@ -0,0 +1,160 @@
+"""Background export job service."""
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from threading import Lock
+from config.settings import config
+from modules.models.models import ExportJob, AuditLog
+
+_executor = None
+_executor_lock = Lock()
+
+
+def _get_executor():
+    """Lazily start the shared worker process pool."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=config.EXPORT_WORKER_PROCESSES)
+        return _executor
+
+
+def _run_pdf_job(job_id, war_session_id, generated_by_name):
+    """Render a PDF report in a worker process and store it on the job."""
+    # Imported here so ReportLab is only loaded in the worker processes
+    from modules.services.pdf_report import pdf_report_service
+
+    reported = 0
+
+    def report_progress(percent):
+        # Every few percent is enough for polling clients
+        nonlocal reported
+        if percent >= reported + 5:
+            reported = percent
+            ExportJob.update(job_id, 'running', percent)
+
+    try:
+        ExportJob.update(job_id, 'running', 5)
+        report_key, buffer = pdf_report_service.get_war_report(war_session_id, generated_by_name,
+                                                               progress=report_progress)
+        try:
+            # Kept on the job row so any instance can serve the download
+            ExportJob.complete(job_id, report_key, buffer.read())
+        finally:
+            buffer.close()
+        print(f"[EXPORT_JOB] ✓ Job {job_id} finished for war {war_session_id}")
+    except Exception as e:
+        print(f"[EXPORT_JOB] ✗ Job {job_id} failed: {e}")
+        ExportJob.update(job_id, 'failed', 100, error=str(e))
+
+
+def _render_pdf_bytes(war_session_id, generated_by_name):
+    """Render (or fetch the cached) PDF report in a worker process and return its bytes."""
+    from modules.services.pdf_report import pdf_report_service
+
+    _, buffer = pdf_report_service.get_war_report(war_session_id, generated_by_name)
+    try:
+        return buffer.read()
+    finally:
+        buffer.close()
+
+
+class ExportJobService:
+    """Service for queueing report renders outside the request thread."""
+
+    @staticmethod
+    def queue_pdf_report(war_session_id, torn_id, generated_by_name):
+        """
+        Queue a PDF render for a war session.
+
+        A request for a session that already has a pending PDF job returns that
+        job instead of starting another render.
+
+        Args:
+            war_session_id: War session UUID
+            torn_id: User requesting the export
+            generated_by_name: Name printed in the report footer
+
+        Returns:
+            dict: Job status
+        """
+        job, created = ExportJob.create_or_get(war_session_id, 'pdf', torn_id, generated_by_name)
+
+        if created:
+            try:
+                _get_executor().submit(_run_pdf_job, str(job['job_id']), war_session_id, generated_by_name)  # type: ignore
+            except Exception as e:
+                ExportJob.update(job['job_id'], 'failed', 100, error=f"Could not start worker: {e}")  # type: ignore
+                raise
+
+            AuditLog.create(
+                action_type='PDF_EXPORT_QUEUED',
+                user_torn_id=torn_id,
+                war_session_id=war_session_id,
+                details=f"Queued PDF export job {job['job_id']}"  # type: ignore
+            )
+
+        return ExportJobService.format_job(job)
+
+    @staticmethod
+    def render_pdf_reports(war_session_ids, generated_by_name):
+        """
+        Render PDF reports for several sessions in the worker pool.
+
+        At most two renders per worker are in flight, so only a handful of
+        finished PDFs are ever held in memory at once.
+
+        Args:
+            war_session_ids: War session UUIDs
+            generated_by_name: Name printed in the report footers
+
+        Yields:
+            tuple: (war_session_id, pdf_bytes, error) in completion order
+        """
+        executor = _get_executor()
+        max_in_flight = max(1, config.EXPORT_WORKER_PROCESSES * 2)
+        pending_ids = list(war_session_ids)
+        in_flight = {}
+
+        while pending_ids or in_flight:
+            while pending_ids and len(in_flight) < max_in_flight:
+                session_id = pending_ids.pop(0)
+                in_flight[executor.submit(_render_pdf_bytes, session_id, generated_by_name)] = session_id
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                session_id = in_flight.pop(future)
+                try:
+                    yield session_id, future.result(), None
+                except Exception as e:
+                    print(f"[EXPORT_JOB] ✗ Bulk render failed for war {session_id}: {e}")
+                    yield session_id, None, str(e)
+
+    @staticmethod
+    def get_job(job_id):
+        """Get job status, or None if it does not exist."""
+        job = ExportJob.get(job_id)
+        return ExportJobService.format_job(job) if job else None
+
+    @staticmethod
+    def iter_output(job_id):
+        """Stream a finished job's file in chunks."""
+        return ExportJob.iter_output(job_id)
+
+    @staticmethod
+    def format_job(job):
+        """Format a job row for the API."""
+        return {
+            'job_id': str(job['job_id']),
+            'war_session_id': str(job['war_session_id']),
+            'kind': job['kind'],
+            'status': job['status'],
+            'progress': job['progress'],
+            'error': job.get('error'),
+            'report_key': job.get('report_key'),
+            'size_bytes': job.get('output_size'),
+            'file_available': bool(job.get('has_output')),
+            'created_at': job['created_at'].isoformat() if job.get('created_at') else None,
+            'completed_at': job['completed_at'].isoformat() if job.get('completed_at') else None,
+            'download_url': f"/export/jobs/{job['job_id']}/file" if job.get('has_output') else None
+        }
+
+export_job_service = ExportJobService()
@@ -1,52 +1,215 @@
 """PDF report generation service."""
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
 from io import BytesIO
 from datetime import datetime
-from modules.models.models import WarSession, Member, OtherPayment, MemberPayout
+import hashlib
+import tempfile
+from modules.models.models import WarSession, Member, OtherPayment, MemberPayout, ReportCache
 from modules.services.calculator import calculator_service
+from config.settings import config
+
+# Bump when the report layout changes so cached renders are not reused
+REPORT_FORMAT_VERSION = 2
+
+# Rows per member/other-payment table. Large tables are emitted as several
+# repeat-header tables so ReportLab's split/layout work stays linear.
+TABLE_CHUNK_ROWS = 250
+
+MEMBER_HEADERS = ['Member Name', 'Hits', 'Base Payout', 'Bonus', 'Total', 'Status']
+OTHER_HEADERS = ['Description', 'Amount']
+
+
+def _chunked_tables(headers, rows, col_widths, style):
+    """Yield repeat-header tables of at most TABLE_CHUNK_ROWS rows each."""
+    from reportlab.platypus import Table
+    
+    chunk = [headers]
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) > TABLE_CHUNK_ROWS:
+            yield Table(chunk, colWidths=col_widths, style=style, repeatRows=1)
+            chunk = [headers]
+    if len(chunk) > 1:
+        yield Table(chunk, colWidths=col_widths, style=style, repeatRows=1)
+
+
+def _member_rows(member_payouts):
+    """Format member payouts as table rows."""
+    for member in member_payouts:
+        status_text = '⚠ Left' if member['member_status'] == 'left_faction' else '✓ Active'
+        bonus_text = f"${member['bonus_amount']:,.2f}"
+        if member['bonus_reason']:
+            bonus_text += f"\n({member['bonus_reason'][:20]}...)" if len(member['bonus_reason']) > 20 else f"\n({member['bonus_reason']})"
+        
+        yield [
+            member['name'],
+            str(member['hit_count']),
+            f"${member['base_payout']:,.2f}",
+            bonus_text,
+            f"${member['total_payout']:,.2f}",
+            status_text
+        ]
+
+
+def _other_payment_rows(other_payments):
+    """Format other payments as table rows."""
+    for payment in other_payments:
+        yield [
+            payment['description'],
+            f"${payment['amount']:,.2f}"
+        ]
 
-# Blue/Gray professional color scheme
-BLUE_DARK = colors.HexColor('#1a365d')
-BLUE_MED = colors.HexColor('#2c5282')
-BLUE_LIGHT = colors.HexColor('#4299e1')
-GRAY_DARK = colors.HexColor('#2d3748')
-GRAY_MED = colors.HexColor('#718096')
-GRAY_LIGHT = colors.HexColor('#e2e8f0')
 
 class PDFReportService:
     """Service for generating professional PDF war reports."""
     
     @staticmethod
-    def generate_war_report(war_session_id, generated_by_name):
+    def load_report_data(war_session_id):
         """
-        Generate a professional PDF war report.
+        Load the war session and payout breakdown a report is rendered from.
         
         Args:
             war_session_id: War session UUID
-            generated_by_name: Name of the user generating the report
             
         Returns:
-            BytesIO: PDF file buffer
+            tuple: (war_session, payout_data)
         """
         # Get war session data
         war_session = WarSession.get_by_id(war_session_id)
         if not war_session:
             raise ValueError("War session not found")
         
-        # Get payout data by calculating (includes all details needed for PDF)
-        payout_data = calculator_service.calculate_payouts(
-            war_session_id,
-            war_session['total_earnings'],  # type: ignore
-            war_session['price_per_hit']  # type: ignore
+        # Render from the saved payout snapshot; only recalculate when it is
+        # missing or member data changed since the last calculation
+        payout_data = calculator_service.get_saved_payouts(war_session)
+        if payout_data is None:
+            payout_data = calculator_service.calculate_payouts(
+                war_session_id,
+                war_session['total_earnings'],  # type: ignore
+                war_session['price_per_hit']  # type: ignore
+            )
+            # Saving the calculation moved the session's version
+            war_session = WarSession.get_by_id(war_session_id) or war_session
+        
+        return war_session, payout_data
+    
+    @staticmethod
+    def report_key(war_session_id, version, generated_by_name):
+        """
+        Key a rendered report by its session's version counter and requester.
+        
+        The version moves on every write to the session, its members,
+        payments and payouts, so the key can be checked (If-None-Match, cache
+        lookup) before any report data is loaded. The footer names the user
+        who generated the report, so each name gets its own render. Used as
+        the cache key and the HTTP ETag.
+        
+        Returns:
+            str: SHA-256 hex digest
+        """
+        payload = f"{REPORT_FORMAT_VERSION}:{war_session_id}:{version}:{generated_by_name}".encode()
+        return hashlib.sha256(payload).hexdigest()
+    
+    @staticmethod
+    def get_war_report(war_session_id, generated_by_name, known_keys=(), progress=None):
+        """
+        Get a PDF war report, reusing a cached render when the session is unchanged.
+        
+        Args:
+            war_session_id: War session UUID
+            generated_by_name: Name of the user generating the report
+            known_keys: Report keys the client already holds (If-None-Match)
+            progress: Optional callback receiving the percentage done (0-100)
+            
+        Returns:
+            tuple: (report_key, PDF file object), file is None when the
+                   key is in known_keys
+        """
+        version = WarSession.get_version(war_session_id)
+        if version is None:
+            raise ValueError("War session not found")
+        key = PDFReportService.report_key(war_session_id, version, generated_by_name)
+        
+        if key in known_keys:
+            return key, None
+        
+        cached = ReportCache.get(key)
+        if cached:
+            print(f"[PDF] ✓ Serving cached report {key[:12]} for war {war_session_id}")
+            return key, BytesIO(bytes(cached['pdf_data']))
+        
+        if progress:
+            progress(10)
+        war_session, payout_data = PDFReportService.load_report_data(war_session_id)
+        version = war_session['version']  # type: ignore
+        key = PDFReportService.report_key(war_session_id, version, generated_by_name)
+        if progress:
+            progress(30)
+        
+        # Large reports spill to a temporary file instead of staying in memory
+        spool = tempfile.SpooledTemporaryFile(max_size=config.PDF_SPOOL_MAX_BYTES)
+        layout_progress = (lambda fraction: progress(30 + int(fraction * 60))) if progress else None
+        buffer = PDFReportService.render_war_report(war_session, payout_data, generated_by_name,
+                                                    output=spool, progress=layout_progress)
+        
+        # Only reports small enough to hold in memory are cached; larger ones
+        # are streamed straight from the spool file
+        size = buffer.seek(0, 2)
+        buffer.seek(0)
+        if size <= config.PDF_CACHE_MAX_REPORT_BYTES:
+            try:
+                ReportCache.store(key, war_session_id, version, buffer.read())
+            except Exception as e:
+                # A cache write failure should never fail the download
+                print(f"[PDF] ⚠ Could not cache report for war {war_session_id}: {e}")
+            buffer.seek(0)
+        else:
+            print(f"[PDF] ⚠ Report for war {war_session_id} is {size} bytes, too large to cache")
+        
+        return key, buffer
+    
+    @staticmethod
+    def generate_war_report(war_session_id, generated_by_name):
+        """
+        Generate a professional PDF war report.
+        
+        Args:
+            war_session_id: War session UUID
+            generated_by_name: Name of the user generating the report
+            
+        Returns:
+            BytesIO: PDF file buffer
+        """
+        war_session, payout_data = PDFReportService.load_report_data(war_session_id)
+        return PDFReportService.render_war_report(war_session, payout_data, generated_by_name)
+    
+    @staticmethod
+    def render_war_report(war_session, payout_data, generated_by_name, output=None, progress=None):
+        """
+        Render a PDF war report from already loaded data.
+        
+        Args:
+            war_session: War session row
+            payout_data: Payout breakdown (calculate_payouts shape)
+            generated_by_name: Name of the user generating the report
+            output: Optional file path or writable binary file object (e.g. a
+                    temporary file or response stream); defaults to a BytesIO
+            progress: Optional callback receiving the fraction of the layout
+                      done (0-1) after each table chunk or paragraph
+            
+        Returns:
+            The output the PDF was written to (rewound when it is seekable)
+        """
+        # ReportLab is loaded on the first render rather than at start-up
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, Table, Paragraph, Spacer
+        from modules.services.pdf_styles import (
+            TITLE_STYLE, HEADING_STYLE, NORMAL_STYLE, FOOTER_STYLE, SUMMARY_TABLE_STYLE,
+            MEMBER_TABLE_STYLE, MEMBER_COL_WIDTHS, OTHER_TABLE_STYLE, OTHER_COL_WIDTHS
         )
         
         # Create PDF buffer
-        buffer = BytesIO()
+        buffer = output if output is not None else BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter,
                                 rightMargin=0.75*inch, leftMargin=0.75*inch,
                                 topMargin=1*inch, bottomMargin=0.75*inch)
@@ -54,43 +217,12 @@ class PDFReportService:
         # Container for the 'Flowable' objects
         elements = []
         
-        # Define styles
-        styles = getSampleStyleSheet()
-        
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=BLUE_DARK,
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=BLUE_MED,
-            spaceAfter=12,
-            spaceBefore=20,
-            fontName='Helvetica-Bold'
-        )
-        
-        normal_style = ParagraphStyle(
-            'CustomNormal',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor=GRAY_DARK,
-            spaceAfter=12
-        )
-        
         # Title
-        title = Paragraph(f"<b>War Report</b>", title_style)
+        title = Paragraph(f"<b>War Report</b>", TITLE_STYLE)
         elements.append(title)
         
         # War session info
-        war_name = Paragraph(f"<b>{war_session['war_name']}</b>", heading_style)  # type: ignore
+        war_name = Paragraph(f"<b>{war_session['war_name']}</b>", HEADING_STYLE)  # type: ignore
         elements.append(war_name)
         
         date_created = war_session['created_timestamp'].strftime('%B %d, %Y %I:%M %p') if war_session.get('created_timestamp') else 'N/A'  # type: ignore
@@ -101,12 +233,12 @@ class PDFReportService:
             date_completed = war_session['completed_timestamp'].strftime('%B %d, %Y %I:%M %p')  # type: ignore
             info_text += f"<br/><b>Completed:</b> {date_completed}"
         
-        info = Paragraph(info_text, normal_style)
+        info = Paragraph(info_text, NORMAL_STYLE)
         elements.append(info)
         elements.append(Spacer(1, 0.3*inch))
         
         # Summary section
-        summary_heading = Paragraph("<b>Financial Summary</b>", heading_style)
+        summary_heading = Paragraph("<b>Financial Summary</b>", HEADING_STYLE)
         elements.append(summary_heading)
         
         summary_data = [
@@ -118,132 +250,57 @@ class PDFReportService:
             ['Remaining Balance', f"${payout_data['remaining_balance']:,.2f}"]
         ]
         
-        summary_table = Table(summary_data, colWidths=[3.5*inch, 2*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), GRAY_LIGHT),
-            ('BACKGROUND', (1, 0), (1, -1), colors.white),
-            ('TEXTCOLOR', (0, 0), (-1, -1), GRAY_DARK),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('GRID', (0, 0), (-1, -1), 0.5, GRAY_MED),
-            ('ROWBACKGROUNDS', (0, 0), (-1, -1), [GRAY_LIGHT, colors.white]),
-            # Highlight remaining balance
-            ('BACKGROUND', (0, 5), (-1, 5), BLUE_LIGHT),
-            ('TEXTCOLOR', (0, 5), (-1, 5), colors.white),
-            ('FONTNAME', (0, 5), (-1, 5), 'Helvetica-Bold'),
-        ]))
+        summary_table = Table(summary_data, colWidths=[3.5*inch, 2*inch], style=SUMMARY_TABLE_STYLE)
         
         elements.append(summary_table)
         elements.append(Spacer(1, 0.4*inch))
         
         # Member payouts table
-        member_heading = Paragraph("<b>Member Payouts</b>", heading_style)
+        member_heading = Paragraph("<b>Member Payouts</b>", HEADING_STYLE)
         elements.append(member_heading)
         
-        member_headers = ['Member Name', 'Hits', 'Base Payout', 'Bonus', 'Total', 'Status']
-        member_data = [member_headers]
-        
-        for member in payout_data['member_payouts']:
-            status_text = '⚠ Left' if member['member_status'] == 'left_faction' else '✓ Active'
-            bonus_text = f"${member['bonus_amount']:,.2f}"
-            if member['bonus_reason']:
-                bonus_text += f"\n({member['bonus_reason'][:20]}...)" if len(member['bonus_reason']) > 20 else f"\n({member['bonus_reason']})"
-            
-            member_data.append([
-                member['name'],
-                str(member['hit_count']),
-                f"${member['base_payout']:,.2f}",
-                bonus_text,
-                f"${member['total_payout']:,.2f}",
-                status_text
-            ])
-        
-        member_table = Table(member_data, colWidths=[1.8*inch, 0.6*inch, 1*inch, 1.2*inch, 1*inch, 0.9*inch])
-        member_table.setStyle(TableStyle([
-            # Header row
-            ('BACKGROUND', (0, 0), (-1, 0), BLUE_DARK),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            
-            # Data rows
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('TEXTCOLOR', (0, 1), (-1, -1), GRAY_DARK),
-            ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('GRID', (0, 0), (-1, -1), 0.5, GRAY_MED),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, GRAY_LIGHT]),
-        ]))
-        
-        elements.append(member_table)
+        member_tables = _chunked_tables(MEMBER_HEADERS, _member_rows(payout_data['member_payouts']),
+                                        MEMBER_COL_WIDTHS, MEMBER_TABLE_STYLE)
+        elements.extend(member_tables)
+        if not payout_data['member_payouts']:
+            elements.append(Table([MEMBER_HEADERS], colWidths=MEMBER_COL_WIDTHS, style=MEMBER_TABLE_STYLE))
         elements.append(Spacer(1, 0.3*inch))
         
         # Other payments table (if any)
         if payout_data['other_payments']:
-            other_heading = Paragraph("<b>Other Payments</b>", heading_style)
+            other_heading = Paragraph("<b>Other Payments</b>", HEADING_STYLE)
             elements.append(other_heading)
             
-            other_headers = ['Description', 'Amount']
-            other_data = [other_headers]
-            
-            for payment in payout_data['other_payments']:
-                other_data.append([
-                    payment['description'],
-                    f"${payment['amount']:,.2f}"
-                ])
-            
-            other_table = Table(other_data, colWidths=[4.5*inch, 2*inch])
-            other_table.setStyle(TableStyle([
-                # Header row
-                ('BACKGROUND', (0, 0), (-1, 0), BLUE_DARK),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                
-                # Data rows
-                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-                ('TEXTCOLOR', (0, 1), (-1, -1), GRAY_DARK),
-                ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-                ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('GRID', (0, 0), (-1, -1), 0.5, GRAY_MED),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, GRAY_LIGHT]),
-            ]))
-            
-            elements.append(other_table)
+            elements.extend(_chunked_tables(OTHER_HEADERS, _other_payment_rows(payout_data['other_payments']),
+                                            OTHER_COL_WIDTHS, OTHER_TABLE_STYLE))
             elements.append(Spacer(1, 0.3*inch))
         
         # Footer
         footer_text = f"Report generated on {datetime.now().strftime('%B %d, %Y at %I:%M %p')}<br/>"
         footer_text += f"Generated by: {generated_by_name}"
         
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=GRAY_MED,
-            alignment=TA_CENTER
-        )
-        
-        footer = Paragraph(footer_text, footer_style)
+        footer = Paragraph(footer_text, FOOTER_STYLE)
         elements.append(Spacer(1, 0.5*inch))
         elements.append(footer)
         
+        if progress:
+            total = len(elements)
+            done = 0
+            
+            def after_flowable(flowable):
+                nonlocal done
+                done += 1
+                # Tables split across pages are counted once per part
+                progress(min(done / total, 1.0))
+            
+            doc.afterFlowable = after_flowable
+        
         # Build PDF
         doc.build(elements)
         
-        # Get the value of the BytesIO buffer and return it
-        buffer.seek(0)
+        # Rewind so the caller can stream it straight back out
+        if hasattr(buffer, 'seek'):
+            buffer.seek(0)
         return buffer
 
 pdf_report_service = PDFReportService()
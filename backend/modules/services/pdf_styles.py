@@ -0,0 +1,117 @@
+"""ReportLab colors, styles and column widths for the PDF war report.
+
+Kept apart from pdf_report so ReportLab is only imported (and the styles
+built) when the first report is rendered, not at application start-up.
+"""
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import TableStyle
+from reportlab.lib.enums import TA_CENTER
+
+# Blue/Gray professional color scheme
+BLUE_DARK = colors.HexColor('#1a365d')
+BLUE_MED = colors.HexColor('#2c5282')
+BLUE_LIGHT = colors.HexColor('#4299e1')
+GRAY_DARK = colors.HexColor('#2d3748')
+GRAY_MED = colors.HexColor('#718096')
+GRAY_LIGHT = colors.HexColor('#e2e8f0')
+
+# Paragraph and table styles are immutable, so build them once
+_SAMPLE_STYLES = getSampleStyleSheet()
+
+TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_SAMPLE_STYLES['Heading1'],
+    fontSize=24,
+    textColor=BLUE_DARK,
+    spaceAfter=30,
+    alignment=TA_CENTER,
+    fontName='Helvetica-Bold'
+)
+
+HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_SAMPLE_STYLES['Heading2'],
+    fontSize=16,
+    textColor=BLUE_MED,
+    spaceAfter=12,
+    spaceBefore=20,
+    fontName='Helvetica-Bold'
+)
+
+NORMAL_STYLE = ParagraphStyle(
+    'CustomNormal',
+    parent=_SAMPLE_STYLES['Normal'],
+    fontSize=10,
+    textColor=GRAY_DARK,
+    spaceAfter=12
+)
+
+FOOTER_STYLE = ParagraphStyle(
+    'Footer',
+    parent=_SAMPLE_STYLES['Normal'],
+    fontSize=8,
+    textColor=GRAY_MED,
+    alignment=TA_CENTER
+)
+
+SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), GRAY_LIGHT),
+    ('BACKGROUND', (1, 0), (1, -1), colors.white),
+    ('TEXTCOLOR', (0, 0), (-1, -1), GRAY_DARK),
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 11),
+    ('GRID', (0, 0), (-1, -1), 0.5, GRAY_MED),
+    ('ROWBACKGROUNDS', (0, 0), (-1, -1), [GRAY_LIGHT, colors.white]),
+    # Highlight remaining balance
+    ('BACKGROUND', (0, 5), (-1, 5), BLUE_LIGHT),
+    ('TEXTCOLOR', (0, 5), (-1, 5), colors.white),
+    ('FONTNAME', (0, 5), (-1, 5), 'Helvetica-Bold'),
+])
+
+MEMBER_TABLE_STYLE = TableStyle([
+    # Header row
+    ('BACKGROUND', (0, 0), (-1, 0), BLUE_DARK),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    
+    # Data rows
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ('TEXTCOLOR', (0, 1), (-1, -1), GRAY_DARK),
+    ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('GRID', (0, 0), (-1, -1), 0.5, GRAY_MED),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, GRAY_LIGHT]),
+])
+
+OTHER_TABLE_STYLE = TableStyle([
+    # Header row
+    ('BACKGROUND', (0, 0), (-1, 0), BLUE_DARK),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    
+    # Data rows
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ('TEXTCOLOR', (0, 1), (-1, -1), GRAY_DARK),
+    ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('GRID', (0, 0), (-1, -1), 0.5, GRAY_MED),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, GRAY_LIGHT]),
+])
+
+MEMBER_COL_WIDTHS = [1.8*inch, 0.6*inch, 1*inch, 1.2*inch, 1*inch, 0.9*inch]
+OTHER_COL_WIDTHS = [4.5*inch, 2*inch]
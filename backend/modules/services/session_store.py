@@ -0,0 +1,169 @@
+"""Login session stores.
+
+Both stores expose the same methods:
+    get(torn_id, refresh=False) -> dict with faction_id, api_key and
+        last_activity (aware UTC datetime), or None
+    create(torn_id, faction_id, api_key)
+    touch(torn_id)
+    delete(torn_id)
+    expire(torn_id, cutoff) -> True if the session was deleted, False if
+        activity at or after cutoff was recorded (e.g. by another instance)
+"""
+import time
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from config.settings import config
+from modules.models.models import UserSession
+from utils.batch_writer import BatchWriter
+
+
+class MemorySessionStore:
+    """Process-local sessions. Only suitable for a single worker."""
+
+    def __init__(self):
+        self._sessions = {}
+        self._lock = Lock()
+
+    def get(self, torn_id, refresh=False):
+        with self._lock:
+            session = self._sessions.get(torn_id)
+            return dict(session) if session else None
+
+    def create(self, torn_id, faction_id, api_key):
+        with self._lock:
+            self._sessions[torn_id] = {
+                'faction_id': faction_id,
+                'api_key': api_key,
+                'last_activity': datetime.now(timezone.utc)
+            }
+
+    def touch(self, torn_id):
+        with self._lock:
+            if torn_id in self._sessions:
+                self._sessions[torn_id]['last_activity'] = datetime.now(timezone.utc)
+
+    def delete(self, torn_id):
+        with self._lock:
+            self._sessions.pop(torn_id, None)
+
+    def expire(self, torn_id, cutoff):
+        with self._lock:
+            session = self._sessions.get(torn_id)
+            if session and session['last_activity'] >= cutoff:
+                return False
+            self._sessions.pop(torn_id, None)
+            return True
+
+
+class PostgresSessionStore:
+    """
+    Sessions shared through the user_sessions table.
+
+    Each process keeps a read-through cache that it trusts for
+    SESSION_CACHE_SECONDS (0 by default, so a logout on any instance is seen
+    by the next request everywhere). Activity is recorded locally on every
+    request and written back at most every SESSION_ACTIVITY_WRITE_SECONDS per
+    user, either on the request thread or, with SESSION_ACTIVITY_BUFFERED, in
+    batches by a background flusher. Another instance's row can therefore
+    lag its real activity by up to that interval, which deletes allow for.
+    """
+
+    def __init__(self):
+        self._cache = {}
+        self._lock = Lock()
+        self._activity_writer = None
+        if config.SESSION_ACTIVITY_BUFFERED:
+            self._activity_writer = BatchWriter(
+                UserSession.touch_many,
+                'SESSION',
+                flush_size=500,
+                flush_interval=config.SESSION_ACTIVITY_WRITE_SECONDS
+            )
+
+    def get(self, torn_id, refresh=False):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(torn_id)
+            if entry and not refresh and now - entry['loaded_at'] < config.SESSION_CACHE_SECONDS:
+                return dict(entry['session'])
+
+        row = UserSession.get(torn_id)
+
+        with self._lock:
+            if not row:
+                self._cache.pop(torn_id, None)
+                return None
+
+            # Keep local activity that has not been written back yet
+            local = self._cache.get(torn_id)
+            last_activity = row['last_activity']
+            if local and local['session']['last_activity'] > last_activity:
+                last_activity = local['session']['last_activity']
+
+            session = {
+                'faction_id': row['faction_id'],
+                'api_key': row['api_key'],
+                'last_activity': last_activity
+            }
+            self._cache[torn_id] = {
+                'session': session,
+                'loaded_at': now,
+                'written_at': local['written_at'] if local else now
+            }
+            return dict(session)
+
+    def create(self, torn_id, faction_id, api_key):
+        now = datetime.now(timezone.utc)
+        UserSession.upsert(torn_id, faction_id, api_key, now)
+
+        # Opportunistic cleanup of sessions that can no longer be resumed,
+        # leaving room for activity other instances have not written back yet
+        write_lag = timedelta(seconds=2 * config.SESSION_ACTIVITY_WRITE_SECONDS)
+        UserSession.delete_inactive(now - timedelta(minutes=config.SESSION_TIMEOUT_MINUTES) - write_lag)
+
+        with self._lock:
+            self._cache[torn_id] = {
+                'session': {'faction_id': faction_id, 'api_key': api_key, 'last_activity': now},
+                'loaded_at': time.monotonic(),
+                'written_at': time.monotonic()
+            }
+
+    def touch(self, torn_id):
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            entry = self._cache.get(torn_id)
+            if not entry:
+                return
+            entry['session']['last_activity'] = now
+            if time.monotonic() - entry['written_at'] < config.SESSION_ACTIVITY_WRITE_SECONDS:
+                return
+            entry['written_at'] = time.monotonic()
+
+        if self._activity_writer:
+            self._activity_writer.put((torn_id, now))
+        else:
+            UserSession.touch_many([(torn_id, now)])
+
+    def delete(self, torn_id):
+        with self._lock:
+            self._cache.pop(torn_id, None)
+        UserSession.delete(torn_id)
+
+    def expire(self, torn_id, cutoff):
+        with self._lock:
+            self._cache.pop(torn_id, None)
+        # Conditional on the row, so activity another instance wrote after
+        # our read keeps the session alive
+        return UserSession.delete_if_inactive(torn_id, cutoff)
+
+
+def create_session_store(kind=None):
+    """Create the session store configured by SESSION_STORE."""
+    kind = kind or config.SESSION_STORE
+    if kind == 'memory':
+        return MemorySessionStore()
+    if kind == 'postgres':
+        return PostgresSessionStore()
+    raise ValueError(f"Unknown session store: {kind}")
+
+session_store = create_session_store()
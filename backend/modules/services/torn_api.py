@@ -1,5 +1,9 @@
 """Torn API integration service."""
-import requests
+import hashlib
+import hmac
+import os
+import time
+from threading import Lock
 from config.settings import config
 from modules.models.models import AuditLog, FactionConfig
 from datetime import datetime
@@ -11,17 +15,73 @@ class TornAPIService:
         """Initialize Torn API service."""
         self.base_url = config.TORN_API_BASE_URL
         self.rate_limit = config.RATE_LIMIT_PER_MINUTE
+        # Successful key validations, keyed by an HMAC of the key under a
+        # per-process secret so raw API keys are never held as cache keys
+        self._validation_cache = {}
+        self._validation_lock = Lock()
+        self._validation_secret = os.urandom(32)
     
     def validate_api_key(self, api_key):
         """
         Validate Torn API key and get user info.
         
+        Successful results are reused for TORN_VALIDATION_CACHE_SECONDS, so a
+        quick re-login after a session timeout does not call Torn again.
+        
         Args:
             api_key: Torn API key
             
         Returns:
             dict: User information including faction details
         """
+        cache_key = hmac.new(self._validation_secret, api_key.encode(), hashlib.sha256).digest()
+        cached = self._get_cached_validation(cache_key)
+        if cached:
+            return dict(cached)
+        
+        user_data = self._fetch_user(api_key)
+        if user_data:
+            self._cache_validation(cache_key, user_data)
+        return user_data
+    
+    def _get_cached_validation(self, cache_key):
+        """Get an unexpired cached validation result, or None."""
+        with self._validation_lock:
+            entry = self._validation_cache.get(cache_key)
+            if entry is None:
+                return None
+            user_data, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._validation_cache[cache_key]
+                return None
+            return user_data
+    
+    def _cache_validation(self, cache_key, user_data):
+        """Cache a successful validation result."""
+        if config.TORN_VALIDATION_CACHE_SECONDS <= 0:
+            return
+        
+        now = time.monotonic()
+        with self._validation_lock:
+            if len(self._validation_cache) >= config.TORN_VALIDATION_CACHE_SIZE:
+                self._validation_cache = {
+                    key: entry for key, entry in self._validation_cache.items() if entry[1] > now
+                }
+                while len(self._validation_cache) >= config.TORN_VALIDATION_CACHE_SIZE:
+                    # Dicts keep insertion order, so this drops the oldest entry
+                    del self._validation_cache[next(iter(self._validation_cache))]
+            self._validation_cache[cache_key] = (dict(user_data), now + config.TORN_VALIDATION_CACHE_SECONDS)
+    
+    def clear_validation_cache(self):
+        """Forget all cached validation results."""
+        with self._validation_lock:
+            self._validation_cache.clear()
+    
+    def _fetch_user(self, api_key):
+        """Call Torn's /user endpoint and return the validated user info, or None."""
+        # Imported on first use: requests is slow to import and most requests never call Torn
+        import requests
+        
         try:
             # Use v2 API with correct query parameter format
             url = f"{self.base_url}/user?key={api_key}"
@@ -66,6 +126,8 @@ class TornAPIService:
         Returns:
             dict: Faction info if admin, None otherwise
         """
+        import requests
+        
         try:
             # Use v2 API with correct query parameter format
             url = f"{self.base_url}/faction?key={api_key}"
@@ -119,6 +181,8 @@ class TornAPIService:
         Returns:
             dict: Ranked war summary with member list
         """
+        import requests
+        
         try:
             wars_url = f"{self.base_url}/faction/rankedwars"
             params = {"offset": 0, "limit": 20, "sort": "DESC", "key": api_key}
@@ -173,6 +237,8 @@ class TornAPIService:
         Returns:
             list: Member data with hit counts
         """
+        import requests
+        
         try:
             if not api_key:
                 raise ValueError("Session API key not found")
@@ -0,0 +1,256 @@
+"""Live war session updates for Server-Sent Events streams.
+
+Every write to a war session bumps war_sessions.version, and migration 014
+turns each bump into a NOTIFY on the war_session_events channel. Each
+process runs one LISTEN connection for all of its open streams. When a
+watched session changes, the hub reads its workspace once, works out what
+changed since the previous read and hands the resulting events to every
+subscriber of that session.
+"""
+import json
+import os
+import queue
+import select
+import threading
+import time
+import psycopg2
+from config.settings import config
+from config.database import Database
+from utils.json_provider import dumps
+from modules.services.war_session import war_session_service
+
+CHANNEL = 'war_session_events'
+
+# Events a subscriber may fall behind by before it is sent a fresh snapshot
+SUBSCRIBER_QUEUE_SIZE = 100
+
+
+def diff_workspaces(old, new):
+    """
+    Describe the changes between two workspaces as (event, data) pairs.
+
+    Events:
+        members   changed/added member rows and removed member IDs
+        payments  the full other payments list
+        totals    summary and saved payouts
+        war       session fields other than members (e.g. completion)
+    """
+    version = new['version']
+    events = []
+
+    old_members = {m['member_id']: m for m in old['war']['members']}
+    new_members = {m['member_id']: m for m in new['war']['members']}
+    changed = [m for member_id, m in new_members.items() if old_members.get(member_id) != m]
+    removed = [member_id for member_id in old_members if member_id not in new_members]
+    if changed or removed:
+        events.append(('members', {'version': version, 'changed': changed, 'removed': removed}))
+
+    if old['other_payments'] != new['other_payments']:
+        events.append(('payments', {'version': version, 'other_payments': new['other_payments']}))
+
+    if old['summary'] != new['summary'] or old['payouts'] != new['payouts']:
+        events.append(('totals', {'version': version, 'summary': new['summary'], 'payouts': new['payouts']}))
+
+    old_war = {k: v for k, v in old['war'].items() if k not in ('members', 'member_count', 'version')}
+    new_war = {k: v for k, v in new['war'].items() if k not in ('members', 'member_count', 'version')}
+    if old_war != new_war:
+        events.append(('war', {'version': version, 'war': new_war}))
+
+    return events
+
+
+class WarEventHub:
+    """Fans war session changes out to the SSE subscribers of this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+        self._snapshots = {}
+        self._thread = None
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def subscribe(self, session_id):
+        """
+        Register a subscriber for a war session.
+
+        Returns:
+            queue.Queue: Receives (event, data) pairs
+        """
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.setdefault(session_id, set()).add(subscriber)
+            self._ensure_listener()
+        return subscriber
+
+    def unsubscribe(self, session_id, subscriber):
+        """Remove a subscriber; forget the session once nobody watches it."""
+        with self._lock:
+            subscribers = self._subscribers.get(session_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[session_id]
+                self._snapshots.pop(session_id, None)
+
+    def snapshot(self, session_id):
+        """Get the latest workspace of a session, reading it if not yet known."""
+        with self._lock:
+            workspace = self._snapshots.get(session_id)
+        if workspace is not None:
+            return workspace
+
+        workspace = war_session_service.get_workspace(session_id)
+        if workspace is not None:
+            with self._lock:
+                known = self._snapshots.get(session_id)
+                if session_id in self._subscribers and (known is None or known['version'] < workspace['version']):
+                    self._snapshots[session_id] = workspace
+        return workspace
+
+    def publish(self, session_id, version):
+        """Read a changed session once and queue its events for all subscribers."""
+        with self._lock:
+            if session_id not in self._subscribers:
+                return
+            previous = self._snapshots.get(session_id)
+        if previous is not None and previous['version'] >= version:
+            return
+
+        workspace = war_session_service.get_workspace(session_id)
+        if workspace is None:
+            return
+
+        with self._lock:
+            previous = self._snapshots.get(session_id)
+            if previous is not None and previous['version'] >= workspace['version']:
+                return
+            self._snapshots[session_id] = workspace
+            subscribers = list(self._subscribers.get(session_id, ()))
+
+        events = diff_workspaces(previous, workspace) if previous else [('snapshot', workspace)]
+        for subscriber in subscribers:
+            for event in events:
+                try:
+                    subscriber.put_nowait(event)
+                except queue.Full:
+                    # Too far behind: replace the backlog with a full snapshot
+                    while not subscriber.empty():
+                        try:
+                            subscriber.get_nowait()
+                        except queue.Empty:
+                            break
+                    subscriber.put_nowait(('snapshot', workspace))
+                    break
+
+    def _ensure_listener(self):
+        """Start the LISTEN thread on first subscription. Caller holds the lock."""
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(target=self._listen, name='war-events-listener', daemon=True)
+        self._thread.start()
+
+    def _reset_after_fork(self):
+        """Forked children start without subscribers or a listener."""
+        self._lock = threading.Lock()
+        self._subscribers = {}
+        self._snapshots = {}
+        self._thread = None
+
+    def _listen(self):
+        """Listener loop; reconnects with a back-off when the connection drops."""
+        while True:
+            connection = None
+            try:
+                connection = psycopg2.connect(**Database._parse_db_url(config.POSTGRES_URL))
+                connection.autocommit = True
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {CHANNEL}")
+                print(f"[WAR_EVENTS] ✓ Listening on {CHANNEL}")
+
+                # Changes made while disconnected were not notified
+                with self._lock:
+                    self._snapshots.clear()
+
+                while True:
+                    if select.select([connection], [], [], config.SSE_HEARTBEAT_SECONDS) == ([], [], []):
+                        continue
+                    connection.poll()
+
+                    # Coalesce everything that arrived together to one read per session
+                    latest = {}
+                    while connection.notifies:
+                        notify = connection.notifies.pop(0)
+                        try:
+                            payload = json.loads(notify.payload)
+                            session_id = str(payload['session_id'])
+                            latest[session_id] = max(latest.get(session_id, 0), int(payload['version']))
+                        except (ValueError, KeyError, TypeError):
+                            continue
+
+                    for session_id, version in latest.items():
+                        try:
+                            self.publish(session_id, version)
+                        except Exception as e:
+                            print(f"[WAR_EVENTS] ✗ Failed to publish {session_id}: {e}")
+            except Exception as e:
+                print(f"[WAR_EVENTS] ✗ Listener error: {e}")
+                time.sleep(5)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+
+def stream_events(session_id):
+    """
+    Generate the SSE stream for a war session.
+
+    Starts with a full snapshot, then sends change events as they are
+    published, a comment line every SSE_HEARTBEAT_SECONDS, and ends after
+    SSE_MAX_STREAM_SECONDS so the client reconnects (and re-authenticates).
+
+    Yields:
+        str: SSE frames
+    """
+    # Notifications carry the canonical (lower case) UUID
+    session_id = session_id.lower()
+    subscriber = war_event_hub.subscribe(session_id)
+    try:
+        workspace = war_event_hub.snapshot(session_id)
+        if workspace is None:
+            yield _frame('error', {'error': 'War session not found'})
+            return
+
+        version = workspace['version']
+        yield f"retry: 3000\n{_frame('snapshot', workspace, version)}"
+
+        deadline = time.monotonic() + config.SSE_MAX_STREAM_SECONDS
+        while time.monotonic() < deadline:
+            try:
+                event, data = subscriber.get(timeout=config.SSE_HEARTBEAT_SECONDS)
+            except queue.Empty:
+                yield ": keepalive\n\n"
+                continue
+
+            # The snapshot may already include changes that were queued after it
+            if event == 'snapshot':
+                version = data['version']
+            elif data['version'] <= version:
+                continue
+            yield _frame(event, data, data['version'])
+    finally:
+        war_event_hub.unsubscribe(session_id, subscriber)
+
+
+def _frame(event, data, event_id=None):
+    """Format one SSE event."""
+    lines = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{lines}event: {event}\ndata: {dumps(data)}\n\n"
+
+
+war_event_hub = WarEventHub()
@@ -2,6 +2,8 @@
 from modules.models.models import WarSession, Member, AuditLog
 from modules.services.torn_api import torn_api_service
 from modules.services.auth import auth_service
+from modules.services.calculator import calculator_service
+from utils.encryption import encryption_service
 from datetime import datetime
 from typing import Dict, Any, cast
 
@@ -91,7 +93,12 @@ class WarSessionService:
         # Get members for this war
         members = cast(list[Dict[str, Any]], Member.get_by_session(session_id))
         
-        # Format members - Member.get_by_session already decrypts values
+        return WarSessionService._format_war_details(war, members)
+    
+    @staticmethod
+    def _format_war_details(war, members):
+        """Format a war session row and its decrypted members for the API."""
+        # Format members - already decrypted by the model
         formatted_members = []
         for m in members:
             formatted_members.append({
@@ -105,24 +112,71 @@ class WarSessionService:
                 'member_status': m.get('member_status', 'active')
             })
         
-        # Format war session
-        start_dt = war.get('war_start_timestamp')
-        end_dt = war.get('war_end_timestamp')
-        
         return {
             'session_id': str(war.get('session_id', '')),
             'war_name': war.get('war_name', ''),
             'status': 'completed' if war.get('completed_timestamp') else 'active',
             'ranked_war_id': war.get('ranked_war_id'),
             'opposing_faction_name': war.get('opposing_faction_name'),
-            'war_start_timestamp': start_dt.isoformat() if start_dt else None,
-            'war_end_timestamp': end_dt.isoformat() if end_dt else None,
+            'war_start_timestamp': war.get('war_start_timestamp'),
+            'war_end_timestamp': war.get('war_end_timestamp'),
             'total_earnings': float(war.get('total_earnings', 0)) if war.get('total_earnings') else 0.0,
             'price_per_hit': float(war.get('price_per_hit', 0)) if war.get('price_per_hit') else 0.0,
-            'created_timestamp': war.get('created_timestamp').isoformat() if war.get('created_timestamp') else None,
-            'completed_timestamp': war.get('completed_timestamp').isoformat() if war.get('completed_timestamp') else None,
+            'created_timestamp': war.get('created_timestamp'),
+            'completed_timestamp': war.get('completed_timestamp'),
             'members': formatted_members,
-            'member_count': len(formatted_members)
+            'member_count': len(formatted_members),
+            'version': war.get('version')
+        }
+    
+    @staticmethod
+    def get_workspace(session_id):
+        """
+        Get everything the war details page shows in one response.
+        
+        Built from a single database transaction (WarSession.get_workspace),
+        so members are read and decrypted once for all parts.
+        
+        Args:
+            session_id: War session UUID
+            
+        Returns:
+            dict: war (with members), other_payments, payouts (saved snapshot
+                  or None), summary and version; None if the session is missing
+        """
+        data = WarSession.get_workspace(session_id)
+        
+        if not data:
+            return None
+        
+        war = data['war']
+        members = data['members']
+        
+        other_payments = []
+        for payment in data['other_payments']:
+            payment = {k: v for k, v in payment.items() if k != 'encrypted_amount'}
+            try:
+                payment['amount'] = float(payment.get('amount') or 0)
+            except (ValueError, TypeError):
+                payment['amount'] = 0.0
+            other_payments.append(payment)
+        
+        total_paid = encryption_service.decrypt(war['encrypted_total_paid']) if war.get('encrypted_total_paid') else None
+        remaining = encryption_service.decrypt(war['encrypted_remaining_balance']) if war.get('encrypted_remaining_balance') else None
+        
+        return {
+            'war': WarSessionService._format_war_details(war, members),
+            'other_payments': other_payments,
+            'payouts': calculator_service.get_saved_payouts(war, data['member_payouts'], data['other_payments']),
+            'summary': {
+                'total_members': len(members),
+                'total_hits': sum(int(m.get('hit_count') or 0) for m in members),
+                'total_other_payments': len(other_payments),
+                'total_paid': float(total_paid) if total_paid else 0,
+                'remaining_balance': float(remaining) if remaining else 0,
+                'payouts_stale': war.get('payouts_stale')
+            },
+            'version': war.get('version')
         }
     
     @staticmethod
@@ -238,83 +292,97 @@ class WarSessionService:
         
         if not session:
             return None
-        
-        start_dt = session.get('war_start_timestamp')
-        end_dt = session.get('war_end_timestamp')
 
         return {
             'session_id': str(session['session_id']),
             'war_name': session['war_name'],
             'ranked_war_id': session.get('ranked_war_id'),
             'opposing_faction_name': session.get('opposing_faction_name'),
-            'war_start_timestamp': start_dt.isoformat() if start_dt else None,
-            'war_end_timestamp': end_dt.isoformat() if end_dt else None,
+            'war_start_timestamp': session.get('war_start_timestamp'),
+            'war_end_timestamp': session.get('war_end_timestamp'),
             'status': session['status'],
             'total_earnings': float(session.get('total_earnings', 0)) if session.get('total_earnings') else 0.0,
             'price_per_hit': float(session.get('price_per_hit', 0)) if session.get('price_per_hit') else 0.0,
             'total_paid': float(session.get('total_paid', 0)) if session.get('total_paid') else 0.0,
             'remaining_balance': float(session.get('remaining_balance', 0)) if session.get('remaining_balance') else 0.0,
-            'created_timestamp': session['created_timestamp'].isoformat() if session.get('created_timestamp') else None
+            'created_timestamp': session.get('created_timestamp')
         }
     
     @staticmethod
-    def get_completed_sessions():
-        """Get all completed war sessions."""
-        sessions = cast(list[Dict[str, Any]], WarSession.get_all_completed())
+    def get_completed_sessions(fields=None, after=None, limit=None):
+        """
+        Get completed war sessions, most recently completed first.
+        
+        Args:
+            fields: WarSession.HISTORY_FIELDS to fetch, or None for all
+            after: Sort key of the last session already returned
+            limit: Page size (one extra session is returned if more exist)
+            
+        Returns:
+            list: Formatted sessions (fields not fetched come back empty)
+        """
+        sessions = cast(list[Dict[str, Any]], WarSession.get_all_completed(fields, after, limit))
+        
+        # Hit counts are encrypted: decrypt them for the whole page at once
+        hit_totals = {}
+        if fields is None or 'total_hits' in fields:
+            hit_totals = Member.get_hit_totals([s['session_id'] for s in sessions])
         
         results = []
         for s in sessions:
-            # Get member count and total hits for this session
-            members = cast(list[Dict[str, Any]], Member.get_by_session(s['session_id']))
-            total_hits = sum(int(m.get('hit_count', 0) or 0) for m in members)
-            
-            start_dt = s.get('war_start_timestamp')
-            end_dt = s.get('war_end_timestamp')
             results.append({
                 'session_id': str(s['session_id']),
-                'war_name': s['war_name'],
-                'member_count': len(members),
-                'total_hits': total_hits,
+                'war_name': s.get('war_name'),
+                'member_count': int(s.get('member_count') or 0),
+                'total_hits': hit_totals.get(str(s['session_id']), 0),
                 'ranked_war_id': s.get('ranked_war_id'),
                 'opposing_faction_name': s.get('opposing_faction_name'),
-                'war_start_timestamp': start_dt.isoformat() if start_dt else None,
-                'war_end_timestamp': end_dt.isoformat() if end_dt else None,
+                'war_start_timestamp': s.get('war_start_timestamp'),
+                'war_end_timestamp': s.get('war_end_timestamp'),
                 'total_earnings': float(s.get('total_earnings', 0)) if s.get('total_earnings') else 0.0,
                 'price_per_hit': float(s.get('price_per_hit', 0)) if s.get('price_per_hit') else 0.0,
-                'created_timestamp': s['created_timestamp'].isoformat() if s.get('created_timestamp') else None,
-                'completed_timestamp': s['completed_timestamp'].isoformat() if s.get('completed_timestamp') else None
+                'created_timestamp': s.get('created_timestamp'),
+                'completed_timestamp': s.get('completed_timestamp')
             })
 
         return results
 
     @staticmethod
-    def get_faction_wars(faction_id: int):
-        """Get all war sessions for a faction."""
-        sessions = cast(list[Dict[str, Any]], WarSession.get_by_faction(faction_id))
+    def get_faction_wars(faction_id: int, status=None, fields=None, after=None, limit=None):
+        """
+        Get a faction's war sessions, newest first.
+        
+        Args:
+            faction_id: Faction ID
+            status: Only sessions with this status, or None for all
+            fields: WarSession.LIST_FIELDS to fetch, or None for all
+            after: Sort key of the last session already returned
+            limit: Page size (one extra session is returned if more exist)
+            
+        Returns:
+            list: Formatted sessions (fields not fetched come back empty)
+        """
+        sessions = cast(list[Dict[str, Any]], WarSession.get_by_faction(faction_id, status, fields, after, limit))
         
         results = []
         for s in sessions:
-            start_dt = s.get('war_start_timestamp')
-            end_dt = s.get('war_end_timestamp')
-            status = 'completed' if s.get('completed_timestamp') else 'active'
-            
             earnings = s.get('total_earnings')
             price_hit = s.get('price_per_hit')
             results.append({
                 'session_id': str(s.get('session_id', '')),
                 'war_name': s.get('war_name', ''),
-                'status': status,
+                'status': 'completed' if s.get('completed_timestamp') else 'active',
                 'ranked_war_id': s.get('ranked_war_id'),
                 'opposing_faction_name': s.get('opposing_faction_name'),
-                'war_start_timestamp': start_dt.isoformat() if start_dt else None,
-                'war_end_timestamp': end_dt.isoformat() if end_dt else None,
+                'war_start_timestamp': s.get('war_start_timestamp'),
+                'war_end_timestamp': s.get('war_end_timestamp'),
                 'total_earnings': float(earnings) if earnings else 0.0,
                 'price_per_hit': float(price_hit) if price_hit else 0.0,
-                'created_timestamp': s.get('created_timestamp').isoformat() if s.get('created_timestamp') else None,
-                'completed_timestamp': s.get('completed_timestamp').isoformat() if s.get('completed_timestamp') else None,
+                'created_timestamp': s.get('created_timestamp'),
+                'completed_timestamp': s.get('completed_timestamp'),
                 'member_count': int(s.get('member_count', 0)) if s.get('member_count') else 0
             })
 
-        return sorted(results, key=lambda x: x['created_timestamp'] or '', reverse=True)
+        return results
 
 war_session_service = WarSessionService()
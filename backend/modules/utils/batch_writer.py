@@ -0,0 +1,140 @@
+"""Background batching writer."""
+import atexit
+import os
+import threading
+import time
+
+# Item-by-item retries of a failed batch give up after this many failures in a row
+MAX_CONSECUTIVE_FAILURES = 3
+
+
+class BatchWriter:
+    """
+    Collects items in memory and hands them to a flush function in batches.
+
+    A daemon thread flushes whenever flush_size items are pending or
+    flush_interval seconds have passed, and anything still pending is flushed
+    at interpreter exit. A failed batch is retried one item at a time, so a
+    single item the flush function rejects cannot hold back the rest. Items
+    that still fail are kept and retried on the next flush; nothing is
+    discarded. Once max_pending items are waiting, new
+    items are written synchronously on the caller's thread, so a failing
+    write raises to the caller instead of being lost.
+    """
+
+    def __init__(self, flush_fn, name, flush_size=100, flush_interval=2.0, max_pending=10000):
+        self._flush_fn = flush_fn
+        self._name = name
+        self._flush_size = max(1, flush_size)
+        self._flush_interval = flush_interval
+        self._max_pending = max(self._flush_size, max_pending)
+        self._pending = []
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        atexit.register(self.flush)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def put(self, item):
+        """
+        Queue an item for the next flush.
+
+        Raises:
+            Exception: Whatever the flush function raises, when the buffer is
+                full and the item could not be written synchronously
+        """
+        with self._condition:
+            self._ensure_thread()
+            if len(self._pending) < self._max_pending:
+                self._pending.append(item)
+                if len(self._pending) >= self._flush_size:
+                    self._condition.notify()
+                return
+
+        # The backlog is full (writes are slow or failing): write this item
+        # now so the caller sees a failure rather than a silent drop
+        self._flush_fn([item])
+
+    def flush(self):
+        """
+        Write all pending items now.
+
+        Returns:
+            int: Number of items written
+        """
+        with self._flush_lock:
+            with self._condition:
+                batch, self._pending = self._pending, []
+
+            if not batch:
+                return 0
+
+            try:
+                self._flush_fn(batch)
+                return len(batch)
+            except Exception as e:
+                if len(batch) > 1:
+                    print(f"[{self._name}] ⚠ Failed to flush {len(batch)} entries, retrying one at a time: {e}")
+                    failed = self._flush_each(batch)
+                else:
+                    failed = batch
+
+                if failed:
+                    print(f"[{self._name}] ✗ Failed to flush {len(failed)} entries: {e}")
+                    with self._condition:
+                        self._pending = failed + self._pending
+                return len(batch) - len(failed)
+
+    def _flush_each(self, batch):
+        """
+        Write a batch item by item.
+
+        Stops after MAX_CONSECUTIVE_FAILURES failures in a row (the target is
+        most likely down rather than rejecting individual items).
+
+        Returns:
+            list: Items not written, in their original order
+        """
+        failed = []
+        consecutive_failures = 0
+        for index, item in enumerate(batch):
+            if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                return failed + batch[index:]
+            try:
+                self._flush_fn([item])
+                consecutive_failures = 0
+            except Exception:
+                failed.append(item)
+                consecutive_failures += 1
+        return failed
+
+    def pending(self):
+        """Number of items waiting to be flushed."""
+        with self._condition:
+            return len(self._pending)
+
+    def _ensure_thread(self):
+        """Start the flusher thread on first use. Caller holds the condition."""
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(target=self._run, name=f"{self._name}-flusher", daemon=True)
+        self._thread.start()
+
+    def _reset_after_fork(self):
+        """Forked children start empty; the parent flushes what it had queued."""
+        self._pending = []
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+
+    def _run(self):
+        """Flusher loop."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: len(self._pending) >= self._flush_size,
+                                         timeout=self._flush_interval)
+            if not self.flush() and self.pending():
+                # Flush failed; back off instead of retrying in a tight loop
+                time.sleep(self._flush_interval)
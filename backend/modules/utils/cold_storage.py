@@ -0,0 +1,122 @@
+"""Compressed, append-only JSONL segment files."""
+import gzip
+import io
+import json
+import os
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+EXTENSIONS = {
+    'gzip': '.jsonl.gz',
+    'zstd': '.jsonl.zst'
+}
+
+
+def _encode(value):
+    """JSON encoder fallback for database values."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _compression_for(path):
+    """Detect a segment's codec from its file name."""
+    return 'zstd' if path.endswith(EXTENSIONS['zstd']) else 'gzip'
+
+
+def _open(source, mode, compression):
+    """Open a segment path or binary file object for reading or writing with the given codec."""
+    if compression == 'zstd':
+        # Optional dependency, only needed for zstd segments
+        import zstandard
+        raw = open(source, mode) if isinstance(source, str) else source
+        if mode == 'rb':
+            return zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        return zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=True)
+    return gzip.open(source, mode, compresslevel=9)
+
+
+def write_segment(directory, prefix, batches, compression='gzip'):
+    """
+    Write rows to a new compressed JSONL segment.
+
+    The file is written under a temporary name, synced and then renamed,
+    so a segment either exists completely or not at all. Existing segments
+    are never modified.
+
+    Args:
+        directory: Segment directory (created if missing)
+        prefix: File name prefix
+        batches: Iterable of row dict lists
+        compression: 'gzip' or 'zstd'
+
+    Returns:
+        dict: path, row_count, min/max of the 'timestamp' field and the set
+              of 'action_type' values, or None if there were no rows
+    """
+    os.makedirs(directory, exist_ok=True)
+    filename = f"{prefix}_{uuid.uuid4().hex[:12]}{EXTENSIONS[compression]}"
+    path = os.path.join(directory, filename)
+    temp_path = path + '.tmp'
+
+    row_count = 0
+    min_timestamp = max_timestamp = None
+    action_types = set()
+
+    with _open(temp_path, 'wb', compression) as handle:
+        for batch in batches:
+            for row in batch:
+                handle.write((json.dumps(row, default=_encode) + '\n').encode('utf-8'))
+                row_count += 1
+                timestamp = row.get('timestamp')
+                if timestamp is not None:
+                    min_timestamp = timestamp if min_timestamp is None else min(min_timestamp, timestamp)
+                    max_timestamp = timestamp if max_timestamp is None else max(max_timestamp, timestamp)
+                if row.get('action_type'):
+                    action_types.add(row['action_type'])
+
+    if not row_count:
+        os.remove(temp_path)
+        return None
+
+    with open(temp_path, 'rb') as synced:
+        os.fsync(synced.fileno())
+    os.replace(temp_path, path)
+
+    return {
+        'path': path,
+        'row_count': row_count,
+        'size_bytes': os.path.getsize(path),
+        'min_timestamp': min_timestamp,
+        'max_timestamp': max_timestamp,
+        'action_types': sorted(action_types)
+    }
+
+
+def read_segment(path, data=None):
+    """
+    Read rows back from a segment.
+
+    Args:
+        path: Segment file path, or its name when data is given
+        data: Segment contents stored elsewhere (e.g. in the database)
+
+    Yields:
+        dict: Rows with timestamp fields parsed back to datetimes
+    """
+    source = io.BytesIO(data) if data is not None else path
+    with _open(source, 'rb', _compression_for(path)) as handle:
+        for line in io.TextIOWrapper(handle, encoding='utf-8'):
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            for field in ('timestamp', 'archived_at'):
+                if row.get(field):
+                    row[field] = datetime.fromisoformat(row[field])
+            if row.get('retention_date'):
+                row['retention_date'] = date.fromisoformat(row['retention_date'])
+            yield row
@@ -0,0 +1,45 @@
+"""Gzip compression of large responses."""
+import gzip
+from flask import request
+from config.settings import config
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'text/csv',
+    'text/html',
+    'text/plain'
+}
+
+
+def init_compression(app):
+    """
+    Gzip buffered responses of at least COMPRESS_MIN_BYTES for clients that
+    accept it. Streamed responses (SSE, ZIP and PDF downloads) are left alone.
+
+    Args:
+        app: Flask application
+    """
+    if not config.COMPRESS_RESPONSES:
+        return
+
+    @app.after_request
+    def compress_response(response):
+        if (response.status_code != 200
+                or response.direct_passthrough
+                or response.is_streamed
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES
+                or 'Content-Encoding' in response.headers):
+            return response
+
+        # Whether or not this one is compressed, the body depends on the header
+        response.vary.add('Accept-Encoding')
+        if request.accept_encodings.quality('gzip') <= 0:
+            return response
+
+        data = response.get_data()
+        if len(data) < config.COMPRESS_MIN_BYTES:
+            return response
+
+        response.set_data(gzip.compress(data, compresslevel=config.COMPRESS_LEVEL, mtime=0))
+        response.headers['Content-Encoding'] = 'gzip'
+        return response
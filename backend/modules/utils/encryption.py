@@ -1,5 +1,4 @@
 """Encryption utilities for sensitive data."""
-from cryptography.fernet import Fernet
 import base64
 from config.settings import config
 
@@ -12,8 +11,10 @@ class EncryptionService:
     
     @property
     def cipher(self):
-        """Lazy-load the encryption cipher."""
+        """Lazy-load the encryption cipher (and cryptography with it)."""
         if self._cipher is None:
+            from cryptography.fernet import Fernet
+            
             key = config.ENCRYPTION_MASTER_KEY
             if not key:
                 raise ValueError("ENCRYPTION_MASTER_KEY not set in environment variables")
@@ -107,6 +108,7 @@ class EncryptionService:
     @staticmethod
     def generate_key():
         """Generate a new Fernet key for encryption."""
+        from cryptography.fernet import Fernet
         return Fernet.generate_key().decode()
 
 encryption_service = EncryptionService()
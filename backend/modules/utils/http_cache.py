@@ -0,0 +1,31 @@
+"""Conditional GET helpers."""
+from flask import request, make_response
+
+CACHE_CONTROL = 'private, no-cache'
+
+
+def not_modified(etag):
+    """
+    Build a 304 response if the client already has this version.
+    
+    Args:
+        etag: Weak entity tag for the current version, or None if unknown
+        
+    Returns:
+        Response: 304 response, or None if the full response is needed
+    """
+    if etag is None or not request.if_none_match.contains_weak(etag):
+        return None
+    
+    response = make_response('', 304)
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = CACHE_CONTROL
+    return response
+
+
+def with_etag(response, etag):
+    """Tag a full response so the client can revalidate it later."""
+    if etag is not None:
+        response.set_etag(etag, weak=True)
+        response.headers['Cache-Control'] = CACHE_CONTROL
+    return response
@@ -0,0 +1,96 @@
+"""Application JSON provider.
+
+Responses are encoded with orjson when it is installed, falling back to the
+standard library otherwise. Both paths produce the same output for database
+values: datetimes and dates as ISO 8601, UUIDs as strings and Decimals as
+strings (as Flask's default provider does, so amounts keep their precision).
+"""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(value):
+    """Encode the database types orjson does not handle itself."""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if hasattr(value, '__html__'):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps_bytes(obj, indent=False):
+        """
+        Encode an object to JSON.
+
+        Args:
+            obj: Object to encode
+            indent: Pretty-print with two space indentation
+
+        Returns:
+            bytes: UTF-8 encoded JSON
+        """
+        options = _ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else _ORJSON_OPTIONS
+        try:
+            return orjson.dumps(obj, default=_default, option=options)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits, which the standard library allows
+            return json.dumps(obj, default=_default, indent=2 if indent else None,
+                              separators=None if indent else (',', ':'), ensure_ascii=False).encode()
+
+    def loads(data):
+        """Decode JSON from str or bytes."""
+        return orjson.loads(data)
+else:
+    def dumps_bytes(obj, indent=False):
+        """
+        Encode an object to JSON.
+
+        Args:
+            obj: Object to encode
+            indent: Pretty-print with two space indentation
+
+        Returns:
+            bytes: UTF-8 encoded JSON
+        """
+        return json.dumps(obj, default=_default, indent=2 if indent else None,
+                          separators=None if indent else (',', ':'), ensure_ascii=False).encode()
+
+    def loads(data):
+        """Decode JSON from str or bytes."""
+        return json.loads(data)
+
+
+def dumps(obj):
+    """Encode an object to a compact JSON string."""
+    return dumps_bytes(obj).decode()
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by dumps_bytes/loads."""
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj)
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        """Build a JSON response without decoding the encoded bytes."""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(dumps_bytes(obj, indent) + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,156 @@
+"""Cursor pagination and sparse fieldsets for list endpoints.
+
+List endpoints accept three optional query parameters:
+    fields   comma separated fields to return (default: all)
+    limit    page size, at most PAGE_SIZE_MAX (default: the whole list,
+             or PAGE_SIZE_DEFAULT when a cursor is given)
+    cursor   next_cursor of the previous page
+
+Cursors are opaque to clients: the sort key of the last row returned,
+as URL-safe base64 JSON. Models fetch one row beyond the page so the
+next cursor is only issued when more rows exist. Sort key columns must
+be NOT NULL: a row comparison with a NULL never matches. Decoded values
+are checked against the model's sort key types (int, str, UUID,
+datetime) before they reach a query.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from uuid import UUID
+from flask import request
+from config.settings import config
+from utils.json_provider import dumps_bytes
+
+
+def encode_cursor(values):
+    """Encode the sort key of a row as a cursor."""
+    return base64.urlsafe_b64encode(dumps_bytes(list(values))).decode().rstrip('=')
+
+
+def _cursor_value(value, kind):
+    """Check one decoded cursor value against its sort key type and convert it for the query."""
+    # Sort keys are NOT NULL (migration 018), so null never comes from a real
+    # page; it would make the keyset comparison match nothing
+    if kind is int:
+        # bool is an int subclass; the range is that of a BIGINT
+        if isinstance(value, int) and not isinstance(value, bool) and -2**63 <= value < 2**63:
+            return value
+    elif isinstance(value, str) and '\x00' not in value:
+        try:
+            if kind is str:
+                return value
+            if kind is UUID:
+                return str(UUID(value))
+            if kind is datetime:
+                return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    raise ValueError('Invalid cursor')
+
+
+def decode_cursor(cursor, key_types):
+    """
+    Decode a cursor back to sort key values.
+
+    Args:
+        cursor: Cursor from a previous page
+        key_types: Types of the endpoint's sort key values (int, str, UUID
+            or datetime)
+
+    Returns:
+        list: Sort key values, timestamps as datetimes
+
+    Raises:
+        ValueError: If the cursor is malformed or from a different list
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list) or len(values) != len(key_types):
+        raise ValueError('Invalid cursor')
+    return [_cursor_value(value, kind) for value, kind in zip(values, key_types)]
+
+
+def page_args(key_types):
+    """
+    Read the limit and cursor query parameters.
+
+    Args:
+        key_types: Types of the endpoint's sort key values (a model's
+            ORDER_TYPES)
+
+    Returns:
+        tuple: (limit or None for the whole list, sort key to continue after or None)
+
+    Raises:
+        ValueError: If either parameter is invalid
+    """
+    limit = request.args.get('limit')
+    cursor = request.args.get('cursor')
+
+    after = decode_cursor(cursor, key_types) if cursor else None
+
+    if limit is None:
+        return (config.PAGE_SIZE_DEFAULT if after is not None else None), after
+
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise ValueError('limit must be a number')
+    if limit < 1 or limit > config.PAGE_SIZE_MAX:
+        raise ValueError(f'limit must be between 1 and {config.PAGE_SIZE_MAX}')
+    return limit, after
+
+
+def fields_arg(allowed):
+    """
+    Read the fields query parameter.
+
+    Args:
+        allowed: Field names the endpoint can return
+
+    Returns:
+        list: Requested fields in the given order, or None for all
+
+    Raises:
+        ValueError: If an unknown field is requested
+    """
+    value = request.args.get('fields')
+    if not value:
+        return None
+
+    fields = []
+    for name in value.split(','):
+        name = name.strip()
+        if name and name not in fields:
+            fields.append(name)
+
+    unknown = [name for name in fields if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(allowed)})")
+    return fields or None
+
+
+def paginate(rows, limit, keys, fields, allowed):
+    """
+    Cut a page from rows fetched with one look-ahead row and project fields.
+
+    Args:
+        rows: Rows in sort order (up to limit + 1)
+        limit: Page size, or None if the whole list was fetched
+        keys: Row keys making up the sort key
+        fields: Requested fields, or None for all
+        allowed: All fields of the endpoint, in output order
+
+    Returns:
+        tuple: (page rows with only the requested fields, next cursor or None)
+    """
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][key] for key in keys)
+
+    names = fields or allowed
+    return [{name: row.get(name) for name in names} for row in rows], next_cursor
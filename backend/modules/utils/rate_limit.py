@@ -0,0 +1,356 @@
+"""Rate limiter with storage shared between workers and instances.
+
+Two storages are registered with the limits library:
+
+    database://            the application's Postgres database
+                           (rate_limit_windows table, migration 012)
+    sqlite:///<abs path>   a local SQLite file, shared by the workers of one
+                           host without any external service
+
+Both implement fixed windows and the sliding window counter strategy. A
+sliding window hit checks the weighted count of the previous and current
+windows and increments the current one atomically, so concurrent workers
+can never both take the last slot.
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+import psycopg2
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
+from limits.storage import Storage
+from limits.storage.base import SlidingWindowCounterSupport
+from config.settings import config
+
+# window_id used for fixed window counters
+FIXED_WINDOW = -1
+
+# Seconds between opportunistic deletes of expired windows, per process
+CLEANUP_INTERVAL_SECONDS = 60
+
+
+def _sliding_window(expiry, now):
+    """
+    Current window id and the weight of the previous window's count.
+
+    Returns:
+        tuple: (window_id, previous window weight between 0 and 1)
+    """
+    position = now / expiry
+    window_id = int(position)
+    return window_id, 1 - (position - window_id)
+
+
+def _sliding_window_info(previous_count, current_count, expiry, now):
+    """Build the (previous count, previous ttl, current count, current ttl) tuple."""
+    window_id, weight = _sliding_window(expiry, now)
+    previous_ttl = weight * expiry if previous_count else 0.0
+    current_ttl = (window_id + 2) * expiry - now
+    return previous_count, previous_ttl, current_count, current_ttl
+
+
+class _ThreadConnections:
+    """One connection per thread, reopened after a fork or a failure."""
+
+    def __init__(self, connect):
+        self._connect = connect
+        self._local = threading.local()
+
+    def get(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = self._connect()
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def discard(self):
+        connection = getattr(self._local, 'connection', None)
+        self._local.connection = None
+        if connection is not None and self._local.pid == os.getpid():
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+
+class PostgresRateLimitStorage(Storage, SlidingWindowCounterSupport):
+    """Rate limit counters in the rate_limit_windows table."""
+
+    STORAGE_SCHEME = ['database']
+
+    def __init__(self, uri=None, wrap_exceptions=False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self._connections = _ThreadConnections(self._connect)
+        self._last_cleanup = 0.0
+
+    @staticmethod
+    def _connect():
+        # Imported here to keep the limiter importable without a database config
+        from config.database import Database
+        connection = psycopg2.connect(**Database._parse_db_url(config.POSTGRES_URL))
+        connection.autocommit = True
+        return connection
+
+    @property
+    def base_exceptions(self):
+        return psycopg2.Error
+
+    def _execute(self, query, params=None):
+        """Run one autocommitted statement and return its rows."""
+        try:
+            with self._connections.get().cursor() as cursor:
+                cursor.execute(query, params)
+                return cursor.fetchall() if cursor.description else []
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            self._connections.discard()
+            raise
+
+    def _cleanup(self, now):
+        """Delete expired windows at most once per CLEANUP_INTERVAL_SECONDS."""
+        if now - self._last_cleanup < CLEANUP_INTERVAL_SECONDS:
+            return
+        self._last_cleanup = now
+        self._execute("DELETE FROM rate_limit_windows WHERE expires_at < %s", (now,))
+
+    def incr(self, key, expiry, amount=1):
+        now = time.time()
+        rows = self._execute("""
+            INSERT INTO rate_limit_windows AS w (key, window_id, count, expires_at)
+            VALUES (%(key)s, %(window_id)s, %(amount)s, %(expires_at)s)
+            ON CONFLICT (key, window_id) DO UPDATE SET
+                count = CASE WHEN w.expires_at <= %(now)s THEN EXCLUDED.count
+                             ELSE w.count + EXCLUDED.count END,
+                expires_at = CASE WHEN w.expires_at <= %(now)s THEN EXCLUDED.expires_at
+                                  ELSE w.expires_at END
+            RETURNING count
+        """, {'key': key, 'window_id': FIXED_WINDOW, 'amount': amount,
+              'expires_at': now + expiry, 'now': now})
+        self._cleanup(now)
+        return rows[0][0]
+
+    def get(self, key):
+        rows = self._execute("""
+            SELECT count FROM rate_limit_windows
+            WHERE key = %s AND window_id = %s AND expires_at > %s
+        """, (key, FIXED_WINDOW, time.time()))
+        return rows[0][0] if rows else 0
+
+    def get_expiry(self, key):
+        now = time.time()
+        rows = self._execute("""
+            SELECT expires_at FROM rate_limit_windows
+            WHERE key = %s AND window_id = %s AND expires_at > %s
+        """, (key, FIXED_WINDOW, now))
+        return rows[0][0] if rows else now
+
+    def acquire_sliding_window_entry(self, key, limit, expiry, amount=1):
+        if amount > limit:
+            return False
+
+        now = time.time()
+        window_id, weight = _sliding_window(expiry, now)
+        # One statement: the insert only happens, and the conflicting row is
+        # only updated (under its row lock), while the weighted count stays
+        # within the limit. No row back means the hit was rejected.
+        rows = self._execute("""
+            WITH previous AS (
+                SELECT COALESCE(MAX(count), 0) AS count FROM rate_limit_windows
+                WHERE key = %(key)s AND window_id = %(previous_id)s
+            )
+            INSERT INTO rate_limit_windows AS w (key, window_id, count, expires_at)
+            SELECT %(key)s, %(window_id)s, %(amount)s, %(expires_at)s
+            FROM previous
+            WHERE floor(previous.count * %(weight)s) + %(amount)s <= %(limit)s
+            ON CONFLICT (key, window_id) DO UPDATE SET count = w.count + EXCLUDED.count
+            WHERE floor((SELECT count FROM previous) * %(weight)s + w.count) + EXCLUDED.count <= %(limit)s
+            RETURNING count
+        """, {'key': key, 'window_id': window_id, 'previous_id': window_id - 1,
+              'amount': amount, 'limit': limit, 'weight': weight,
+              'expires_at': (window_id + 2) * expiry})
+        self._cleanup(now)
+        return bool(rows)
+
+    def get_sliding_window(self, key, expiry):
+        now = time.time()
+        window_id, _ = _sliding_window(expiry, now)
+        rows = self._execute("""
+            SELECT window_id, count FROM rate_limit_windows
+            WHERE key = %s AND window_id IN (%s, %s)
+        """, (key, window_id - 1, window_id))
+        counts = dict(rows)
+        return _sliding_window_info(counts.get(window_id - 1, 0), counts.get(window_id, 0), expiry, now)
+
+    def clear_sliding_window(self, key, expiry):
+        self.clear(key)
+
+    def clear(self, key):
+        self._execute("DELETE FROM rate_limit_windows WHERE key = %s", (key,))
+
+    def reset(self):
+        rows = self._execute("WITH deleted AS (DELETE FROM rate_limit_windows RETURNING 1) "
+                             "SELECT COUNT(*) FROM deleted")
+        return rows[0][0]
+
+    def check(self):
+        try:
+            self._execute("SELECT 1")
+            return True
+        except psycopg2.Error:
+            return False
+
+
+class SQLiteRateLimitStorage(Storage, SlidingWindowCounterSupport):
+    """
+    Rate limit counters in a local SQLite file.
+
+    Every operation runs in a BEGIN IMMEDIATE transaction, which holds the
+    database's write lock, so read-check-increment is atomic across all
+    processes using the file.
+    """
+
+    STORAGE_SCHEME = ['sqlite']
+
+    def __init__(self, uri=None, wrap_exceptions=False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        path = (uri or '').split('://', 1)[-1]
+        if not path:
+            raise ValueError("sqlite rate limit storage needs a path, e.g. sqlite:///tmp/rate_limits.db")
+        self._path = path
+        self._connections = _ThreadConnections(self._connect)
+        self._last_cleanup = 0.0
+
+    def _connect(self):
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self._path, timeout=5, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS rate_limit_windows (
+                key TEXT NOT NULL,
+                window_id INTEGER NOT NULL,
+                count INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (key, window_id)
+            )
+        """)
+        return connection
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _transaction(self, operation):
+        """Run operation(connection, now) inside an immediate transaction."""
+        connection = self._connections.get()
+        now = time.time()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                result = operation(connection, now)
+                if now - self._last_cleanup >= CLEANUP_INTERVAL_SECONDS:
+                    self._last_cleanup = now
+                    connection.execute("DELETE FROM rate_limit_windows WHERE expires_at < ?", (now,))
+                connection.execute("COMMIT")
+                return result
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        except sqlite3.OperationalError:
+            self._connections.discard()
+            raise
+
+    @staticmethod
+    def _count(connection, key, window_id, now):
+        row = connection.execute("""
+            SELECT count FROM rate_limit_windows
+            WHERE key = ? AND window_id = ? AND expires_at > ?
+        """, (key, window_id, now)).fetchone()
+        return row[0] if row else 0
+
+    def incr(self, key, expiry, amount=1):
+        def operation(connection, now):
+            count = self._count(connection, key, FIXED_WINDOW, now)
+            if count:
+                connection.execute("""
+                    UPDATE rate_limit_windows SET count = count + ?
+                    WHERE key = ? AND window_id = ?
+                """, (amount, key, FIXED_WINDOW))
+            else:
+                connection.execute("""
+                    INSERT OR REPLACE INTO rate_limit_windows (key, window_id, count, expires_at)
+                    VALUES (?, ?, ?, ?)
+                """, (key, FIXED_WINDOW, amount, now + expiry))
+            return count + amount
+        return self._transaction(operation)
+
+    def get(self, key):
+        return self._transaction(lambda connection, now: self._count(connection, key, FIXED_WINDOW, now))
+
+    def get_expiry(self, key):
+        def operation(connection, now):
+            row = connection.execute("""
+                SELECT expires_at FROM rate_limit_windows
+                WHERE key = ? AND window_id = ? AND expires_at > ?
+            """, (key, FIXED_WINDOW, now)).fetchone()
+            return row[0] if row else now
+        return self._transaction(operation)
+
+    def acquire_sliding_window_entry(self, key, limit, expiry, amount=1):
+        if amount > limit:
+            return False
+
+        def operation(connection, now):
+            window_id, weight = _sliding_window(expiry, now)
+            previous = self._count(connection, key, window_id - 1, now)
+            current = self._count(connection, key, window_id, now)
+            if math.floor(previous * weight + current) + amount > limit:
+                return False
+            connection.execute("""
+                INSERT INTO rate_limit_windows (key, window_id, count, expires_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (key, window_id) DO UPDATE SET count = count + excluded.count
+            """, (key, window_id, amount, (window_id + 2) * expiry))
+            return True
+        return self._transaction(operation)
+
+    def get_sliding_window(self, key, expiry):
+        def operation(connection, now):
+            window_id, _ = _sliding_window(expiry, now)
+            return _sliding_window_info(self._count(connection, key, window_id - 1, now),
+                                        self._count(connection, key, window_id, now),
+                                        expiry, now)
+        return self._transaction(operation)
+
+    def clear_sliding_window(self, key, expiry):
+        self.clear(key)
+
+    def clear(self, key):
+        self._transaction(lambda connection, now: connection.execute(
+            "DELETE FROM rate_limit_windows WHERE key = ?", (key,)))
+
+    def reset(self):
+        return self._transaction(lambda connection, now: connection.execute(
+            "DELETE FROM rate_limit_windows").rowcount)
+
+    def check(self):
+        try:
+            self._connections.get().execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+
+# Shared limiter; bound to the app in create_app. If the storage becomes
+# unreachable, requests fall back to per-process in-memory counting until
+# it recovers.
+limiter = Limiter(
+    key_func=get_remote_address,
+    default_limits=["1000 per day", "200 per hour"],
+    storage_uri=config.RATE_LIMIT_STORAGE_URI,
+    strategy=config.RATE_LIMIT_STRATEGY,
+    in_memory_fallback_enabled=True
+)
@@ -0,0 +1,51 @@
+"""Streaming ZIP archive writer."""
+import zipfile
+
+
+class ChunkBuffer:
+    """Write-only file object that hands written bytes back to the caller."""
+    
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+    
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self):
+        return self._position
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        self.closed = True
+    
+    def drain(self):
+        """Return everything written since the last drain."""
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_zip(entries, compression=zipfile.ZIP_DEFLATED):
+    """
+    Build a ZIP archive incrementally.
+    
+    Args:
+        entries: Iterable of (filename, bytes) pairs
+        compression: zipfile compression method
+        
+    Yields:
+        bytes: Archive chunks, one per entry plus the central directory. Only
+               the entry currently being written is held in memory.
+    """
+    buffer = ChunkBuffer()
+    with zipfile.ZipFile(buffer, mode='w', compression=compression) as archive:
+        for filename, data in entries:
+            archive.writestr(filename, data)
+            yield buffer.drain()
+    yield buffer.drain()
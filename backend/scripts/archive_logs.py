@@ -1,27 +1,36 @@
 """Cron job script for archiving old audit logs."""
 import sys
 import os
+import argparse
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Add the backend directory and modules package to the path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+sys.path.insert(0, os.path.join(backend_dir, 'modules'))
 
-from app.models.models import AuditLog
+from modules.models.models import AuditLog
 from datetime import datetime
 
-def run_archival():
+def run_archival(mode=None, batch_size=None, sleep_seconds=None, max_batches=None, tier=True):
     """Run the audit log archival process."""
     try:
         print(f"[{datetime.now().isoformat()}] Starting audit log archival...")
         
-        count = AuditLog.archive_old_logs()
+        count = AuditLog.archive_old_logs(mode, batch_size, sleep_seconds, max_batches)
         
         print(f"[{datetime.now().isoformat()}] Successfully archived {count} audit log entries")
         
+        # Move old archived months to compressed cold-storage segments
+        tiered = AuditLog.tier_archived_logs() if tier else 0
+        if tier:
+            print(f"[{datetime.now().isoformat()}] Moved {tiered} archived entries to cold storage")
+        
         # Log the archival itself
         AuditLog.create(
             action_type='AUTOMATED_ARCHIVAL',
             user_torn_id=0,  # System user
-            details=f"Automated archival: {count} entries archived"
+            details=f"Automated archival: {count} entries archived, {tiered} moved to cold storage",
+            durable=True
         )
         
         return count
@@ -31,8 +40,17 @@ def run_archival():
         raise e
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Archive audit logs past their retention date.')
+    parser.add_argument('--mode', choices=['partition', 'batched'],
+                        help='Move whole expired months or expired rows in chunks (default ARCHIVE_MODE)')
+    parser.add_argument('--batch-size', type=int, help='Rows moved per committed chunk')
+    parser.add_argument('--sleep', type=float, dest='sleep_seconds', help='Seconds to pause between chunks')
+    parser.add_argument('--max-batches', type=int, help='Stop after this many chunks (rerun to continue)')
+    parser.add_argument('--no-tier', action='store_true', help='Skip moving old archived months to cold storage')
+    args = parser.parse_args()
+    
     try:
-        archived_count = run_archival()
+        archived_count = run_archival(args.mode, args.batch_size, args.sleep_seconds, args.max_batches, not args.no_tier)
         print(f"Archival completed: {archived_count} records archived")
         sys.exit(0)
     except Exception as e:
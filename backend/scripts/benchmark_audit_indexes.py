@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Benchmark audit log queries before and after the composite indexes.
+
+Builds a synthetic audit log (1,000,000 rows by default) in a scratch
+schema of the configured POSTGRES_URL database, runs the filter shapes of
+the /audit and /archive searches (session, action type, user, and
+combinations) with EXPLAIN ANALYZE using only the original
+indexes, then adds the migration 010 indexes and runs them again. The
+scratch schema is dropped afterwards unless --keep is given.
+
+Usage:
+    python scripts/benchmark_audit_indexes.py [--rows N] [--keep]
+"""
+import sys
+import os
+import argparse
+import json
+
+# Add the backend directory and modules package to the path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+sys.path.insert(0, os.path.join(backend_dir, 'modules'))
+
+from config.database import db
+
+SCHEMA = 'audit_index_benchmark'
+
+ACTION_TYPES = [
+    'USER_LOGIN', 'USER_LOGOUT', 'TORN_API_FETCH', 'MEMBERS_REFRESHED', 'BONUS_ADDED',
+    'BONUS_UPDATED', 'BONUS_DELETED', 'PAYMENT_CREATED', 'PAYMENT_UPDATED', 'PAYMENT_DELETED',
+    'PAYOUT_CALCULATED', 'WAR_CREATED', 'WAR_COMPLETED', 'PDF_EXPORTED', 'DATA_EXPORTED'
+]
+
+QUERIES = [
+    ('session timeline', """
+        SELECT * FROM {schema}.audit_logs
+        WHERE war_session_id = (SELECT war_session_id FROM {schema}.audit_logs WHERE log_id = 4242)
+        ORDER BY timestamp DESC LIMIT 100
+    """),
+    ('action type, last 30 days', """
+        SELECT * FROM {schema}.audit_logs
+        WHERE action_type = 'PAYOUT_CALCULATED' AND timestamp >= now() - INTERVAL '30 days'
+        ORDER BY timestamp DESC LIMIT 100
+    """),
+    ('user activity', """
+        SELECT * FROM {schema}.audit_logs
+        WHERE user_torn_id = 1000017
+        ORDER BY timestamp DESC LIMIT 100
+    """),
+    ('user, last 30 days', """
+        SELECT * FROM {schema}.audit_logs
+        WHERE timestamp >= now() - INTERVAL '30 days' AND user_torn_id = 1000017
+        ORDER BY timestamp DESC LIMIT 100
+    """),
+    ('session + action type', """
+        SELECT * FROM {schema}.audit_logs
+        WHERE action_type = 'BONUS_ADDED'
+          AND war_session_id = (SELECT war_session_id FROM {schema}.audit_logs WHERE log_id = 4242)
+        ORDER BY timestamp DESC LIMIT 100
+    """)
+]
+
+NEW_INDEXES = [
+    "CREATE INDEX ON {schema}.audit_logs(war_session_id, timestamp DESC)",
+    "CREATE INDEX ON {schema}.audit_logs(action_type, timestamp DESC)",
+    "CREATE INDEX ON {schema}.audit_logs(user_torn_id, timestamp DESC)"
+]
+
+
+def build_table(cursor, rows):
+    """Create the scratch table with the original indexes and fill it."""
+    cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    cursor.execute(f"CREATE SCHEMA {SCHEMA}")
+    cursor.execute(f"""
+        CREATE UNLOGGED TABLE {SCHEMA}.audit_logs (
+            log_id INTEGER PRIMARY KEY,
+            action_type VARCHAR(100) NOT NULL,
+            encrypted_old_value TEXT,
+            encrypted_new_value TEXT,
+            encrypted_details TEXT,
+            user_torn_id INTEGER,
+            war_session_id UUID,
+            timestamp TIMESTAMP WITH TIME ZONE NOT NULL,
+            retention_date DATE NOT NULL
+        )
+    """)
+    # 2,000 wars, 60 users, one year of activity, ~200 byte ciphertext-sized details
+    cursor.execute(f"""
+        INSERT INTO {SCHEMA}.audit_logs
+        SELECT g,
+               (%s::text[])[1 + (hashint4(g) & 2147483647) %% %s],
+               NULL, NULL,
+               repeat(md5(g::text), 6),
+               1000000 + (hashint4(g + 7) & 2147483647) %% 60,
+               md5('war' || ((hashint4(g + 13) & 2147483647) %% 2000)::text)::uuid,
+               now() - (g::float8 / %s) * INTERVAL '365 days',
+               (now() - (g::float8 / %s) * INTERVAL '365 days')::date + 30
+        FROM generate_series(1, %s) AS g
+    """, (ACTION_TYPES, len(ACTION_TYPES), rows, rows, rows))
+    cursor.execute(f"CREATE INDEX ON {SCHEMA}.audit_logs(timestamp)")
+    cursor.execute(f"CREATE INDEX ON {SCHEMA}.audit_logs(retention_date)")
+    cursor.execute(f"CREATE INDEX ON {SCHEMA}.audit_logs(user_torn_id)")
+    cursor.execute(f"ANALYZE {SCHEMA}.audit_logs")
+
+
+def scan_nodes(plan):
+    """Collect the scan node descriptions of a JSON plan."""
+    nodes = []
+    if 'Scan' in plan['Node Type']:
+        target = plan.get('Index Name') or plan.get('Relation Name', '')
+        nodes.append(f"{plan['Node Type']} ({target})")
+    for child in plan.get('Plans', []):
+        nodes.extend(scan_nodes(child))
+    return nodes
+
+
+def run_queries(cursor, label):
+    """EXPLAIN ANALYZE each query and print the scans used and the timing."""
+    for name, query in QUERIES:
+        cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + query.format(schema=SCHEMA))
+        result = cursor.fetchone()
+        explain = list(result.values())[0] if isinstance(result, dict) else result[0]
+        if isinstance(explain, str):
+            explain = json.loads(explain)
+        plan = explain[0]
+        scans = ', '.join(scan_nodes(plan['Plan']))
+        print(f"{label:>8} | {name:<26} | {plan['Execution Time']:>9.2f} ms | {scans}")
+
+
+def main(rows, keep):
+    """Run the benchmark."""
+    with db.get_cursor() as cursor:
+        print(f"Building {rows:,} synthetic audit log rows in schema {SCHEMA}...")
+        build_table(cursor, rows)
+
+    try:
+        with db.get_cursor() as cursor:
+            print(f"{'indexes':>8} | {'query':<26} | {'time':>12} | scans")
+            run_queries(cursor, 'before')
+            for statement in NEW_INDEXES:
+                cursor.execute(statement.format(schema=SCHEMA))
+            cursor.execute(f"ANALYZE {SCHEMA}.audit_logs")
+            run_queries(cursor, 'after')
+    finally:
+        if not keep:
+            with db.get_cursor() as cursor:
+                cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark audit log indexes on synthetic data.')
+    parser.add_argument('--rows', type=int, default=1000000, help='Synthetic rows to generate')
+    parser.add_argument('--keep', action='store_true', help='Keep the scratch schema afterwards')
+    args = parser.parse_args()
+    main(args.rows, args.keep)
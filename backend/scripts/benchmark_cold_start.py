@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""Benchmark cold-start import time of the backend entry points.
+
+Imports each entry point (api.py, wsgi.py, run_app.py) in a fresh
+interpreter, the way a serverless cold start does, and reports:
+
+    import ms    time to import the module (which builds the app)
+    /health ms   time of the first request after that
+    heavy        heavy dependencies already loaded after the first request
+
+Interpreter start-up itself is not included. One untimed run per entry
+point writes the bytecode caches first (as a deployed function has them),
+even if PYTHONDONTWRITEBYTECODE is set. No database is needed.
+
+Usage:
+    python scripts/benchmark_cold_start.py [--runs N]
+"""
+import sys
+import os
+import argparse
+import json
+import statistics
+import subprocess
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = [
+    ('api.py', 'api', 'app'),
+    ('wsgi.py', 'wsgi', 'application'),
+    ('run_app.py', 'run_app', 'app')
+]
+
+HEAVY_MODULES = ['reportlab', 'requests', 'cryptography', 'psycopg2', 'jwt', 'orjson']
+
+# Runs in the child interpreter: import the entry point, then serve /health once
+PROBE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+module = importlib.import_module({module!r})
+imported = time.perf_counter()
+app = getattr(module, {attribute!r}, None) or getattr(sys.modules.get('api'), 'app')
+response = app.test_client().get('/health')
+served = time.perf_counter()
+print(json.dumps({{
+    'import_ms': (imported - start) * 1000,
+    'health_ms': (served - imported) * 1000,
+    'status': response.status_code,
+    'heavy': [name for name in {heavy!r} if name in sys.modules]
+}}))
+"""
+
+
+def measure(module, attribute, write_bytecode=False):
+    """Import one entry point in a fresh interpreter and return its timings."""
+    env = dict(os.environ)
+    if write_bytecode:
+        env.pop('PYTHONDONTWRITEBYTECODE', None)
+    env.setdefault('JWT_SECRET', 'benchmark-secret')
+    env.setdefault('RATE_LIMIT_STORAGE_URI', 'memory://')
+    env.setdefault('SESSION_STORE', 'memory')
+    code = PROBE.format(module=module, attribute=attribute, heavy=HEAVY_MODULES)
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=backend_dir, env=env,
+        capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(runs):
+    """Run the benchmark."""
+    print(f"{runs} cold starts per entry point, {sys.executable}")
+    print(f"{'entry point':>12} {'import ms':>10} {'/health ms':>11}  heavy modules loaded")
+    for filename, module, attribute in ENTRY_POINTS:
+        measure(module, attribute, write_bytecode=True)
+        samples = [measure(module, attribute) for _ in range(runs)]
+        import_ms = statistics.median(s['import_ms'] for s in samples)
+        health_ms = statistics.median(s['health_ms'] for s in samples)
+        heavy = ', '.join(samples[-1]['heavy']) or '-'
+        print(f"{filename:>12} {import_ms:>10.1f} {health_ms:>11.1f}  {heavy}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark cold-start import time of the entry points.')
+    parser.add_argument('--runs', type=int, default=7, help='Fresh interpreters per entry point')
+    args = parser.parse_args()
+    main(args.runs)
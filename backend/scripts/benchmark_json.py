@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Benchmark GET /war/<id> serialization for a large war session.
+
+Builds the application, replaces the war session and member models with
+in-memory stand-ins holding one synthetic session (1,000 members by
+default, with datetimes and Decimal amounts as psycopg2 returns them) and
+times full requests through the Flask test client with:
+
+    default        Flask's built-in JSON provider, no compression
+    fast           the orjson provider, no compression
+    fast + gzip    the orjson provider, Accept-Encoding: gzip
+
+Encoding time alone (provider dumps of the service result) is reported
+as well. The in-memory session store is used, so no database is needed.
+
+Usage:
+    python scripts/benchmark_json.py [--members N] [--iterations N]
+"""
+import sys
+import os
+import argparse
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+# Add the backend directory and modules package to the path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+sys.path.insert(0, os.path.join(backend_dir, 'modules'))
+
+os.environ.setdefault('JWT_SECRET', 'benchmark-secret')
+os.environ['SESSION_STORE'] = 'memory'
+os.environ['RATE_LIMIT_STORAGE_URI'] = 'memory://'
+os.environ['FLASK_ENV'] = 'production'
+
+from flask.json.provider import DefaultJSONProvider
+from config.settings import config
+from application import create_app
+from modules.models import models
+from modules.services import auth
+from modules.services.war_session import war_session_service
+from utils.json_provider import FastJSONProvider, orjson
+
+SESSION_ID = str(uuid.UUID(int=42))
+
+
+def use_in_memory_models(member_count):
+    """Serve one synthetic war session from memory."""
+    started = datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc)
+    war = {
+        'session_id': uuid.UUID(SESSION_ID),
+        'war_name': 'Benchmark war',
+        'faction_id': 4242,
+        'ranked_war_id': 31337,
+        'opposing_faction_name': 'Opponents',
+        'war_start_timestamp': started,
+        'war_end_timestamp': started + timedelta(days=2),
+        'total_earnings': Decimal('1250000000.00'),
+        'price_per_hit': Decimal('1500000.00'),
+        'created_timestamp': started - timedelta(hours=1),
+        'completed_timestamp': None,
+        'version': 7
+    }
+    members = [{
+        'member_id': uuid.UUID(int=1000 + i),
+        'torn_id': 2000000 + i,
+        'name': f'Member{i:05d}',
+        'hit_count': (i * 37) % 250,
+        'score': (i * 53) % 1000,
+        'bonus_amount': Decimal(f'{(i % 7) * 250000}.00'),
+        'bonus_reason': 'Chain saver' if i % 7 else None,
+        'member_status': 'active'
+    } for i in range(member_count)]
+
+    models.WarSession.get_version = staticmethod(lambda session_id: war['version'])
+    models.WarSession.get_by_id = staticmethod(lambda session_id: dict(war))
+    models.Member.get_by_session = staticmethod(lambda session_id: [dict(m) for m in members])
+
+
+def time_requests(client, headers, iterations):
+    """Return per-request wall times in milliseconds and the body size."""
+    timings = []
+    size = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        response = client.get(f'/war/{SESSION_ID}', headers=headers)
+        size = len(response.get_data())
+        timings.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET /war/{SESSION_ID} returned {response.status_code}")
+    return timings, size
+
+
+def time_encoding(provider, result, iterations):
+    """Return the median time to encode the service result in milliseconds."""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        provider.dumps(result)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main(member_count, iterations):
+    """Run the benchmark."""
+    config.JWT_SECRET = config.JWT_SECRET or 'benchmark-secret'
+    config.COMPRESS_RESPONSES = True
+    app = create_app()
+    app.config['RATELIMIT_ENABLED'] = False
+    from utils.rate_limit import limiter
+    limiter.enabled = False
+
+    use_in_memory_models(member_count)
+    token = auth.AuthService.generate_access_token(1, 4242)
+    auth.session_store.create(1, 4242, None)
+    headers = {'Authorization': f'Bearer {token}'}
+
+    default_provider = DefaultJSONProvider(app)
+    fast_provider = FastJSONProvider(app)
+    configurations = [
+        ('default', default_provider, {'Accept-Encoding': 'identity'}),
+        ('fast', fast_provider, {'Accept-Encoding': 'identity'}),
+        ('fast + gzip', fast_provider, {'Accept-Encoding': 'gzip'})
+    ]
+
+    with app.app_context():
+        result = war_session_service.get_war_details(SESSION_ID)
+
+    encoder = 'orjson' if orjson is not None else 'stdlib json (orjson not installed)'
+    print(f"{member_count:,} members, {iterations} requests each, fast provider uses {encoder}")
+    print(f"{'configuration':>13} {'encode ms':>10} {'median ms':>10} {'p95 ms':>8} {'bytes':>9}")
+    client = app.test_client()
+    for label, provider, extra_headers in configurations:
+        app.json = provider
+        with app.app_context():
+            encode_ms = time_encoding(provider, result, iterations)
+        time_requests(client, {**headers, **extra_headers}, 3)  # warm up
+        timings, size = time_requests(client, {**headers, **extra_headers}, iterations)
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        print(f"{label:>13} {encode_ms:>10.2f} {statistics.median(timings):>10.2f} {p95:>8.2f} {size:>9,}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark GET /war/<id> JSON encoding and compression.')
+    parser.add_argument('--members', type=int, default=1000, help='Members in the synthetic session')
+    parser.add_argument('--iterations', type=int, default=50, help='Requests per configuration')
+    args = parser.parse_args()
+    main(args.members, args.iterations)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""Benchmark login latency against a local Torn API stand-in.
+
+Starts an HTTP server that answers /user like Torn after a configurable
+delay, points the Torn API service at it and times AuthService.login for
+an existing user:
+
+    sequential   key validation, then the password hash check
+    concurrent   validation running alongside the password hash check
+    cached       re-login with the validation result already cached
+
+The admin user, faction config and audit log models are replaced by
+in-memory stand-ins and the in-memory session store is used, so no
+database is needed.
+
+Usage:
+    python scripts/benchmark_login.py [--iterations N] [--torn-latency MS]
+"""
+import sys
+import os
+import argparse
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add the backend directory and modules package to the path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+sys.path.insert(0, os.path.join(backend_dir, 'modules'))
+
+os.environ.setdefault('JWT_SECRET', 'benchmark-secret')
+os.environ['SESSION_STORE'] = 'memory'
+
+from werkzeug.security import generate_password_hash
+from config.settings import config
+from modules.services import auth
+from modules.services.torn_api import torn_api_service
+
+USERNAME = 'Benchmarker'
+PASSWORD = 'correct horse battery staple'
+API_KEY = 'benchmarkkey0000'
+
+
+class TornStandIn(BaseHTTPRequestHandler):
+    """Answers /user?key=... with a fixed profile after a delay."""
+
+    latency = 0.25
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        body = json.dumps({
+            'profile': {'id': 1000001, 'name': USERNAME, 'faction_id': 4242}
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class InlineExecutor:
+    """Runs submitted work immediately, reproducing the sequential login."""
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+def use_in_memory_models():
+    """Replace the database-backed models used by login."""
+    admin = {
+        'torn_id': 1000001,
+        'username': USERNAME,
+        'password_hash': generate_password_hash(PASSWORD),
+        'password_changed': True
+    }
+    auth.AdminUser.get_by_username = staticmethod(lambda username: dict(admin))
+    auth.FactionConfig.create = staticmethod(lambda **kwargs: None)
+    auth.AuditLog.create = staticmethod(lambda **kwargs: None)
+
+
+def time_logins(iterations, clear_cache):
+    """Return per-login wall times in milliseconds."""
+    timings = []
+    for _ in range(iterations):
+        if clear_cache:
+            torn_api_service.clear_validation_cache()
+        start = time.perf_counter()
+        result, error = auth.AuthService.login(USERNAME, PASSWORD, API_KEY)
+        timings.append((time.perf_counter() - start) * 1000)
+        if error:
+            raise RuntimeError(error)
+    return timings
+
+
+def main(iterations, latency_ms):
+    """Run the benchmark."""
+    config.JWT_SECRET = config.JWT_SECRET or 'benchmark-secret'
+    TornStandIn.latency = latency_ms / 1000
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), TornStandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    torn_api_service.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    use_in_memory_models()
+
+    concurrent_executor = auth.login_executor
+    configurations = [
+        ('sequential', InlineExecutor(), True),
+        ('concurrent', concurrent_executor, True),
+        ('cached', concurrent_executor, False)
+    ]
+
+    try:
+        print(f"Torn stand-in latency {latency_ms} ms, {iterations} logins each")
+        print(f"{'configuration':>13} {'median ms':>10} {'p95 ms':>8}")
+        for label, executor, clear_cache in configurations:
+            auth.login_executor = executor
+            timings = sorted(time_logins(iterations, clear_cache))
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            print(f"{label:>13} {statistics.median(timings):>10.1f} {p95:>8.1f}")
+    finally:
+        auth.login_executor = concurrent_executor
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark login latency against a Torn API stand-in.')
+    parser.add_argument('--iterations', type=int, default=20, help='Logins per configuration')
+    parser.add_argument('--torn-latency', type=int, default=250, help='Stand-in response delay in ms')
+    args = parser.parse_args()
+    main(args.iterations, args.torn_latency)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Benchmark PDF report rendering time and peak memory for large wars.
+
+Renders synthetic reports (no database needed) for 100, 1k and 10k member
+rows, once with chunked repeat-header tables and once as a single table
+(the previous layout), writing to a temporary file.
+
+Usage:
+    python scripts/benchmark_pdf_report.py [rows ...]
+"""
+import sys
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+# Add the backend directory and modules package to the path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+sys.path.insert(0, os.path.join(backend_dir, 'modules'))
+
+from modules.services import pdf_report
+
+DEFAULT_ROW_COUNTS = [100, 1000, 10000]
+
+
+def build_report_data(rows):
+    """Build a synthetic war session and payout breakdown."""
+    war_session = {
+        'war_name': f'Benchmark War ({rows} members)',
+        'status': 'completed',
+        'created_timestamp': datetime(2024, 1, 1, 12, 0),
+        'completed_timestamp': datetime(2024, 1, 3, 12, 0)
+    }
+    member_payouts = []
+    for i in range(rows):
+        hits = (i * 7) % 120
+        bonus = 50000.0 if i % 10 == 0 else 0.0
+        member_payouts.append({
+            'member_id': i,
+            'torn_id': 100000 + i,
+            'name': f'Member{i:05d}',
+            'hit_count': hits,
+            'base_payout': hits * 25000.0,
+            'bonus_amount': bonus,
+            'bonus_reason': 'Top chain contributor' if bonus else '',
+            'total_payout': hits * 25000.0 + bonus,
+            'member_status': 'left_faction' if i % 25 == 0 else 'active'
+        })
+    other_payments = [
+        {'payment_id': i, 'amount': 1000000.0, 'description': f'Expense {i}'}
+        for i in range(max(1, rows // 50))
+    ]
+    total_members = sum(m['total_payout'] for m in member_payouts)
+    total_other = sum(p['amount'] for p in other_payments)
+    payout_data = {
+        'total_earnings': 5000000000.0,
+        'price_per_hit': 25000.0,
+        'member_payouts': member_payouts,
+        'total_member_payout': total_members,
+        'other_payments': other_payments,
+        'total_other_payments': total_other,
+        'total_paid': total_members + total_other,
+        'remaining_balance': 5000000000.0 - total_members - total_other
+    }
+    return war_session, payout_data
+
+
+def run_once(rows, chunk_rows):
+    """Render one report and return (seconds, peak MiB, output bytes)."""
+    war_session, payout_data = build_report_data(rows)
+    pdf_report.TABLE_CHUNK_ROWS = chunk_rows
+
+    with tempfile.TemporaryFile() as output:
+        tracemalloc.start()
+        start = time.perf_counter()
+        pdf_report.PDFReportService.render_war_report(war_session, payout_data, 'Benchmark', output=output)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        size = output.seek(0, os.SEEK_END)
+
+    return elapsed, peak / (1024 * 1024), size
+
+
+def main(row_counts):
+    """Print a results table for each row count and layout."""
+    chunked = pdf_report.TABLE_CHUNK_ROWS
+    run_once(10, chunked)  # warm up: ReportLab is imported on the first render
+    print(f"{'rows':>8} {'layout':>14} {'seconds':>9} {'peak MiB':>9} {'pdf KiB':>9}")
+    for rows in row_counts:
+        for label, chunk_rows in (('chunked', chunked), ('single table', rows + 1)):
+            elapsed, peak_mib, size = run_once(rows, chunk_rows)
+            print(f"{rows:>8} {label:>14} {elapsed:>9.2f} {peak_mib:>9.1f} {size / 1024:>9.0f}")
+    pdf_report.TABLE_CHUNK_ROWS = chunked
+
+
+if __name__ == '__main__':
+    counts = [int(arg) for arg in sys.argv[1:]] or DEFAULT_ROW_COUNTS
+    main(counts)
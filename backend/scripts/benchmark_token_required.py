@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Micro-benchmark the token_required decorator with and without the token cache.
+
+Calls a trivial protected view inside a Flask test request context, using
+the in-memory session store so no database is needed, and reports the
+mean time per call.
+
+Usage:
+    python scripts/benchmark_token_required.py [iterations]
+"""
+import sys
+import os
+import timeit
+
+# Add the backend directory and modules package to the path
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+sys.path.insert(0, os.path.join(backend_dir, 'modules'))
+
+os.environ.setdefault('JWT_SECRET', 'benchmark-secret')
+os.environ['SESSION_STORE'] = 'memory'
+
+from flask import Flask
+from config.settings import config
+from modules.services import auth
+
+DEFAULT_ITERATIONS = 20000
+
+
+def main(iterations):
+    """Print the per-call decorator overhead for each configuration."""
+    config.JWT_SECRET = config.JWT_SECRET or 'benchmark-secret'
+    app = Flask(__name__)
+    token = auth.AuthService.generate_access_token(1, 1)
+    auth.session_store.create(1, 1, None)
+
+    @auth.token_required
+    def view():
+        return 'ok'
+
+    def undecorated():
+        return 'ok'
+
+    headers = {'Authorization': f'Bearer {token}'}
+    with app.test_request_context('/', headers=headers):
+        baseline = timeit.timeit(undecorated, number=iterations)
+
+        results = []
+        for label, cache in (('no cache', auth.VerifiedTokenCache(0)),
+                             ('token cache', auth.VerifiedTokenCache(config.TOKEN_CACHE_SIZE))):
+            auth.verified_tokens = cache
+            view()  # warm up (fills the cache)
+            elapsed = timeit.timeit(view, number=iterations)
+            results.append((label, (elapsed - baseline) / iterations * 1e6))
+
+    print(f"{'configuration':>14} {'µs/call':>9}")
+    for label, micros in results:
+        print(f"{label:>14} {micros:>9.2f}")
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ITERATIONS
+    main(count)
@@ -0,0 +1,24 @@
+"""Backend tests.
+
+Run from the backend directory:
+
+    python -m unittest
+
+No database is needed: the tests use the in-memory session store and rate
+limit storage, and patch model calls where a route would read the database.
+Tests that need Postgres run only when TEST_DATABASE_URL points at a
+migrated scratch database; they clean up the rows they create.
+"""
+import os
+import sys
+
+os.environ.setdefault('JWT_SECRET', 'test-secret')
+os.environ['SESSION_STORE'] = 'memory'
+os.environ['RATE_LIMIT_STORAGE_URI'] = 'memory://'
+if os.getenv('TEST_DATABASE_URL'):
+    os.environ['POSTGRES_URL'] = os.environ['TEST_DATABASE_URL']
+
+# Same import paths as application.py
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, backend_dir)
+sys.path.insert(0, os.path.join(backend_dir, 'modules'))
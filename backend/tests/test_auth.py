@@ -0,0 +1,65 @@
+"""Tests for token checks on protected routes."""
+import unittest
+from application import create_app
+from modules.services.auth import auth_service, verified_tokens
+from modules.services.session_store import session_store
+
+TORN_ID = 1001
+FACTION_ID = 2002
+WAR_SESSION_ID = '6f1c2d3e-4a5b-4c6d-8e7f-9a0b1c2d3e4f'
+
+
+class TokenRequiredTest(unittest.TestCase):
+    """token_required only accepts access tokens."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = create_app().test_client()
+
+    def setUp(self):
+        verified_tokens.clear()
+        session_store.create(TORN_ID, FACTION_ID, 'api-key')
+
+    def tearDown(self):
+        session_store.delete(TORN_ID)
+
+    def get_verify(self, token):
+        return self.client.get('/auth/verify', headers={'Authorization': f'Bearer {token}'})
+
+    def test_access_token_is_accepted(self):
+        token = auth_service.generate_access_token(TORN_ID, FACTION_ID)
+
+        response = self.get_verify(token)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['user']['torn_id'], TORN_ID)
+
+    def test_stream_token_is_rejected(self):
+        token = auth_service.generate_stream_token(TORN_ID, FACTION_ID, WAR_SESSION_ID)
+
+        # Twice, so a cached payload cannot let it through either
+        for _ in range(2):
+            response = self.get_verify(token)
+            self.assertEqual(response.status_code, 401)
+            self.assertEqual(response.get_json()['error'], 'Invalid token type')
+
+    def test_refresh_token_is_rejected(self):
+        token = auth_service.generate_refresh_token(TORN_ID, FACTION_ID)
+
+        response = self.get_verify(token)
+
+        self.assertEqual(response.status_code, 401)
+
+    def test_only_access_tokens_are_cached(self):
+        stream_token = auth_service.generate_stream_token(TORN_ID, FACTION_ID, WAR_SESSION_ID)
+        access_token = auth_service.generate_access_token(TORN_ID, FACTION_ID)
+
+        self.get_verify(stream_token)
+        self.get_verify(access_token)
+
+        self.assertIsNone(verified_tokens.get(stream_token))
+        self.assertIsNotNone(verified_tokens.get(access_token))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+"""Tests for the background batching writer."""
+import unittest
+from utils.batch_writer import BatchWriter
+
+
+class FlushTarget:
+    """Flush function that rejects batches containing a poisoned item."""
+
+    def __init__(self, poisoned=(), down=False):
+        self.poisoned = set(poisoned)
+        self.down = down
+        self.written = []
+
+    def __call__(self, items):
+        if self.down or self.poisoned.intersection(items):
+            raise RuntimeError('rejected')
+        self.written.extend(items)
+
+
+class BatchWriterFlushTest(unittest.TestCase):
+    """Failed flushes keep failing items and write the rest."""
+
+    def make_writer(self, target):
+        # Large size and interval so only explicit flushes write
+        return BatchWriter(target, 'TEST', flush_size=1000, flush_interval=3600)
+
+    def test_bad_item_does_not_block_the_batch(self):
+        target = FlushTarget(poisoned={3})
+        writer = self.make_writer(target)
+        for item in range(6):
+            writer.put(item)
+
+        self.assertEqual(writer.flush(), 5)
+        self.assertEqual(target.written, [0, 1, 2, 4, 5])
+        self.assertEqual(writer.pending(), 1)
+
+        target.poisoned.clear()
+        self.assertEqual(writer.flush(), 1)
+        self.assertEqual(target.written, [0, 1, 2, 4, 5, 3])
+
+    def test_nothing_is_dropped_while_the_target_is_down(self):
+        target = FlushTarget(down=True)
+        writer = self.make_writer(target)
+        for item in range(10):
+            writer.put(item)
+
+        self.assertEqual(writer.flush(), 0)
+        self.assertEqual(writer.pending(), 10)
+
+        target.down = False
+        self.assertEqual(writer.flush(), 10)
+        self.assertEqual(target.written, list(range(10)))
+
+
+if __name__ == '__main__':
+    unittest.main()
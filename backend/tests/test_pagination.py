@@ -0,0 +1,118 @@
+"""Tests for cursor pagination."""
+import os
+import unittest
+import uuid
+from datetime import datetime, timezone
+from application import create_app
+from modules.services.auth import auth_service
+from modules.services.session_store import session_store
+from modules.models.models import WarSession
+from utils.pagination import decode_cursor, encode_cursor
+
+TORN_ID = 1001
+FACTION_ID = 2002
+
+
+class DecodeCursorTest(unittest.TestCase):
+    """Cursor values must match the endpoint's sort key types."""
+
+    def test_round_trip(self):
+        completed = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        session_id = str(uuid.uuid4())
+
+        values = decode_cursor(encode_cursor([completed, session_id]), WarSession.HISTORY_ORDER_TYPES)
+
+        self.assertEqual(values, [completed, session_id])
+
+    def test_null_values_are_rejected(self):
+        for values in ([None, str(uuid.uuid4())], ['2026-01-01T00:00:00+00:00', None]):
+            with self.assertRaises(ValueError):
+                decode_cursor(encode_cursor(values), WarSession.HISTORY_ORDER_TYPES)
+
+    def test_wrong_types_are_rejected(self):
+        for values in (['x', {}], [True, 1], ['name', 2**70], ['na\x00me', 1]):
+            with self.assertRaises(ValueError):
+                decode_cursor(encode_cursor(values), (str, int))
+
+
+class HistoryCursorTest(unittest.TestCase):
+    """Bad cursors are rejected before the database is queried."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = create_app().test_client()
+
+    def setUp(self):
+        session_store.create(TORN_ID, FACTION_ID, 'api-key')
+        token = auth_service.generate_access_token(TORN_ID, FACTION_ID)
+        self.headers = {'Authorization': f'Bearer {token}'}
+
+    def tearDown(self):
+        session_store.delete(TORN_ID)
+
+    def test_null_boundary_cursor_is_a_bad_request(self):
+        cursor = encode_cursor([None, str(uuid.uuid4())])
+
+        response = self.client.get(f'/war/history?limit=1&cursor={cursor}', headers=self.headers)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['error'], 'Invalid cursor')
+
+
+@unittest.skipUnless(os.getenv('TEST_DATABASE_URL'), 'needs TEST_DATABASE_URL')
+class HistoryPagingDatabaseTest(unittest.TestCase):
+    """Paging through history never stops at a NULL sort key."""
+
+    # Later than any real completion, so these sessions are the first page
+    COMPLETED = datetime(2100, 1, 1, tzinfo=timezone.utc)
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client = create_app().test_client()
+
+    def setUp(self):
+        from config.database import db
+        self.db = db
+        self.session_ids = sorted((str(uuid.uuid4()) for _ in range(3)), reverse=True)
+        with db.get_cursor() as cursor:
+            for index, session_id in enumerate(self.session_ids):
+                cursor.execute("""
+                    INSERT INTO war_sessions (session_id, war_name, status, completed_timestamp)
+                    VALUES (%s, %s, 'completed', %s)
+                """, (session_id, f'pagination test {index}', self.COMPLETED))
+        session_store.create(TORN_ID, FACTION_ID, 'api-key')
+        token = auth_service.generate_access_token(TORN_ID, FACTION_ID)
+        self.headers = {'Authorization': f'Bearer {token}'}
+
+    def tearDown(self):
+        session_store.delete(TORN_ID)
+        with self.db.get_cursor() as cursor:
+            cursor.execute("DELETE FROM war_sessions WHERE session_id = ANY(%s::uuid[])", (self.session_ids,))
+
+    def test_completed_sessions_need_a_completion_time(self):
+        import psycopg2
+
+        with self.assertRaises(psycopg2.IntegrityError):
+            with self.db.get_cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO war_sessions (war_name, status, completed_timestamp)
+                    VALUES ('pagination test null', 'completed', NULL)
+                """)
+
+    def test_pages_continue_past_tied_sort_keys(self):
+        seen = []
+        url = '/war/history?limit=1&fields=session_id'
+        for _ in self.session_ids:
+            response = self.client.get(url, headers=self.headers)
+            self.assertEqual(response.status_code, 200)
+            body = response.get_json()
+            seen.extend(str(s['session_id']) for s in body['sessions'])
+            self.assertIsNotNone(body['next_cursor'])
+            url = f"/war/history?limit=1&fields=session_id&cursor={body['next_cursor']}"
+
+        self.assertEqual(seen, self.session_ids)
+        self.assertEqual(self.client.get(url, headers=self.headers).status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,7 @@ from pathlib import Path
 backend_dir = Path(__file__).parent
 sys.path.insert(0, str(backend_dir))
 
-# Import from application module (not app to avoid directory conflict)
+# Import the app factory
 from application import create_app
 
 # Create the application
@@ -1,8 +1,9 @@
 """Debug script to see what get_faction_wars returns"""
 import sys
 sys.path.insert(0, 'backend')
+sys.path.insert(0, 'backend/modules')
 
-from app.services.war_session import war_session_service
+from modules.services.war_session import war_session_service
 
 # Use a test faction ID - we know from test results there's at least one war
 print("\n=== Debugging get_faction_wars ===\n")
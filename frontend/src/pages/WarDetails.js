@@ -27,10 +27,38 @@ function WarDetails() {
 
   useEffect(() => {
     fetchWarDetails();
-    fetchOtherPayments();
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [sessionId]);
 
+  // Live updates from other officers' edits and member refreshes
+  useEffect(() => {
+    const source = warService.subscribeEvents(sessionId, {
+      snapshot: (data) => {
+        setWar(data.war);
+        setMembers(data.war.members || []);
+        setOtherPayments(data.other_payments || []);
+      },
+      members: (data) => {
+        setMembers((current) => {
+          const changed = new Map(data.changed.map((m) => [m.member_id, m]));
+          const kept = current
+            .filter((m) => !data.removed.includes(m.member_id))
+            .map((m) => changed.get(m.member_id) || m);
+          const known = new Set(kept.map((m) => m.member_id));
+          return kept.concat(data.changed.filter((m) => !known.has(m.member_id)));
+        });
+      },
+      payments: (data) => setOtherPayments(data.other_payments || []),
+      totals: (data) => {
+        if (data.payouts) {
+          setPayouts((current) => (current ? data.payouts : current));
+        }
+      },
+      war: (data) => setWar((current) => (current ? { ...current, ...data.war } : current)),
+    });
+    return () => source.close();
+  }, [sessionId]);
+
   const fetchOtherPayments = async () => {
     try {
       const data = await paymentService.getPayments(sessionId);
@@ -43,9 +71,10 @@ function WarDetails() {
   const fetchWarDetails = async () => {
     try {
       setLoading(true);
-      const data = await warService.getWarDetails(sessionId);
-      setWar(data);
-      setMembers(data.members || []);
+      const data = await warService.getWorkspace(sessionId);
+      setWar(data.war);
+      setMembers(data.war.members || []);
+      setOtherPayments(data.other_payments || []);
       setError('');
     } catch (err) {
       setError('Failed to load war details');
@@ -146,6 +146,53 @@ export const warService = {
     return response.data;
   },
 
+  getWorkspace: async (sessionId) => {
+    const response = await api.get(`/war/${sessionId}/workspace`);
+    return response.data;
+  },
+
+  // Live updates (snapshot, members, payments, totals, war events). EventSource
+  // cannot send the Authorization header, so each connection uses a short-lived
+  // stream token; when a stream ends or drops, a fresh token is fetched and the
+  // stream reopened. Returns an object; call close() to stop.
+  subscribeEvents: (sessionId, handlers) => {
+    let source = null;
+    let retry = null;
+    let closed = false;
+
+    const connect = async () => {
+      try {
+        const { data } = await api.post(`/war/${sessionId}/events/token`);
+        if (closed) return;
+        source = new EventSource(
+          `${API_BASE_URL}/war/${sessionId}/events?token=${encodeURIComponent(data.token)}`
+        );
+        Object.entries(handlers).forEach(([event, handler]) => {
+          source.addEventListener(event, (e) => handler(JSON.parse(e.data)));
+        });
+        source.onerror = () => {
+          source.close();
+          if (!closed) retry = setTimeout(connect, 1000);
+        };
+      } catch (err) {
+        // Not found, not available on this deployment or not authorized:
+        // the page keeps working without live updates
+        const status = err.response?.status;
+        if (status && status !== 429 && status < 500) return;
+        if (!closed) retry = setTimeout(connect, 5000);
+      }
+    };
+
+    connect();
+    return {
+      close: () => {
+        closed = true;
+        clearTimeout(retry);
+        if (source) source.close();
+      },
+    };
+  },
+
   completeSession: async (sessionId) => {
     const response = await api.post(`/war/${sessionId}/complete`);
     return response.data;
@@ -159,6 +206,14 @@ export const warService = {
     return response.data;
   },
 
+  evaluateScenarios: async (sessionId, totalEarnings, pricePerHit) => {
+    const response = await api.post(`/war/${sessionId}/scenarios`, {
+      total_earnings: totalEarnings,
+      price_per_hit: pricePerHit,
+    });
+    return response.data;
+  },
+
   getPayouts: async (sessionId) => {
     const response = await api.get(`/war/${sessionId}/payouts`);
     return response.data;
@@ -203,6 +258,12 @@ export const memberService = {
     return response.data;
   },
 
+  setBonuses: async (bonuses) => {
+    // bonuses: [{ member_id, bonus_amount, bonus_reason }]; a 0 amount clears the bonus
+    const response = await api.post('/members/bonuses', { bonuses });
+    return response.data;
+  },
+
   deleteBonus: async (memberId) => {
     const response = await api.delete(`/members/${memberId}/bonus`);
     return response.data;
@@ -257,16 +318,103 @@ export const exportService = {
     
     return response.data;
   },
+
+  exportBulk: async ({ sessionIds, startDate, endDate, userName }) => {
+    const response = await api.post('/export/bulk', {
+      session_ids: sessionIds,
+      start_date: startDate,
+      end_date: endDate,
+      user_name: userName,
+    }, {
+      responseType: 'blob',
+    });
+    
+    const url = window.URL.createObjectURL(new Blob([response.data]));
+    const link = document.createElement('a');
+    link.href = url;
+    link.setAttribute('download', 'war_reports.zip');
+    document.body.appendChild(link);
+    link.click();
+    link.remove();
+    
+    return response.data;
+  },
+
+  exportData: async (dataset, format = 'csv', filters = {}) => {
+    const response = await api.get(`/export/data/${dataset}`, {
+      params: {
+        format,
+        session_id: filters.sessionId,
+        start_date: filters.startDate,
+        end_date: filters.endDate,
+        action_type: filters.actionType,
+        user_torn_id: filters.userTornId,
+      },
+      responseType: 'blob',
+    });
+    
+    const url = window.URL.createObjectURL(new Blob([response.data]));
+    const link = document.createElement('a');
+    link.href = url;
+    link.setAttribute('download', `${dataset}.${format}`);
+    document.body.appendChild(link);
+    link.click();
+    link.remove();
+    
+    return response.data;
+  },
+
+  queuePDFExport: async (sessionId, userName) => {
+    const response = await api.post(`/export/${sessionId}/pdf/jobs`, { user_name: userName });
+    return response.data;
+  },
+
+  getExportJob: async (jobId) => {
+    const response = await api.get(`/export/jobs/${jobId}`);
+    return response.data;
+  },
+
+  downloadExportJob: async (job) => {
+    const response = await api.get(`/export/jobs/${job.job_id}/file`, {
+      responseType: 'blob',
+    });
+    
+    const url = window.URL.createObjectURL(new Blob([response.data]));
+    const link = document.createElement('a');
+    link.href = url;
+    link.setAttribute('download', `war_report_${job.war_session_id}.pdf`);
+    document.body.appendChild(link);
+    link.click();
+    link.remove();
+    
+    return response.data;
+  },
 };
 
 // Archive API
 export const archiveService = {
-  getArchivedLogs: async (startDate, endDate, actionType, limit = 100) => {
+  getAuditLogs: async (startDate, endDate, actionType, limit = 100, { userTornId, warSessionId } = {}) => {
+    const response = await api.get('/audit/', {
+      params: {
+        start_date: startDate,
+        end_date: endDate,
+        action_type: actionType,
+        user_torn_id: userTornId,
+        war_session_id: warSessionId,
+        limit,
+      },
+    });
+    return response.data;
+  },
+
+  getArchivedLogs: async (startDate, endDate, actionType, limit = 100, { userTornId, warSessionId } = {}) => {
     const response = await api.get('/archive/', {
       params: {
         start_date: startDate,
         end_date: endDate,
         action_type: actionType,
+        user_torn_id: userTornId,
+        war_session_id: warSessionId,
         limit,
       },
     });
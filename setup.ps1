@@ -112,7 +112,7 @@ Write-Host ""
 Write-Host "Next Steps:" -ForegroundColor Yellow
 Write-Host "1. Update backend/.env with your PostgreSQL connection string (POSTGRES_URL)"
 Write-Host "2. Run database migrations: psql -U postgres -d torn_war_calculator -f backend/migrations/001_initial_schema.sql"
-Write-Host "3. Start backend: cd backend; .\venv\Scripts\Activate.ps1; python app.py"
+Write-Host "3. Start backend: cd backend; .\venv\Scripts\Activate.ps1; python application.py"
 Write-Host "4. Start frontend: cd frontend; npm start"
 Write-Host ""
 Write-Host "For deployment instructions, see README.md" -ForegroundColor Cyan